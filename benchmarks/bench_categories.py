@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmarks.bench_categories
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    Queries per GET /api/categories/?sponsor=... as the number of matching
+    categories grows. "legacy" replays the query shape used before sponsor
+    names were cached: a sponsor lookup, the categories, a count and one
+    dereference per category.
+
+    Usage:
+
+        python -m benchmarks.bench_categories
+
+"""
+import os
+import warnings
+
+os.environ["APP_SETTINGS"] = "src.config.TestingConfig"
+
+from mongoengine import connect  # noqa: E402
+from mongoengine.connection import disconnect_all  # noqa: E402
+from src import app  # noqa: E402
+from src.models.category import Category  # noqa: E402
+from src.models.sponsor import Sponsor, sponsor_names  # noqa: E402
+from src.models.user import ROLES  # noqa: E402
+from tests.base import count_queries  # noqa: E402
+
+
+def legacy(name: str) -> int:
+    with count_queries() as queries:
+        sponsor = Sponsor.objects(sponsor_name=name).first()
+        cat = Category.objects(sponsor=sponsor).exclude("id")
+        if cat:
+            [c.sponsor.sponsor_name for c in cat]
+            cat.count()
+    return len(queries)
+
+
+def current(client, name: str) -> int:
+    with count_queries() as queries:
+        res = client.get(f"/api/categories/?sponsor={name}")
+        assert res.status_code == 201, res.status_code
+    return len(queries)
+
+
+def main():
+    warnings.simplefilter("ignore")
+    disconnect_all()
+    conn = connect("benchmark", host="mongomock://localhost")
+    client = app.test_client()
+
+    print(f"{'categories':>10} {'legacy':>7} {'cold':>5} {'warm':>5}")
+
+    with app.app_context():
+        for size in (1, 10, 50, 200):
+            conn.drop_database("benchmark")
+            sponsor = Sponsor.createOne(username="sponsor",
+                                        email="sponsor@localhost.dev",
+                                        password="benchmark",
+                                        roles=ROLES.SPONSOR,
+                                        sponsor_name="sponsor")
+            for i in range(size):
+                Category.createOne(name=f"category{i}", sponsor=sponsor)
+
+            before = legacy("sponsor")
+            sponsor_names.invalidate()
+            cold = current(client, "sponsor")
+            warm = current(client, "sponsor")
+
+            print(f"{size:>10} {before:>7} {cold:>5} {warm:>5}")
+
+    conn.drop_database("benchmark")
+
+
+if __name__ == "__main__":
+    main()
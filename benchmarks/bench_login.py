@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmarks.bench_login
+    ~~~~~~~~~~~~~~~~~~~~~~
+    Login throughput with N concurrent logins under gevent, hashing inline
+    on the event loop versus in the hashing worker pool. Also reports how
+    long a cheap request issued during the login burst has to wait.
+
+    Usage:
+
+        python -m benchmarks.bench_login [concurrency] [rounds]
+
+"""
+from gevent import monkey
+monkey.patch_all()
+
+import os  # noqa: E402
+import sys  # noqa: E402
+import json  # noqa: E402
+import time  # noqa: E402
+import gevent  # noqa: E402
+
+os.environ["APP_SETTINGS"] = "src.config.TestingConfig"
+
+from mongoengine import connect  # noqa: E402
+from mongoengine.connection import disconnect_all  # noqa: E402
+from src import app, hasher  # noqa: E402
+from src.models.user import User, ROLES  # noqa: E402
+
+
+def run(concurrency: int, pool_size: int) -> tuple:
+    """Returns the logins per second and probe latency for one setup"""
+    app.config["HASHING_POOL_SIZE"] = pool_size
+    app.config["HASHING_MAX_PENDING"] = concurrency
+    hasher.init_app(app)
+
+    client = app.test_client()
+    body = json.dumps({"username": "bench", "password": "benchmark"})
+
+    def login():
+        res = client.post("/api/auth/login/", data=body,
+                          content_type="application/json")
+        assert res.status_code == 200, res.status_code
+
+    def probe():
+        client.get("/api/stats/user_count/")
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    logins = [gevent.spawn(login) for _ in range(concurrency)]
+    probing = gevent.spawn(probe)
+    gevent.joinall(logins + [probing], raise_error=True)
+    elapsed = time.perf_counter() - start
+
+    return concurrency / elapsed, probing.value * 1000
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+
+    disconnect_all()
+    conn = connect("benchmark", host="mongomock://localhost")
+
+    with app.app_context():
+        app.config["BCRYPT_LOG_ROUNDS"] = rounds
+        User.createOne(username="bench", email="bench@localhost.dev",
+                       password="benchmark", roles=ROLES.HACKER)
+
+        inline = run(concurrency, pool_size=0)
+        pooled = run(concurrency, pool_size=os.cpu_count() or 4)
+
+    conn.drop_database("benchmark")
+
+    print(f"{concurrency} concurrent logins, bcrypt rounds={rounds}")
+    for name, (rate, waited) in (("inline", inline), ("pooled", pooled)):
+        print(f"  {name}: {rate:8.2f} logins/s, probe waited {waited:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
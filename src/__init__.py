@@ -20,7 +20,7 @@ from os import path, getenv, environ
 if not getenv("APP_SETTINGS", "src.config.TestingConfig"):
     from gevent import monkey
     monkey.patch_all()
-from flask import Flask, json  # noqa: E402
+from flask import Flask  # noqa: E402
 from werkzeug.exceptions import HTTPException  # noqa: E402
 from flasgger import Swagger  # noqa: E402
 from flask_cors import CORS  # noqa: E402
@@ -32,6 +32,9 @@ from sentry_sdk.integrations.flask import FlaskIntegration  # noqa: E402
 from sentry_sdk.integrations.celery import CeleryIntegration  # noqa: E402
 from flask_socketio import SocketIO  # noqa: E402
 from src.tasks import make_celery  # noqa: E402
+from src.common.hashing import Hasher  # noqa: E402
+from src.common.invalidation import Invalidator  # noqa: E402
+from src.common.response_cache import ResponseCache  # noqa: E402
 import yaml  # noqa: E402
 
 
@@ -39,7 +42,10 @@ import yaml  # noqa: E402
 db = MongoEngine()
 mail = Mail()
 bcrypt = Bcrypt()
+hasher = Hasher(bcrypt)
 socketio = SocketIO()
+invalidator = Invalidator()
+response_cache = ResponseCache()
 
 
 """Load the Schema Definitions"""
@@ -69,6 +75,29 @@ swagger_template = {
     ],
     "components": {
         "schemas": schema,
+        "parameters": {
+            "Limit": {
+                "in": "query",
+                "name": "limit",
+                "required": False,
+                "schema": {"type": "integer", "minimum": 1},
+                "description": "The maximum number of items per page."
+            },
+            "Cursor": {
+                "in": "query",
+                "name": "cursor",
+                "required": False,
+                "schema": {"type": "string"},
+                "description": "The cursor of the page, taken from `next`."
+            },
+            "Fields": {
+                "in": "query",
+                "name": "fields",
+                "required": False,
+                "schema": {"type": "string"},
+                "description": "A comma separated list of fields to return."
+            }
+        },
         "securitySchemes": {
             "CookieAuth": {
                 "type": "apiKey",
@@ -113,12 +142,18 @@ def create_app():
     swagger.init_app(app)
     mail.init_app(app)
     bcrypt.init_app(app)
+    hasher.init_app(app)
+    from src.common.json import JSONEncoderBase, SocketIOJSON
     socketio.init_app(app,
                       cors_allowed_origins="*",
-                      json=json,
+                      json=SocketIOJSON(app),
                       message_queue=app.config.get("SOCKETIO_MESSAGE_QUEUE"))
+    invalidator.init_app(app, socketio.start_background_task)
+    response_cache.init_app(app)
+
+    from src.models.indexes import auto_create_indexes
+    auto_create_indexes(app.config.get("MONGODB_AUTO_CREATE_INDEX"))
 
-    from src.common.json import JSONEncoderBase
     app.json_encoder = JSONEncoderBase
 
     """Register Blueprints"""
@@ -165,11 +200,11 @@ def create_app():
         init_default_users()
 
         """ Create expiration index for TokenBlacklist """
-        from src.models.tokenblacklist import TokenBlacklist
-        TokenBlacklist.create_index("created_at", expireAfterSeconds=(
-            60 * app.config.get("TOKEN_EXPIRATION_MINUTES")
-            + app.config.get("TOKEN_EXPIRATION_SECONDS")
-        ), background=True)
+        from src.models.indexes import ensure_ttl_indexes, check_indexes
+        ensure_ttl_indexes()
+
+        """ Report query shapes that are missing an index """
+        check_indexes(app.logger)
 
     return app, celery
 
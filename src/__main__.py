@@ -9,6 +9,11 @@
 
         main()
         test()
+        ensure_indexes()
+        migrate_live_update_ids()
+        migrate_event_sponsors()
+        worker(queue, celery_args)
+        mail_outbox()
 
     Misc Variables:
 
@@ -18,6 +23,7 @@
 """
 from src import app
 from flask.cli import FlaskGroup
+import click
 import os
 try:
     import pytest
@@ -43,5 +49,66 @@ def test():
         app.logger.error("Module PyTest is not installed! Install dev dependencies before testing!")  # noqa: E501
 
 
+@cli.command("ensure-indexes")
+def ensure_indexes():
+    """Build the database indexes"""
+    from src.models.indexes import ensure_indexes, missing_indexes
+
+    ensure_indexes()
+
+    missing = missing_indexes()
+    for collection, fields in missing:
+        app.logger.warning(f"Index still building on `{collection}`: {fields}")
+
+    if not missing:
+        app.logger.info("All indexes are built.")
+
+
+@cli.command("migrate-live-update-ids")
+def migrate_live_update_ids():
+    """Renumber the live updates created with the old ID sequence"""
+    from src.models.live_update import LiveUpdate
+
+    migrated = LiveUpdate.migrate_ids()
+
+    app.logger.info(f"Renumbered {migrated} live updates.")
+
+
+@cli.command("migrate-event-sponsors")
+def migrate_event_sponsors():
+    """Replace the sponsor names stored in events with references"""
+    from src.models.event import Event
+
+    migrated = Event.migrate_sponsor_names()
+
+    app.logger.info(f"Migrated the sponsors of {migrated} events.")
+
+
+@cli.command("worker", context_settings={"ignore_unknown_options": True})
+@click.option("--queue", default=None,
+              type=click.Choice(list(app.config["WORKER_QUEUES"])),
+              help="The only queue to consume, with its worker settings")
+@click.argument("celery_args", nargs=-1, type=click.UNPROCESSED)
+def worker(queue, celery_args):
+    """Run a Celery worker, extra arguments are passed to Celery"""
+    from src.tasks import worker_arguments
+
+    """
+    Hand over to the `celery` entrypoint, which monkey patches the sockets
+    before importing the app when a gevent pool is requested.
+    """
+    args = ["celery", "-A", "src.celery",
+            *worker_arguments(app, queue), *celery_args]
+    os.execvp(args[0], args)
+
+
+@cli.command("mail-outbox")
+def mail_outbox():
+    """Send the queued emails in batches, one SMTP session per batch"""
+    from src.tasks.mail_tasks import run_outbox
+
+    run_outbox()
+
+
 if __name__ == "__main__":
     cli()
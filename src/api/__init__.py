@@ -9,8 +9,23 @@ import typing as t
 
 class Blueprint(bp):
 
-    def get(self, rule: str, **options: t.Any) -> t.Callable:
-        return self.route(rule, **options, methods=["GET"])
+    def get(self, rule: str, conditional: t.Sequence = None,
+            **options: t.Any) -> t.Callable:
+        """
+        Registers a GET view. With `conditional`, a list of versioned
+        documents the view reads, it supports conditional requests.
+        """
+        route = self.route(rule, **options, methods=["GET"])
+
+        if not conditional:
+            return route
+
+        from src.api.versioning import conditional as make_conditional
+
+        def decorator(view: t.Callable) -> t.Callable:
+            return route(make_conditional(*conditional)(view))
+
+        return decorator
 
     def post(self, rule: str, **options: t.Any) -> t.Callable:
         return self.route(rule, **options, methods=["POST"])
@@ -7,20 +7,52 @@
 
         create_hacker()
         create_sponsor()
+        export_hackers()
+        import_hackers()
+        get_import_job()
+        get_response_cache_stats()
+
+    Variables:
+
+        EXPORT_FIELDS
+        EXPORT_FILTERS
+        FORMULA_PREFIXES
 
 """
-from flask import request, current_app as app
+from flask import (
+    Response,
+    json,
+    request,
+    stream_with_context,
+    current_app as app
+)
 from src.api import Blueprint
 from mongoengine.errors import NotUniqueError, ValidationError
-from werkzeug.exceptions import BadRequest, Conflict, Unauthorized
+from werkzeug.exceptions import BadRequest, Conflict, NotFound, Unauthorized
 import dateutil.parser
+import codecs
+import csv
+import io
 from src.models.hacker import Hacker
+from src.models.import_job import IMPORT_BOOLEANS, ImportBatch, ImportJob
 from src.models.sponsor import Sponsor
 from src.models.user import ROLES
 from src.common.decorators import authenticate, privileges
+from src import response_cache
 
 admin_blueprint = Blueprint("admin", __name__)
 
+EXPORT_FIELDS = ("username", "email", "first_name", "last_name",
+                 "phone_number", "date", "isaccepted", "rsvp_status",
+                 "beginner", "can_share_info", "ethnicity", "pronouns",
+                 "edu_info.college", "edu_info.major",
+                 "edu_info.graduation_date", "socials.github",
+                 "socials.linkedin", "why_attend", "what_learn")
+
+EXPORT_FILTERS = ("isaccepted", "rsvp_status", "beginner")
+
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
 
 @admin_blueprint.post("/admin/hackers/")
 @authenticate
@@ -112,8 +144,8 @@ def create_sponsor(loggedin_user):
     if not data:
         raise BadRequest("Not data")
 
-    from src import bcrypt
-    data["password"] = bcrypt.generate_password_hash(
+    from src import hasher
+    data["password"] = hasher.generate_password_hash(
         data["password"],
         app.config["BCRYPT_LOG_ROUNDS"])
 
@@ -131,3 +163,321 @@ def create_sponsor(loggedin_user):
     }
 
     return res, 201
+
+
+@admin_blueprint.get("/admin/hackers/export/")
+@authenticate
+@privileges(ROLES.ADMIN)
+def export_hackers(_):
+    """
+    Streams every hacker as NDJSON or CSV.
+    ---
+    tags:
+        - admin
+    summary: Export Hackers
+    parameters:
+        - in: query
+          name: format
+          schema:
+            type: string
+            enum:
+                - ndjson
+                - csv
+            default: ndjson
+          required: false
+        - in: query
+          name: isaccepted
+          schema:
+            type: boolean
+          required: false
+        - in: query
+          name: rsvp_status
+          schema:
+            type: boolean
+          required: false
+        - in: query
+          name: beginner
+          schema:
+            type: boolean
+          required: false
+    responses:
+        200:
+            content:
+                application/x-ndjson:
+                    schema:
+                        type: string
+                text/csv:
+                    schema:
+                        type: string
+        400:
+            description: Bad request.
+        5XX:
+            description: Unexpected error.
+    """
+    args = request.args
+    export_format = args.get("format", "ndjson")
+
+    if export_format not in ("ndjson", "csv"):
+        raise BadRequest("Parameter `format` must be ndjson or csv.")
+
+    query = {"_cls": {"$in": Hacker._subclasses}}
+    for field in EXPORT_FILTERS:
+        if field in args:
+            if args[field] not in ("true", "false"):
+                raise BadRequest(f"Parameter `{field}` must be a boolean.")
+            query[field] = args[field] == "true"
+
+    cursor = Hacker._get_collection().find(
+        query,
+        {"_id": False, **{f: True for f in EXPORT_FIELDS}},
+        batch_size=app.config.get("EXPORT_BATCH_SIZE")
+    )
+
+    if export_format == "csv":
+        rows = _export_csv(cursor)
+        mimetype = "text/csv"
+    else:
+        rows = (json.dumps(h) + "\n" for h in cursor)
+        mimetype = "application/x-ndjson"
+
+    res = Response(stream_with_context(rows), mimetype=mimetype)
+    res.headers["Content-Disposition"] = \
+        f"attachment; filename=hackers.{export_format}"
+
+    return res
+
+
+def _export_csv(cursor):
+    """Yields the hackers as CSV lines, starting with the header"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> str:
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    writer.writerow(EXPORT_FIELDS)
+    yield flush()
+
+    for hacker in cursor:
+        row = []
+        for field in EXPORT_FIELDS:
+            value = hacker
+            for key in field.split("."):
+                value = value.get(key) if isinstance(value, dict) else None
+            if isinstance(value, list):
+                value = ";".join(map(str, value))
+            if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+                """Keep spreadsheets from evaluating it as a formula"""
+                value = "'" + value
+            row.append(value)
+
+        writer.writerow(row)
+        yield flush()
+
+
+@admin_blueprint.post("/admin/hackers/import/")
+@authenticate
+@privileges(ROLES.ADMIN)
+def import_hackers(_):
+    """
+    Creates many hackers from an NDJSON or CSV upload, bypassing email
+    verification.
+    ---
+    tags:
+        - admin
+    summary: Import Hackers
+    description: The rows use the fields of the export, plus a
+                 `password`. The upload is sent as the `file` field of a
+                 multipart form, or as the request body. The rows are
+                 inserted by the workers, the returned job id tracks them.
+    parameters:
+        - in: query
+          name: format
+          schema:
+            type: string
+            enum:
+                - ndjson
+                - csv
+            default: ndjson
+          required: false
+    responses:
+        202:
+            description: Accepted, the rows are being imported.
+            content:
+                application/json:
+                    schema:
+                        type: object
+                        properties:
+                            rows:
+                                type: integer
+                            job_id:
+                                type: string
+        400:
+            description: Unsupported format.
+        401:
+            description: Unauthorized
+    """
+    import_format = request.args.get("format", "ndjson")
+    if import_format not in ("ndjson", "csv"):
+        raise BadRequest("Parameter `format` must be ndjson or csv.")
+
+    upload = request.files.get("file")
+    lines = codecs.iterdecode(upload.stream if upload else request.stream,
+                              "utf-8-sig")
+
+    rows = list(_import_rows(lines, import_format))
+
+    job = ImportJob.createOne(total=len(rows))
+    batches = ImportBatch.stage(job, rows, app.config.get("IMPORT_BATCH_SIZE"))
+
+    """Hashing the passwords is slow, the workers insert the rows"""
+    from src.tasks.import_tasks import import_hackers_batch
+    for batch in batches:
+        import_hackers_batch.apply_async((str(batch.id),))
+
+    res = {
+        "status": "success",
+        "rows": len(rows),
+        "job_id": str(job.id)
+    }
+
+    return res, 202
+
+
+@admin_blueprint.get("/admin/hackers/import/<job_id>/")
+@authenticate
+@privileges(ROLES.ADMIN)
+def get_import_job(_, job_id: str):
+    """
+    Gets the progress of a hacker import
+    ---
+    tags:
+        - admin
+    parameters:
+        - id: job_id
+          in: path
+          description: The job id returned by the import
+          required: true
+          schema:
+            type: string
+    responses:
+        200:
+            content:
+                application/json:
+                    schema:
+                        type: object
+                        properties:
+                            total:
+                                type: integer
+                            processed:
+                                type: integer
+                            inserted:
+                                type: integer
+                            duplicates:
+                                type: array
+                                items:
+                                    type: object
+                                    properties:
+                                        row:
+                                            type: integer
+                                        username:
+                                            type: string
+                                        email:
+                                            type: string
+                            invalid:
+                                type: array
+                                items:
+                                    type: object
+                                    properties:
+                                        row:
+                                            type: integer
+                                        errors:
+                                            type: object
+                            done:
+                                type: boolean
+        404:
+            description: Job does not exist.
+    """
+    try:
+        job = ImportJob.objects(id=job_id).first()
+    except ValidationError:
+        job = None
+
+    if not job:
+        raise NotFound()
+
+    return job.progress(), 200
+
+
+def _import_rows(lines, import_format: str):
+    """Yields the row number and fields of every uploaded hacker"""
+    if import_format == "csv":
+        for number, row in enumerate(csv.DictReader(lines), 1):
+            fields = {}
+            for field, value in row.items():
+                if not value or field is None:
+                    continue
+                if field in IMPORT_BOOLEANS and (
+                        value.lower() in ("true", "false")):
+                    value = value.lower() == "true"
+                elif field == "what_learn":
+                    value = value.split(";")
+
+                """Nest the dotted columns, e.g. `edu_info.college`"""
+                *parents, key = field.split(".")
+                target = fields
+                for parent in parents:
+                    target = target.setdefault(parent, {})
+                    if not isinstance(target, dict):
+                        break
+                else:
+                    target[key] = value
+            yield number, fields
+    else:
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError:
+                yield number, None
+
+
+@admin_blueprint.get("/admin/response_cache/")
+@authenticate
+@privileges(ROLES.ADMIN)
+def get_response_cache_stats(_):
+    """
+    Gets the response cache's metrics
+    ---
+    tags:
+        - admin
+    summary: Gets the response cache's hit rate and sizes
+    responses:
+        200:
+            content:
+                application/json:
+                    schema:
+                        type: object
+                        properties:
+                            backend:
+                                type: string
+                            hits:
+                                type: integer
+                            misses:
+                                type: integer
+                            hit_rate:
+                                type: number
+                            bytes_served:
+                                type: integer
+                            bytes_stored:
+                                type: integer
+        401:
+            description: Unauthorized
+        403:
+            description: Forbidden
+    """
+    return response_cache.stats(), 200
@@ -9,7 +9,7 @@ from src.api import Blueprint
 from werkzeug.exceptions import BadRequest, Forbidden, NotFound
 from src.models.user import User
 from src.models.tokenblacklist import TokenBlacklist
-from src import bcrypt
+from src import hasher
 from src.common.decorators import authenticate
 from src.common.jwt import decode_jwt
 
@@ -60,7 +60,7 @@ def login():
     if not user:
         raise NotFound()
 
-    if not bcrypt.check_password_hash(user.password, data["password"]):
+    if not hasher.check_password_hash(user.password, data["password"]):
         raise Forbidden()
 
     auth_token = user.encode_auth_token()
@@ -99,7 +99,7 @@ def logout(_):
     decoded_token = decode_jwt(token)
 
     """ Set the token as revoked """
-    TokenBlacklist.objects(jti=decoded_token["jti"]).modify(revoked=True)
+    TokenBlacklist.revoke(decoded_token["jti"])
 
     res = make_response()
     res.delete_cookie("sid")
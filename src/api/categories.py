@@ -13,10 +13,11 @@
 """
 from flask import request
 from src.api import Blueprint
+from src.api.pagination import paginate
 from mongoengine.errors import NotUniqueError, ValidationError
 from werkzeug.exceptions import BadRequest, Conflict, NotFound
 from src.models.category import Category
-from src.models.sponsor import Sponsor
+from src.models.sponsor import Sponsor, sponsor_names
 from src.models.user import ROLES
 from src.common.decorators import authenticate, privileges
 
@@ -55,7 +56,7 @@ def create_category():
     if not data:
         raise BadRequest()
 
-    data["sponsor"] = Sponsor.objects(sponsor_name=data["sponsor"]).first()
+    data["sponsor"] = sponsor_names.id_for(data.get("sponsor"))
 
     if not data["sponsor"]:
         raise NotFound("A sponsor with that name does not exist.")
@@ -128,7 +129,7 @@ def edit_category():
         query["name"] = args["name"]
 
     if args.get("sponsor"):
-        sponsor_find = Sponsor.objects(sponsor_name=args["sponsor"]).first()
+        sponsor_find = sponsor_names.id_for(args["sponsor"])
         if not sponsor_find:
             raise NotFound("A sponsor with that name does not exist!")
         query["sponsor"] = sponsor_find
@@ -138,7 +139,7 @@ def edit_category():
         raise NotFound("Sorry, no categories exist that match the query.")
 
     if data.get("sponsor"):
-        data["sponsor"] = Sponsor.objects(sponsor_name=data["sponsor"]).first()
+        data["sponsor"] = sponsor_names.id_for(data["sponsor"])
 
         if not data.get("sponsor"):
             raise NotFound("A sponsor with that name does not exist!")
@@ -200,7 +201,7 @@ def delete_category(_):
         query["name"] = args["name"]
 
     if args.get("sponsor"):
-        sponsor_find = Sponsor.objects(sponsor_name=args["sponsor"]).first()
+        sponsor_find = sponsor_names.id_for(args["sponsor"])
         if not sponsor_find:
             raise NotFound("A sponsor with that name does not exist!")
         query["sponsor"] = sponsor_find
@@ -266,30 +267,31 @@ def get_category():
         query["name"] = args["name"]
 
     if args.get("sponsor"):
-        sponsor_find = Sponsor.objects(sponsor_name=args["sponsor"]).first()
+        sponsor_find = sponsor_names.id_for(args["sponsor"])
         if not sponsor_find:
             raise NotFound("A sponsor with that name does not exist!")
         query["sponsor"] = sponsor_find
 
-    cat = Category.objects(**query).exclude("id")
+    cat = list(Category.objects(**query).exclude("id"))
     if not cat:
         raise NotFound("Sorry, no categories exist that match the query.")
 
     cat_list = []
     for c in cat:
         c_dict = c.to_mongo().to_dict()
-        c_dict["sponsor"] = c.sponsor.sponsor_name
+        c_dict["sponsor"] = sponsor_names.name_for(c.ref_id("sponsor"))
         cat_list.append(c_dict)
 
     res = {
-        "count": cat.count(),
+        "count": len(cat_list),
         "categories": cat_list
     }
 
     return res, 201
 
 
-@categories_blueprint.get("/categories/get_all_categories/")
+@categories_blueprint.get("/categories/get_all_categories/",
+                          conditional=[Category, Sponsor])
 def get_all_categories():
     """
     Returns an array of category documents.
@@ -297,6 +299,10 @@ def get_all_categories():
     tags:
         - category
     summary: returns an array of category documents
+    parameters:
+        - $ref: '#/components/parameters/Limit'
+        - $ref: '#/components/parameters/Cursor'
+        - $ref: '#/components/parameters/Fields'
     responses:
         200:
             description: OK
@@ -305,13 +311,14 @@ def get_all_categories():
         5XX:
             description: Unexpected error (the API issue).
     """
-    categories = Category.objects()
+    categories, next_url = paginate(Category.objects())
 
-    if not categories:
+    if not categories and not request.args.get("cursor"):
         raise NotFound("There are no categories created.")
 
     res = {
         "categories": categories,
+        "next": next_url,
         "status": "success"
     }
 
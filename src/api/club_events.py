@@ -9,6 +9,7 @@
 
 """
 from flask import request
+from src import response_cache
 from src.api import Blueprint
 from werkzeug.exceptions import BadRequest
 import dateutil.parser
@@ -47,7 +48,8 @@ def refresh_events(_):
     return res, 201
 
 
-@club_events_blueprint.get("/club/get_events/")
+@club_events_blueprint.get("/club/get_events/", conditional=[ClubEvent])
+@response_cache.cached(ClubEvent, ttl=300)
 def get_events():
     """
     Gets the Club Events.
@@ -162,7 +164,7 @@ def get_events():
             "start__lt": dateutil.parser.parse(args["end_date"])
         }
 
-    events = ClubEvent.objects(**query).exclude("id")
+    events = ClubEvent.objects(**query).exclude(*ClubEvent.private_fields)
 
     count = args.get("count")
     if count:
@@ -13,7 +13,6 @@ from src.api import Blueprint
 from werkzeug.exceptions import NotFound, Unauthorized
 from src.models.user import User, ROLES
 from src.common.decorators import authenticate
-from src import bcrypt
 
 
 email_verify_blueprint = Blueprint("email_verification", __name__)
@@ -79,20 +78,11 @@ def update_registration_status(email_token: str):
         5XX:
             description: Unexpected error.
     """
-    user_username = User.decode_email_token(email_token)
-    user = User.objects(username=user_username).first()
+    user = User.verify_email_token(email_token)
 
-    if not user or not user.email_token_hash:
-        raise NotFound("Invalid verification token. Please try again.")
-
-    isvalid = bcrypt.check_password_hash(user.email_token_hash, email_token)
-    if not isvalid:
+    if not user:
         raise NotFound("Invalid verification token. Please try again.")
 
-    user.modify(email_verification=True,
-                unset__email_token_hash="")
-    user.save()
-
     res = {
         "status": "success",
         "message": "User email successfully verified"
@@ -133,10 +123,8 @@ def send_registration_email(loggedin_user, username: str):
     if not user:
         raise NotFound()
 
-    token = user.encode_email_token()
-
     from src.common.mail import send_verification_email
-    send_verification_email(user, token)
+    send_verification_email(user)
 
     res = {
         "status": "success",
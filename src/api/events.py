@@ -12,6 +12,7 @@
 
 from flask import request
 from src.api import Blueprint
+from src.api.pagination import paginate
 from mongoengine.errors import NotUniqueError
 from werkzeug.exceptions import BadRequest, NotFound, Conflict
 from src.models.event import Event
@@ -149,7 +150,8 @@ def update_event(event_name: str):
     return res, 201
 
 
-@events_blueprint.get("/events/get_all_events/")
+@events_blueprint.get("/events/get_all_events/",
+                      conditional=[Event, Sponsor])
 def get_all_events():
     """
     Returns an array of event documents.
@@ -157,20 +159,26 @@ def get_all_events():
     tags:
         - event
     summary: returns an array of event documents
+    parameters:
+        - $ref: '#/components/parameters/Limit'
+        - $ref: '#/components/parameters/Cursor'
+        - $ref: '#/components/parameters/Fields'
     responses:
-        201:
+        200:
             description: OK
         5XX:
             description: Unexpected error (the API issue).
     """
-    events = Event.objects()
+    events, next_url = paginate(Event.objects(), "date_time",
+                                prefetch=Event.prefetch_sponsor_names)
 
-    if not events:
+    if not events and not request.args.get("cursor"):
         raise NotFound("There are no events created.")
 
     res = {
         "events": events,
+        "next": next_url,
         "status": "success"
     }
 
-    return res, 201
+    return res, 200
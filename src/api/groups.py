@@ -7,19 +7,36 @@
 
         create_group()
         edit_group()
+        resolve_members(emails)
 
 """
 from flask import request
+from src import response_cache
 from src.api import Blueprint
+from src.api.pagination import paginate
 from mongoengine.errors import NotUniqueError, ValidationError
 from werkzeug.exceptions import BadRequest, Conflict, NotFound
-from src.models.hacker import Hacker
+from src.models.hacker import Hacker, MEMBER_FIELDS
 from src.models.group import Group
 
 
 groups_blueprint = Blueprint("groups", __name__)
 
 
+def resolve_members(emails: list) -> list:
+    """Gets the hackers for a list of emails or raises a single NotFound"""
+    if not isinstance(emails, list):
+        raise BadRequest()
+
+    members, missing = Hacker.resolve_members(emails)
+
+    if missing:
+        raise NotFound(description="Group Member(s) does not exist: "
+                                   + ", ".join(map(str, missing)))
+
+    return members
+
+
 @groups_blueprint.post("/groups/")
 def create_group():
     """
@@ -49,11 +66,8 @@ def create_group():
     if not data:
         raise BadRequest()
 
-    for k, email in enumerate(data["members"]):
-        member = Hacker.objects(email=email).first()
-        if not member:
-            raise NotFound(description="Group Member(s) does not exist.")
-        data["members"][k] = member
+    if "members" in data:
+        data["members"] = resolve_members(data["members"])
 
     try:
         Group.createOne(**data)
@@ -104,11 +118,8 @@ def edit_group(group_name: str):
     if not update:
         raise BadRequest()
 
-    for k, email in enumerate(update["members"]):
-        member = Hacker.objects(email=email).first()
-        if not member:
-            raise NotFound(description="Group Member(s) does not exist.")
-        update["members"][k] = member
+    if "members" in update:
+        update["members"] = resolve_members(update["members"])
 
     group = Group.objects(name=group_name)
     if not group:
@@ -185,6 +196,7 @@ def add_member_to_group(group_name: str, username: str):
 
 
 @groups_blueprint.get("/groups/<group_name>/")
+@response_cache.cached(Group, Hacker)
 def get_group(group_name: str):
     """
     Retrieves a group's schema from their group name
@@ -211,18 +223,10 @@ def get_group(group_name: str):
 
     group_dict = group.to_mongo().to_dict()
 
-    members = []
-
-    for member in group.members:
+    members, _ = Hacker.resolve_members(group.ref_ids("members"), "id")
 
-        members.append({
-            "first_name": member.first_name,
-            "last_name": member.last_name,
-            "email": member.email,
-            "username": member.username
-        })
-
-    group_dict["members"] = members
+    group_dict["members"] = [{f: m[f] for f in MEMBER_FIELDS}
+                             for m in members]
 
     res = {
         "group": group_dict,
@@ -240,6 +244,10 @@ def get_all_groups():
     tags:
         - group
     summary: returns an array of group documents
+    parameters:
+        - $ref: '#/components/parameters/Limit'
+        - $ref: '#/components/parameters/Cursor'
+        - $ref: '#/components/parameters/Fields'
     responses:
         200:
             description: OK
@@ -248,13 +256,14 @@ def get_all_groups():
         5XX:
             description: Unexpected error (the API issue).
     """
-    groups = Group.objects()
+    groups, next_url = paginate(Group.objects(), "date")
 
-    if not groups:
+    if not groups and not request.args.get("cursor"):
         raise NotFound("There are no groups created.")
 
     res = {
         "groups": groups,
+        "next": next_url,
         "status": "success"
     }
 
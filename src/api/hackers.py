@@ -6,10 +6,18 @@
     Functions:
 
         create_hacker()
+        accept_hackers()
+        get_acceptance_job()
+
+    Variables:
+
+        ACCEPT_FILTERS
 
 """
 from flask import request, make_response, json
+from src import response_cache
 from src.api import Blueprint
+from src.api.pagination import paginate
 from mongoengine.errors import NotUniqueError, ValidationError
 from werkzeug.exceptions import (
     BadRequest,
@@ -19,12 +27,17 @@ from werkzeug.exceptions import (
     UnsupportedMediaType
 )
 from src.models.hacker import Hacker
+from src.models.mail_job import MailJob
+from src.models.tokenblacklist import TokenBlacklist
 from src.models.user import ROLES
 from src.common.decorators import authenticate, privileges
 
 
 hackers_blueprint = Blueprint("hackers", __name__)
 
+ACCEPT_FILTERS = ("rsvp_status", "beginner", "can_share_info",
+                  "email_verification")
+
 
 @hackers_blueprint.post("/hackers/")
 def create_hacker():
@@ -77,6 +90,9 @@ def create_hacker():
     if "email_token_hash" in data:
         del data["email_token_hash"]
 
+    if "email_token_digest" in data:
+        del data["email_token_digest"]
+
     if not data:
         raise BadRequest()
 
@@ -100,9 +116,8 @@ def create_hacker():
         raise BadRequest()
 
     """Send Verification Email"""
-    token = hacker.encode_email_token()
     from src.common.mail import send_verification_email
-    send_verification_email(hacker, token)
+    send_verification_email(hacker)
 
     res = {
         "status": "success",
@@ -154,6 +169,7 @@ def get_hacker_resume(username: str):
 
 
 @hackers_blueprint.get("/hackers/<username>/")
+@response_cache.cached(Hacker, ttl=30)
 def get_hacker_search(username: str):
     """
     Retrieves a hacker's profile using their username.
@@ -286,11 +302,13 @@ def update_user_profile_settings(username: str):
     except ValidationError:
         raise BadRequest()
 
+    TokenBlacklist.evict_users(hacker.id)
+
     """Send Verification Email if New Email"""
     if newemail:
-        token = hacker.encode_email_token()
+        hacker.email = update["email"]
         from src.common.mail import send_verification_email
-        send_verification_email(hacker, token)
+        send_verification_email(hacker)
 
     res = {
         "status": "success",
@@ -370,15 +388,15 @@ def accept_hacker(_, username: str):
             description: Unexpected error.
     """
 
-    hacker = Hacker.objects(username=username).first()
-    if not hacker:
-        raise NotFound()
-
-    hacker.update(isaccepted=True)
+    hacker = Hacker.objects(username=username, isaccepted=False).modify(
+        set__isaccepted=True, new=True)
 
-    """Send Acceptance Email"""
-    from src.common.mail import send_hacker_acceptance_email
-    send_hacker_acceptance_email(hacker)
+    if hacker:
+        """Send Acceptance Email, once"""
+        from src.common.mail import send_hacker_acceptance_email
+        send_hacker_acceptance_email(hacker)
+    elif not Hacker.objects(username=username).count():
+        raise NotFound()
 
     res = {
         "status": "success",
@@ -388,6 +406,137 @@ def accept_hacker(_, username: str):
     return res, 201
 
 
+@hackers_blueprint.post("/hackers/accept/")
+@authenticate
+@privileges(ROLES.ADMIN)
+def accept_hackers(_):
+    """
+    Accepts many Hackers at once
+    ---
+    tags:
+        - hacker
+    summary: Bulk accept Hackers
+    requestBody:
+        content:
+            application/json:
+                schema:
+                    type: object
+                    description: Either `usernames` or `filter`.
+                    properties:
+                        usernames:
+                            type: array
+                            items:
+                                type: string
+                        filter:
+                            type: object
+                            description: Boolean fields the hackers must
+                                         match.
+                            properties:
+                                rsvp_status:
+                                    type: boolean
+                                beginner:
+                                    type: boolean
+                                can_share_info:
+                                    type: boolean
+                                email_verification:
+                                    type: boolean
+        description: The Hackers to accept
+    responses:
+        202:
+            description: Accepted, the emails are being sent.
+        400:
+            description: Malformed request.
+        5XX:
+            description: Unexpected error.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        raise BadRequest()
+
+    usernames = data.get("usernames")
+    filters = data.get("filter")
+
+    if (usernames is None) == (filters is None):
+        raise BadRequest("Provide either `usernames` or `filter`.")
+
+    query = {"isaccepted": False}
+
+    if usernames is not None:
+        if not isinstance(usernames, list) or not all(
+                isinstance(u, str) for u in usernames):
+            raise BadRequest("`usernames` must be a list of strings.")
+        query["username__in"] = usernames
+    else:
+        if not isinstance(filters, dict):
+            raise BadRequest("`filter` must be an object.")
+        for field, value in filters.items():
+            if field not in ACCEPT_FILTERS or not isinstance(value, bool):
+                raise BadRequest(f"Unsupported filter `{field}`.")
+            query[field] = value
+
+    job = MailJob.createOne(kind="hacker_acceptance")
+
+    """
+    One update for every hacker, skipping the already accepted ones. Only
+    the hackers it marked with the job are mailed, so a hacker accepted
+    concurrently by another request is mailed once.
+    """
+    Hacker.objects(**query).update(set__isaccepted=True,
+                                   set__acceptance_job=job.id)
+
+    hacker_ids = [str(i) for i in
+                  Hacker.objects(acceptance_job=job.id).scalar("id")]
+    job.modify(total=len(hacker_ids))
+
+    """Send Acceptance Emails"""
+    from src.common.mail import send_hacker_acceptance_emails
+    send_hacker_acceptance_emails(job, hacker_ids)
+
+    res = {
+        "status": "success",
+        "message": f"{len(hacker_ids)} hackers have been accepted!",
+        "accepted": len(hacker_ids),
+        "job_id": str(job.id)
+    }
+
+    return res, 202
+
+
+@hackers_blueprint.get("/hackers/accept/<job_id>/")
+@authenticate
+@privileges(ROLES.ADMIN)
+def get_acceptance_job(_, job_id: str):
+    """
+    Gets the progress of a bulk acceptance's emails
+    ---
+    tags:
+        - hacker
+    parameters:
+        - id: job_id
+          in: path
+          description: The job id returned by the bulk acceptance
+          required: true
+          schema:
+            type: string
+    responses:
+        200:
+            description: OK
+        404:
+            description: Job does not exist.
+        5XX:
+            description: Unexpected error.
+    """
+    try:
+        job = MailJob.objects(id=job_id).first()
+    except ValidationError:
+        job = None
+
+    if not job:
+        raise NotFound()
+
+    return job.progress(), 200
+
+
 @hackers_blueprint.get("/hackers/get_all_hackers/")
 def get_all_hackers():
     """
@@ -396,6 +545,10 @@ def get_all_hackers():
     tags:
         - hacker
     summary: returns an array of hacker documents
+    parameters:
+        - $ref: '#/components/parameters/Limit'
+        - $ref: '#/components/parameters/Cursor'
+        - $ref: '#/components/parameters/Fields'
     responses:
         201:
             description: OK
@@ -404,13 +557,15 @@ def get_all_hackers():
         5XX:
             description: Unexpected error (the API issue).
     """
-    hackers = Hacker.objects().exclude(*Hacker.private_fields)
+    hackers, next_url = paginate(Hacker.objects(), "date",
+                                 private=Hacker.private_fields)
 
-    if not hackers:
+    if not hackers and not request.args.get("cursor"):
         raise NotFound("There are no hackers created.")
 
     res = {
         "hackers": hackers,
+        "next": next_url,
         "status": "success"
     }
 
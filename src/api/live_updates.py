@@ -13,16 +13,32 @@
         delete_all_updates()
         delete_update(id: int)
 
+    Variables:
+
+        batcher
+
 """
 from flask import Blueprint, request
 from werkzeug.exceptions import BadRequest, NotFound
+from src import socketio
 from src.common.decorators import authenticate, privileges
-from flask_socketio import Namespace, emit
-from src.models.live_update import LiveUpdate
+from src.common.emitter import EmitBatcher
+from flask_socketio import Namespace, join_room, leave_room
+from src.models.live_update import LiveUpdate, recent_updates
 from src.models.user import ROLES
 
 live_updates_blueprint = Blueprint("live_updates", __name__)
 
+"""Coalesces the events sent to /liveupdates into LiveUpdateBatch frames"""
+batcher = EmitBatcher(socketio,
+                      "/liveupdates",
+                      "LiveUpdateBatch",
+                      "LIVE_UPDATES_BATCH_SECONDS")
+
+
+def _topic_room(topic: str) -> str:
+    return None if topic is None else f"topic:{topic}"
+
 
 @live_updates_blueprint.route("/live_updates/", methods=["PUT"])
 @authenticate
@@ -41,6 +57,11 @@ def new_update(_):
                     properties:
                         message:
                             type: string
+                        topic:
+                            type: string
+                            description: >
+                                Only send the update to the clients
+                                subscribed to this topic.
     responses:
         201:
             description: OK
@@ -54,14 +75,21 @@ def new_update(_):
     if not data or not data.get("message"):
         raise BadRequest()
 
-    lup = LiveUpdate.createOne(message=data.get("message"))
+    topic = data.get("topic")
+    if topic is not None and (not isinstance(topic, str)
+                              or not 0 < len(topic) <= 64):
+        raise BadRequest("Field `topic` must be a string of 1 to 64 "
+                         "characters.")
 
-    emit("NewLiveUpdate", {
+    lup = LiveUpdate.createOne(message=data.get("message"), topic=topic)
+
+    batcher.emit("NewLiveUpdate", {
         "data": {
             "ID": lup.ID,
-            "message": data.get("message")
+            "message": data.get("message"),
+            "topic": topic
         }
-    }, namespace="/liveupdates", broadcast=True)
+    }, room=_topic_room(topic))
 
     res = {
         "status": "success",
@@ -87,11 +115,9 @@ def delete_all_updates(_):
             description: Unexpected error.
     """
 
-    LiveUpdate.drop_collection()
+    LiveUpdate.delete_all()
 
-    emit("DeleteAllLiveUpdates",
-         namespace="/liveupdates",
-         broadcast=True)
+    batcher.emit("DeleteAllLiveUpdates")
 
     res = {
         "status": "success",
@@ -133,10 +159,9 @@ def delete_update(_, id: int):
 
     to_delete.delete()
 
-    emit("DeleteLiveUpdate",
-         {"data": id},
-         namespace="/liveupdates",
-         broadcast=True)
+    batcher.emit("DeleteLiveUpdate",
+                 {"data": id},
+                 room=_topic_room(to_delete.topic))
 
     res = {
         "status": "success",
@@ -149,17 +174,70 @@ def delete_update(_, id: int):
 """Create the SocketIO Namespace"""
 
 
-class LiveUpdates(Namespace):
+def _last_id(data) -> int:
+    """Reads the `last_id` a client has already seen, if any"""
+    if not isinstance(data, dict):
+        return None
+
+    try:
+        return int(data["last_id"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _replay(last_id: int = None):
+    """Gets the updates newer than `last_id`, or the encoded snapshot"""
+    if last_id is None:
+        return recent_updates.snapshot()
+
+    return recent_updates.since(last_id)
 
-    def on_connect(self):
-        lups = LiveUpdate.objects.exclude("id")
 
-        self.emit("hello", lups)
+def _topic(data) -> str:
+    """Reads the topic a client (un)subscribes to"""
+    topic = data.get("topic") if isinstance(data, dict) else None
+
+    if not isinstance(topic, str) or not topic:
+        return None
+
+    return topic
+
+
+class LiveUpdates(Namespace):
+    """
+    Clients may send the `last_id` they have seen, in the connection's auth
+    payload or with `reload`, to only receive the updates newer than it.
+    IDs are only roughly ordered across servers, so the updates of the
+    `LIVE_UPDATES_REPLAY_OVERLAP_SECONDS` before `last_id` are sent again,
+    and clients should drop the IDs they already have.
+
+    Updates with a topic are only sent to the clients that `subscribe` to
+    it, and several updates may arrive together in a `LiveUpdateBatch`.
+    """
+
+    def on_connect(self, auth=None):
+        self.emit("hello", _replay(_last_id(auth)))
 
     def on_disconnect(self):
         pass
 
-    def on_reload(self, _=None):
-        lups = LiveUpdate.objects.exclude("id")
+    def on_reload(self, data=None):
+        self.emit("reload", _replay(_last_id(data)))
+
+    def on_subscribe(self, data=None):
+        topic = _topic(data)
+        if topic is None:
+            return
+
+        join_room(_topic_room(topic))
+
+        updates = LiveUpdate.objects(topic=topic).order_by("ID")
+        self.emit("subscribed", {
+            "topic": topic,
+            "updates": [u.to_payload() for u in updates]
+        })
 
-        self.emit("reload", lups)
+    def on_unsubscribe(self, data=None):
+        topic = _topic(data)
+        if topic is not None:
+            leave_room(_topic_room(topic))
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+    src.api.pagination
+    ~~~~~~~~~~~~~~~~~~
+    Keyset pagination for listing endpoints
+
+    Functions:
+
+        paginate(queryset, key, private, prefetch)
+        encode_cursor(doc, key)
+        decode_cursor(cursor)
+
+"""
+from flask import request, url_for, current_app as app
+from werkzeug.exceptions import BadRequest
+from mongoengine.queryset.visitor import Q
+from bson.objectid import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime
+import base64
+import json
+
+
+def encode_cursor(doc, key: str = "id") -> str:
+    """Encodes the position of `doc` in a listing sorted by `key`"""
+    position = [str(doc.pk)]
+    if key != "id":
+        position.append(doc[key].isoformat())
+
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """Decodes a cursor into its `[ObjectId, datetime?]` position"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(raw)
+        position[0] = ObjectId(position[0])
+        if len(position) > 1:
+            position[1] = datetime.fromisoformat(position[1])
+    except (ValueError, TypeError, IndexError, InvalidId):
+        raise BadRequest("Invalid cursor.")
+
+    return position
+
+
+def _parse_limit(limit: str) -> int:
+    max_limit = app.config.get("PAGINATION_MAX_LIMIT")
+
+    if limit is None:
+        return min(app.config.get("PAGINATION_DEFAULT_LIMIT"), max_limit)
+
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise BadRequest("Parameter `limit` must be an integer.")
+
+    if limit < 1:
+        raise BadRequest("Parameter `limit` must be positive.")
+
+    return min(limit, max_limit)
+
+
+def _parse_fields(document, fields: str, private) -> list:
+    fields = [f.strip() for f in fields.split(",") if f.strip()]
+
+    for field in fields:
+        if field not in document._fields or field in private:
+            raise BadRequest(f"Unknown field `{field}`.")
+
+    return fields
+
+
+def paginate(queryset, key: str = "id", private=(), prefetch=None):
+    """
+    Returns one page of a queryset and the url of the next page.
+
+    The page size, position and projection are read from the `limit`,
+    `cursor` and `fields` query parameters. Documents are sorted by `key`
+    and then by id, so `key` must be "id" or a datetime field.
+    `private` fields are never loaded or returned. `prefetch` is called
+    with the page's documents before they are serialized.
+
+        Returns:
+            (list, str): The serialized documents and the next url (or None)
+    """
+    args = request.args
+    document = queryset._document
+    limit = _parse_limit(args.get("limit"))
+
+    fields = None
+    if args.get("fields"):
+        fields = _parse_fields(document, args["fields"], private)
+        queryset = queryset.only(*fields, key)
+    else:
+        excludes = [f for f in private if f != "id"]
+        if excludes:
+            queryset = queryset.exclude(*excludes)
+
+    if args.get("cursor"):
+        position = decode_cursor(args["cursor"])
+        if key == "id":
+            queryset = queryset.filter(id__gt=position[0])
+        elif len(position) == 2:
+            queryset = queryset.filter(
+                Q(**{f"{key}__gt": position[1]})
+                | Q(**{key: position[1], "id__gt": position[0]})
+            )
+        else:
+            raise BadRequest("Invalid cursor.")
+
+    order = ("+id",) if key == "id" else (f"+{key}", "+id")
+    docs = list(queryset.order_by(*order).limit(limit + 1))
+
+    next_url = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_args = args.to_dict()
+        next_args["cursor"] = encode_cursor(docs[-1], key)
+        next_url = url_for(request.endpoint,
+                           **(request.view_args or {}),
+                           **next_args)
+
+    if prefetch is not None:
+        prefetch(docs)
+
+    """Fields that were not loaded would be serialized as their defaults"""
+    keep = None
+    if fields is not None:
+        keep = {*fields, key}
+        if "id" in keep:
+            keep.add("_id")
+
+    page = []
+    for doc in docs:
+        data = doc.serialize()
+        if keep is not None:
+            data = {k: v for k, v in data.items() if k in keep}
+        if "id" in private:
+            data.pop("_id", None)
+            data.pop("id", None)
+        page.append(data)
+
+    return page, next_url
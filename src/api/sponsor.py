@@ -10,10 +10,14 @@
 
 """
 from flask import request, current_app as app
+from src import response_cache
 from src.api import Blueprint
+from src.api.pagination import paginate
 from mongoengine.errors import NotUniqueError, ValidationError
 from werkzeug.exceptions import BadRequest, Conflict, NotFound, Unauthorized
-from src.models.sponsor import Sponsor
+from src.models.sponsor import Sponsor, sponsor_names
+from src.models.event import Event
+from src.models.tokenblacklist import TokenBlacklist
 from src.models.user import ROLES
 from src.common.decorators import authenticate, privileges
 
@@ -50,8 +54,8 @@ def create_sponsor():
     if not data:
         raise BadRequest("Not data")
 
-    from src import bcrypt
-    data["password"] = bcrypt.generate_password_hash(
+    from src import hasher
+    data["password"] = hasher.generate_password_hash(
         data["password"],
         app.config["BCRYPT_LOG_ROUNDS"])
 
@@ -63,9 +67,8 @@ def create_sponsor():
         raise BadRequest("Validation Error")
 
     """Send Verification Email"""
-    token = sponsor.encode_email_token()
     from src.common.mail import send_verification_email
-    send_verification_email(sponsor, token)
+    send_verification_email(sponsor)
 
     res = {
         "status": "success",
@@ -123,6 +126,7 @@ def delete_sponsor(loggedin_user, sponsor_name: str):
 
 
 @sponsors_blueprint.get("/sponsors/<sponsor_name>/")
+@response_cache.cached(Sponsor, Event)
 def get_sponsor(sponsor_name: str):
     """
     Retrieves a sponsor's information using their name.
@@ -144,6 +148,7 @@ def get_sponsor(sponsor_name: str):
     sponsor = Sponsor.objects(sponsor_name=sponsor_name).exclude(
         "date",
         "email_token_hash",
+        "email_token_digest",
         "id")
 
     if not sponsor:
@@ -194,7 +199,8 @@ def edit_sponsor(sponsor_name: str):
         raise BadRequest()
 
     sponsor = Sponsor.objects(sponsor_name=sponsor_name)
-    if not sponsor:
+    sponsor_ids = list(sponsor.scalar("id"))
+    if not sponsor_ids:
         raise NotFound()
 
     try:
@@ -203,6 +209,10 @@ def edit_sponsor(sponsor_name: str):
         raise Conflict("Sorry, a sponsor already exists with that name.")
     except ValidationError:
         raise BadRequest()
+    finally:
+        sponsor_names.notify()
+
+    TokenBlacklist.evict_users(*sponsor_ids)
 
     res = {
         "status": "success",
@@ -236,15 +246,15 @@ def accept_sponsor(_, username: str):
             description: Unexpected error.
     """
 
-    sponsor = Sponsor.objects(username=username).first()
-    if not sponsor:
-        raise NotFound()
+    sponsor = Sponsor.objects(username=username, isaccepted=False).modify(
+        set__isaccepted=True, new=True)
 
-    sponsor.update(isaccepted=True)
-
-    """Send Acceptance Email"""
-    from src.common.mail import send_sponsor_acceptance_email
-    send_sponsor_acceptance_email(sponsor)
+    if sponsor:
+        """Send Acceptance Email, once"""
+        from src.common.mail import send_sponsor_acceptance_email
+        send_sponsor_acceptance_email(sponsor)
+    elif not Sponsor.objects(username=username).count():
+        raise NotFound()
 
     res = {
         "status": "success",
@@ -254,7 +264,8 @@ def accept_sponsor(_, username: str):
     return res, 201
 
 
-@sponsors_blueprint.get("/sponsors/get_all_sponsors/")
+@sponsors_blueprint.get("/sponsors/get_all_sponsors/",
+                        conditional=[Sponsor, Event])
 def get_all_sponsors():
     """
     Returns an array of sponsor documents.
@@ -262,6 +273,10 @@ def get_all_sponsors():
     tags:
         - sponsor
     summary: returns an array of sponsor documents
+    parameters:
+        - $ref: '#/components/parameters/Limit'
+        - $ref: '#/components/parameters/Cursor'
+        - $ref: '#/components/parameters/Fields'
     responses:
         200:
             description: OK
@@ -270,13 +285,16 @@ def get_all_sponsors():
         5XX:
             description: Unexpected error (the API issue).
     """
-    sponsors = Sponsor.objects()
+    private = [f for f in Sponsor.private_fields if f != "id"]
+    sponsors, next_url = paginate(Sponsor.objects(), "date", private=private,
+                                  prefetch=Sponsor.prefetch_events)
 
-    if not sponsors:
+    if not sponsors and not request.args.get("cursor"):
         raise NotFound("There are no sponsors created.")
 
     res = {
         "sponsors": sponsors,
+        "next": next_url,
         "status": "success"
     }
 
@@ -8,10 +8,10 @@
         count_users()
 
 """
+from src import response_cache
 from src.api import Blueprint
 from src.models.user import User
-from src.models.hacker import Hacker
-from src.models.sponsor import Sponsor
+from src.models.stats_rollup import StatsRollup
 
 
 stats_blueprint = Blueprint("stats", __name__)
@@ -19,6 +19,7 @@ stats_blueprint = Blueprint("stats", __name__)
 
 # @stats_blueprint.route("/stats/user_count/", methods=["GET"])
 @stats_blueprint.get("/stats/user_count/")
+@response_cache.cached(User)
 def count_users():
     """
     Returns the Amount of Users
@@ -38,14 +39,28 @@ def count_users():
                                 type: integer
                             sponsors:
                                 type: integer
+                            roles:
+                                type: object
+                                description: The number of users per role.
+                                additionalProperties:
+                                    type: integer
+                            accepted:
+                                type: integer
+                            rsvp:
+                                type: integer
+                            beginner:
+                                type: integer
+                            colleges:
+                                type: array
+                                description: Without the groups smaller
+                                    than STATS_MIN_BUCKET_SIZE.
+                                items:
+                                    $ref: '#/components/schemas/NameCount'
+                            majors:
+                                type: array
+                                description: Without the groups smaller
+                                    than STATS_MIN_BUCKET_SIZE.
+                                items:
+                                    $ref: '#/components/schemas/NameCount'
     """
-    user_count = User.objects.count()
-    hacker_count = Hacker.objects.count()
-    sponsor_count = Sponsor.objects.count()
-
-    res = {
-        "total": user_count,
-        "hackers": hacker_count,
-        "sponsors": sponsor_count
-    }
-    return res, 200
+    return StatsRollup.user_stats(), 200
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+    src.api.versioning
+    ~~~~~~~~~~~~~~~~~~
+    Conditional GET support for read-mostly endpoints
+
+    Functions:
+
+        conditional(*documents)
+        versions_of(documents)
+
+"""
+from functools import wraps
+from flask import request, make_response
+from werkzeug.http import is_resource_modified
+from src.models.collection_version import CollectionVersion
+import hashlib
+
+
+def versions_of(documents) -> tuple:
+    """
+    Gets the ETag and Last-Modified date of the data in `documents`.
+
+        Returns:
+            (str, datetime): The ETag and the last modification date
+    """
+    names = [d._class_name for d in documents]
+    versions = CollectionVersion.current(names)
+
+    raw = ";".join(f"{name}:{version}:{modified.isoformat()}"
+                   for name, (version, modified) in zip(names, versions))
+    etag = hashlib.sha1(raw.encode()).hexdigest()[:20]
+    last_modified = max(modified for _, modified in versions)
+
+    return etag, last_modified.replace(microsecond=0)
+
+
+def conditional(*documents):
+    """
+    Serves ETag and Last-Modified headers for a view built from
+    `documents`, and answers 304 Not Modified to clients that already
+    have the current version, without calling the view.
+
+    The documents must be `versioned`.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag, last_modified = versions_of(documents)
+
+            if not is_resource_modified(request.environ,
+                                        etag=etag,
+                                        last_modified=last_modified):
+                response = make_response("", 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+
+            if response.status_code in (200, 304):
+                response.set_etag(etag)
+                response.last_modified = last_modified
+                response.cache_control.no_cache = True
+
+            return response
+
+        return wrapper
+
+    return decorator
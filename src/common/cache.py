@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+    src.common.cache
+    ~~~~~~~~~~~~~~~~
+    Small process-local caches
+
+    Classes:
+
+        TTLCache
+
+"""
+from collections import OrderedDict
+from threading import RLock
+import time
+
+
+class TTLCache:
+    """
+    A bounded, process-local cache whose entries expire after a TTL.
+
+    The least recently used entry is evicted once `maxsize` is reached.
+    """
+
+    def __init__(self, ttl: float = 60, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = RLock()
+
+    def get(self, key, default=None):
+        """Returns the cached value or `default` if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        """Caches a value for `ttl` seconds (defaults to the cache's TTL)"""
+        if ttl is None:
+            ttl = self.ttl
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """Removes a key from the cache"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        """Removes every entry from the cache"""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._data)
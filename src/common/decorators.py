@@ -11,7 +11,7 @@
 from flask import request, current_app
 from functools import wraps
 from werkzeug.exceptions import Forbidden, Unauthorized
-from src.models.user import User, ROLES
+from src.models.user import ROLES
 from src.models.tokenblacklist import TokenBlacklist
 from src.common.jwt import decode_jwt
 
@@ -61,20 +61,12 @@ def authenticate(f):
 
         decoded_token = decode_jwt(token)
 
-        fromBL = TokenBlacklist.findOne(
-            jti=decoded_token["jti"],
-            revoked=False
-        )
-
-        if not fromBL:
-            raise Unauthorized("User is not signed in!")
-
-        user = User.objects(username=decoded_token["sub"]).first()
+        user = TokenBlacklist.resolve_session(decoded_token["jti"])
 
         if not user:
-            raise Forbidden()
+            raise Unauthorized("User is not signed in!")
 
-        if user.username != fromBL.user.username:
+        if user.username != decoded_token["sub"]:
             raise Forbidden()
 
         return f(user, *args, **kwargs)
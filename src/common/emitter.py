@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+    src.common.emitter
+    ~~~~~~~~~~~~~~~~~~
+    Coalesces Socket.IO events into batched frames
+
+    Classes:
+
+        EmitBatcher
+
+"""
+from collections import OrderedDict
+from threading import Lock
+from flask import current_app as app
+
+
+class EmitBatcher:
+    """
+    Buffers the events emitted to a namespace for a short window.
+
+    Every room then gets a single `batch_event` frame holding its events in
+    order, as `{"name": ..., "data": ...}` items. A room with only one
+    pending event gets it as a regular event. The window is read from the
+    `config_key` setting; when it is 0, events are emitted immediately.
+    """
+
+    def __init__(self, socketio, namespace: str, batch_event: str,
+                 config_key: str):
+        self.socketio = socketio
+        self.namespace = namespace
+        self.batch_event = batch_event
+        self.config_key = config_key
+        self._pending = OrderedDict()
+        self._scheduled = False
+        self._lock = Lock()
+
+    def emit(self, name: str, data=None, room: str = None):
+        """Queues an event for `room`, or for every client if None"""
+        window = app.config.get(self.config_key)
+
+        if not window:
+            self._send(room, [(name, data)])
+            return
+
+        with self._lock:
+            self._pending.setdefault(room, []).append((name, data))
+
+            if self._scheduled:
+                return
+            self._scheduled = True
+
+        self.socketio.start_background_task(self._flush_after, window)
+
+    def flush(self):
+        """Emits every pending event now"""
+        with self._lock:
+            pending, self._pending = self._pending, OrderedDict()
+            self._scheduled = False
+
+        for room, events in pending.items():
+            self._send(room, events)
+
+    def _flush_after(self, window: float):
+        self.socketio.sleep(window)
+        self.flush()
+
+    def _send(self, room: str, events: list):
+        if len(events) == 1:
+            name, data = events[0]
+            args = (name,) if data is None else (name, data)
+        else:
+            args = (self.batch_event, [
+                {"name": name, "data": data} for name, data in events
+            ])
+
+        self.socketio.emit(*args, namespace=self.namespace, to=room)
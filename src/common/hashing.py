@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+    src.common.hashing
+    ~~~~~~~~~~~~~~~~~~
+    Runs bcrypt off the event loop in a bounded native-thread pool
+
+    Classes:
+
+        Hasher
+
+"""
+from concurrent import futures
+from threading import Semaphore
+from werkzeug.exceptions import ServiceUnavailable
+
+
+def _make_executor(size: int):
+    """
+    Creates a pool of native threads.
+
+    When gevent has patched `threading`, the stdlib executor would only
+    spawn greenlets, so gevent's own native threadpool is used instead and
+    waiting on its futures yields to the hub.
+    """
+    try:
+        from gevent import monkey
+        if monkey.is_module_patched("threading"):
+            from gevent.threadpool import ThreadPoolExecutor
+            return ThreadPoolExecutor(max_workers=size)
+    except ImportError:  # pragma: no cover
+        pass
+
+    return futures.ThreadPoolExecutor(max_workers=size,
+                                      thread_name_prefix="hasher")
+
+
+class Hasher:
+    """
+    Wraps Flask-Bcrypt so hashing runs in a worker pool.
+
+    At most `HASHING_MAX_PENDING` calls may be queued or running at once,
+    further calls fail fast with a 503. A `HASHING_POOL_SIZE` of 0 hashes
+    inline on the calling thread.
+    """
+
+    def __init__(self, bcrypt, app=None):
+        self.bcrypt = bcrypt
+        self.pool_size = 0
+        self.max_pending = 0
+        self._executor = None
+        self._slots = None
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("HASHING_POOL_SIZE", 4)
+        app.config.setdefault("HASHING_MAX_PENDING", 32)
+
+        self.shutdown()
+        self.pool_size = app.config["HASHING_POOL_SIZE"]
+        self.max_pending = app.config["HASHING_MAX_PENDING"]
+
+    def shutdown(self):
+        """Stops the worker pool, it is recreated on the next call"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        self._executor = None
+        self._slots = None
+
+    def _start(self):
+        if self._executor is None:
+            self._slots = Semaphore(self.max_pending)
+            self._executor = _make_executor(self.pool_size)
+
+    def _run(self, fn, *args):
+        if not self.pool_size:
+            return fn(*args)
+
+        self._start()
+
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise ServiceUnavailable("Server is busy, please try again.",
+                                     retry_after=1)
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            slots.release()
+
+    def generate_password_hash(self, password, rounds: int = None) -> bytes:
+        """Hashes a password in the worker pool"""
+        return self._run(self.bcrypt.generate_password_hash, password, rounds)
+
+    def check_password_hash(self, pw_hash, password) -> bool:
+        """Checks a password against a hash in the worker pool"""
+        return self._run(self.bcrypt.check_password_hash, pw_hash, password)
+
+    def generate_password_hashes(self, passwords, rounds: int = None) -> list:
+        """
+        Hashes many passwords in parallel, in the order given.
+
+        They take up at most `HASHING_POOL_SIZE` slots at once, waiting
+        for them instead of failing, so interactive calls can still get
+        the remaining slots.
+        """
+        passwords = list(passwords)
+        if not self.pool_size or not self.max_pending:
+            return [self.bcrypt.generate_password_hash(p, rounds)
+                    for p in passwords]
+
+        self._start()
+        slots = self._slots
+        size = min(self.pool_size, self.max_pending)
+        hashes = []
+
+        for i in range(0, len(passwords), size):
+            window = passwords[i:i + size]
+            for _ in window:
+                slots.acquire()
+            try:
+                pending = [
+                    self._executor.submit(self.bcrypt.generate_password_hash,
+                                          password, rounds)
+                    for password in window
+                ]
+                hashes.extend(f.result() for f in pending)
+            finally:
+                for _ in window:
+                    slots.release()
+
+        return hashes
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+    src.common.ids
+    ~~~~~~~~~~~~~~
+    Sortable integer ids generated without a database round trip
+
+    Classes:
+
+        SortableId
+
+"""
+from datetime import datetime, timezone
+from threading import Lock
+import random
+import time
+
+
+class SortableId:
+    """
+    Generates increasing integer ids from the clock, like Snowflake ids.
+
+    An id is the milliseconds since `epoch`, then `node_bits` identifying
+    the process and `sequence_bits` counting the ids of that millisecond.
+    With the defaults ids fit in 53 bits, so JavaScript clients can read
+    them as Numbers until 2298.
+
+    Ids are unique within a process and increase with time across
+    processes, but only as far as their clocks agree: an id generated by
+    one process may be smaller than an id another process generated just
+    before. Two processes may still pick the same node, so the field they
+    are stored in should be unique.
+    """
+
+    epoch = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    def __init__(self, node: int = None, node_bits: int = 5,
+                 sequence_bits: int = 5):
+        self.node_bits = node_bits
+        self.sequence_bits = sequence_bits
+        if node is None:
+            node = random.getrandbits(node_bits)
+        self.node = node
+        self._last = 0
+        self._sequence = 0
+        self._lock = Lock()
+
+    def _millis(self, moment: datetime = None) -> int:
+        if moment is None:
+            return int(time.time() * 1000) - int(self.epoch.timestamp() * 1000)
+        return int((moment.timestamp() - self.epoch.timestamp()) * 1000)
+
+    def compose(self, millis: int, node: int, sequence: int) -> int:
+        """Builds an id from its parts"""
+        return ((millis << (self.node_bits + self.sequence_bits))
+                | (node << self.sequence_bits)
+                | sequence)
+
+    def at(self, moment: datetime, sequence: int = 0) -> int:
+        """The smallest id of node 0 generated at `moment`, plus `sequence`"""
+        return self.compose(self._millis(moment), 0, 0) + sequence
+
+    def before(self, value: int, seconds: float) -> int:
+        """The smallest id generated `seconds` before the id `value`"""
+        shift = self.node_bits + self.sequence_bits
+        return max(0, (value >> shift) - int(seconds * 1000)) << shift
+
+    def __call__(self) -> int:
+        with self._lock:
+            """Never go back in time, even if the clock does"""
+            millis = max(self._millis(), self._last)
+
+            if millis == self._last:
+                self._sequence += 1
+                if self._sequence >> self.sequence_bits:
+                    """Out of ids for this millisecond, borrow the next one"""
+                    millis += 1
+                    self._sequence = 0
+            else:
+                self._sequence = 0
+
+            self._last = millis
+
+            return self.compose(millis, self.node, self._sequence)
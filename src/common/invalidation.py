@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+    src.common.invalidation
+    ~~~~~~~~~~~~~~~~~~~~~~~
+    Cross-process invalidation of process-local caches
+
+    Classes:
+
+        Invalidator
+
+"""
+from threading import Lock
+import logging
+import time
+import uuid
+import kombu
+from kombu.pools import producers
+
+
+class Invalidator:
+    """
+    Tells every other process to drop a cache when this one changes it.
+
+    Messages are fanned out over the `SOCKETIO_MESSAGE_QUEUE` broker. A
+    process only listens once it subscribes to a topic, so processes that
+    never cache anything (e.g. Celery workers) only publish. Without a
+    message queue every method is a no-op.
+
+    Publishing borrows a producer from kombu's pool and is tried once, so
+    a broker outage costs a write at most `publish_timeout` seconds.
+    """
+
+    exchange_name = "invalidation"
+    publish_timeout = 1
+
+    def __init__(self, app=None):
+        self.url = None
+        self._connection = None
+        self.host_id = uuid.uuid4().hex
+        self._handlers = {}
+        self._listening = False
+        self._lock = Lock()
+        self._start = None
+        self._logger = logging.getLogger(__name__)
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, start_background_task=None):
+        """
+        Reads the broker url from the app config.
+
+        `start_background_task` runs the listener, defaulting to a thread.
+        """
+        self.url = app.config.get("SOCKETIO_MESSAGE_QUEUE")
+        self._start = start_background_task
+
+        if self.url:
+            self._connection = kombu.Connection(
+                self.url,
+                connect_timeout=self.publish_timeout,
+                transport_options={"max_retries": 0}
+            )
+
+    @property
+    def exchange(self) -> kombu.Exchange:
+        return kombu.Exchange(self.exchange_name, type="fanout",
+                              durable=False)
+
+    def subscribe(self, topic: str, handler):
+        """Calls `handler()` whenever another process publishes `topic`"""
+        with self._lock:
+            handlers = self._handlers.setdefault(topic, [])
+            if handler not in handlers:
+                handlers.append(handler)
+
+            if self.url and not self._listening:
+                self._listening = True
+                start = self._start or self._start_thread
+                start(self._listen)
+
+    def publish(self, topic: str):
+        """Tells the other processes that `topic` changed"""
+        if not self.url:
+            return
+
+        try:
+            with producers[self._connection].acquire(
+                    block=True, timeout=self.publish_timeout) as producer:
+                producer.publish(
+                    {"topic": topic, "host_id": self.host_id},
+                    exchange=self.exchange,
+                    declare=[self.exchange],
+                    retry=False
+                )
+        except Exception:
+            """The other processes' caches still expire on their own"""
+            self._logger.exception(f"Could not publish `{topic}`")
+
+    def handle(self, message: dict):
+        """Runs the handlers of a message published by another process"""
+        if message.get("host_id") == self.host_id:
+            return
+
+        for handler in self._handlers.get(message.get("topic"), []):
+            handler()
+
+    @staticmethod
+    def _start_thread(target):
+        from threading import Thread
+        Thread(target=target, daemon=True).start()
+
+    def _listen(self):
+        queue = kombu.Queue(f"{self.exchange_name}.{self.host_id}",
+                            self.exchange,
+                            durable=False,
+                            auto_delete=True)
+
+        reconnecting = False
+
+        while True:
+            try:
+                with kombu.Connection(self.url) as connection:
+                    with connection.SimpleQueue(queue) as messages:
+                        if reconnecting:
+                            """Messages may have been missed while down"""
+                            for handlers in list(self._handlers.values()):
+                                for handler in handlers:
+                                    handler()
+                        reconnecting = True
+
+                        while True:
+                            message = messages.get(block=True)
+                            message.ack()
+                            self.handle(message.payload)
+            except Exception:
+                self._logger.exception("Invalidation listener failed")
+                time.sleep(1)
@@ -7,12 +7,16 @@
     Classes:
 
         JSONEncoderBase
+        PreEncoded
+        SocketIOJSON
 
 """
 import datetime
+from flask import json
 from flask.json import JSONEncoder
 from mongoengine.base import BaseDocument
 from mongoengine.queryset import QuerySet
+from src.models import BaseDocument as Document
 from src.models.user import ROLES
 from bson.objectid import ObjectId
 
@@ -24,6 +28,8 @@ class JSONEncoderBase(JSONEncoder):
                 return obj.isoformat() + "Z"
             elif isinstance(obj, ROLES):
                 return [r.name for r in ROLES if r & obj]
+            elif isinstance(obj, Document):
+                return obj.serialize()
             elif isinstance(obj, BaseDocument):
                 return obj.to_mongo(use_db_field=False)
             elif isinstance(obj, QuerySet):
@@ -36,3 +42,40 @@ class JSONEncoderBase(JSONEncoder):
         else:
             return list(iterable)
         return JSONEncoder.default(self, obj)
+
+
+class PreEncoded:
+    """A value that is already encoded as JSON text"""
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class SocketIOJSON:
+    """
+    Flask's json module for Socket.IO packets.
+
+    Event arguments that are `PreEncoded` are spliced into the packet as
+    is, so cached payloads are not encoded again for every client.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def dumps(self, obj, **kwargs) -> str:
+        with self.app.app_context():
+            if not isinstance(obj, list) or not any(
+                    isinstance(item, PreEncoded) for item in obj):
+                return json.dumps(obj, **kwargs)
+
+            separator = kwargs.get("separators", (", ", ": "))[0]
+            return "[" + separator.join(
+                item.text if isinstance(item, PreEncoded)
+                else json.dumps(item, **kwargs)
+                for item in obj
+            ) + "]"
+
+    def loads(self, s, **kwargs):
+        with self.app.app_context():
+            return json.loads(s, **kwargs)
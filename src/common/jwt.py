@@ -7,6 +7,8 @@
 """
 import jwt
 import uuid
+import hmac
+import hashlib
 from flask import current_app
 from werkzeug.exceptions import Unauthorized
 from datetime import datetime
@@ -42,3 +44,12 @@ def decode_jwt(token: str) -> dict:
         raise Unauthorized()
     except jwt.InvalidTokenError:
         raise Unauthorized()
+
+
+def digest_token(token: str) -> str:
+    """Returns a keyed SHA-256 digest of a token for storage and lookup"""
+    return hmac.new(
+        current_app.config.get("SECRET_KEY").encode(),
+        token.encode(),
+        hashlib.sha256
+    ).hexdigest()
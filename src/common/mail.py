@@ -3,24 +3,85 @@
     src.common.mail
     ~~~~~~~~~~~~~~~
 
+    Classes:
+
+        MailQueue
+
+    Variables:
+
+        mail_queue
+
 """
-from flask import render_template, current_app as currapp
-from src.tasks.mail_tasks import send_async_email
+from celery import group
+from flask import current_app as currapp
+from src.models.mail_claim import MailClaim
+from src.tasks.mail_tasks import publish_emails, send_acceptance_emails
+
+
+class MailQueue:
+    """
+    Enqueues the outgoing emails, to be rendered and sent by the workers.
+
+    Every email is published to the `mail-outbox` queue as soon as it is
+    added, so none are held in the web process where a restart would lose
+    them. The outbox consumers, `python -m src mail-outbox`, send them in
+    batches of up to `MAIL_BATCH_SIZE` over one SMTP session. Bulk emails
+    are grouped by the tasks that send them instead, e.g.
+    `send_acceptance_emails`.
+
+    Senders first `claim` each email, so the same template is sent to a
+    recipient at most once per `MAIL_DEDUP_SECONDS`. The claims are kept
+    in the database, as MailClaims shared by every process.
+    """
+
+    def claim(self, recipient: str, template: str) -> bool:
+        """
+        Reserves an email. Returns False if it was already claimed within
+        the window, in which case it must not be sent.
+        """
+        window = currapp.config["MAIL_DEDUP_SECONDS"]
+        if not window:
+            return True
+
+        return MailClaim.claim(recipient, template, window)
+
+    def add(self, template: str, recipient: str, context: dict):
+        """
+        Enqueues an email, to be rendered by the worker. If it can't be
+        enqueued, its claim is released so it can be sent again.
+        """
+        try:
+            publish_emails([dict(template=template,
+                                 recipient=recipient,
+                                 context=context)])
+        except Exception:
+            MailClaim.release(recipient, template)
+            raise
+
 
+mail_queue = MailQueue()
+
+
+def send_verification_email(user):
+    """
+    Issues a verification token and emails it to the user.
+
+    Repeated requests within the dedup window are dropped without issuing
+    a new token, so the link already sent stays valid.
+    """
+    if not mail_queue.claim(user.email, "email_verification"):
+        return
+
+    token = user.encode_email_token()
 
-def send_verification_email(user, token):
-    """Sends a verification email to the user"""
     if not currapp.config["SEND_MAIL"]:
         return
     href = f"{currapp.config['FRONTEND_URL']}/verifyemail?token={token}"
     if not currapp.config.get("TESTING"):
-        send_async_email.apply_async((), dict(
-            subject="Knight Hacks - Verify your Email",
-            recipient=user.email,
-            text_body=render_template("emails/email_verification.txt",
-                                      user=user),
-            html_body=render_template("emails/email_verification.html",
-                                      user=user, href=href)))
+        mail_queue.add("email_verification", user.email, {
+            "user": {"username": user.username},
+            "href": href
+        })
 
 
 def send_event_email(user, event):
@@ -31,26 +92,42 @@ def send_track_email(user, track):
     pass
 
 
+def hacker_acceptance_message(hacker) -> dict:
+    """The acceptance email of a hacker, with only what it renders"""
+    return dict(template="hacker_acceptance",
+                recipient=hacker.email,
+                context={"hacker": {"username": hacker.username,
+                                    "first_name": hacker.first_name,
+                                    "last_name": hacker.last_name}})
+
+
 def send_hacker_acceptance_email(hacker):
     """Sends an acceptance email to the hacker"""
+    if not mail_queue.claim(hacker.email, "hacker_acceptance"):
+        return
+    if not currapp.config.get("TESTING"):
+        mail_queue.add(**hacker_acceptance_message(hacker))
+
+
+def send_hacker_acceptance_emails(job, hacker_ids: list):
+    """
+    Fans the acceptance emails of many hackers out to the workers, as
+    one task per `MAIL_BATCH_SIZE` hackers.
+    """
     if not currapp.config.get("TESTING"):
-        send_async_email.apply_async((), dict(
-            subject="",
-            recipient=hacker.email,
-            text_body=render_template("emails/hacker_acceptance.txt",
-                                      hacker=hacker),
-            html_body=render_template("emails/hacker_acceptance.html",
-                                      hacker=hacker)))
+        size = currapp.config["MAIL_BATCH_SIZE"]
+        group(
+            send_acceptance_emails.s(str(job.id), hacker_ids[i:i + size])
+            for i in range(0, len(hacker_ids), size)
+        ).apply_async()
 
 
 def send_sponsor_acceptance_email(sponsor):
     """Sends an acceptance email to the sponsor"""
+    if not mail_queue.claim(sponsor.email, "sponsor_acceptance"):
+        return
     if not currapp.config.get("TESTING"):
-        send_async_email.apply_async((), dict(
-            subject="",
-            recipient=sponsor.email,
-            text_body=render_template("emails/sponsor_acceptance.txt",
-                                      sponsor=sponsor),
-            html_body=render_template(
-                "emails/sponsor_acceptance.html",
-                sponsor=sponsor)))
+        mail_queue.add("sponsor_acceptance", sponsor.email, {
+            "sponsor": {"username": sponsor.username,
+                        "sponsor_name": sponsor.sponsor_name}
+        })
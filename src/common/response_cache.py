@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+    src.common.response_cache
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+    Caches the encoded responses of public endpoints
+
+    Classes:
+
+        LocalBackend
+        RedisBackend
+        ResponseCache
+
+"""
+from functools import wraps
+from threading import Lock
+from flask import request, make_response, Response
+from src.common.cache import TTLCache
+import hashlib
+
+
+class LocalBackend:
+    """A process-local LRU of encoded responses"""
+
+    name = "local"
+
+    def __init__(self, maxsize: int = 1024):
+        self._cache = TTLCache(maxsize=maxsize)
+
+    def get(self, key: str) -> bytes:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self._cache.set(key, value, ttl)
+
+    def clear(self):
+        self._cache.clear()
+
+
+class RedisBackend:
+    """A cache shared by every process, for deployments with Redis"""
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        import redis
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> bytes:
+        return self._client.get(f"response:{key}")
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self._client.set(f"response:{key}", value, px=int(ttl * 1000))
+
+    def clear(self):
+        for key in self._client.scan_iter("response:*"):
+            self._client.delete(key)
+
+
+class ResponseCache:
+    """
+    Caches the successful responses of anonymous GET requests.
+
+    Entries are keyed by the endpoint, its view arguments, the sorted
+    query arguments and the versions of the documents the view is tagged
+    with. Any write to those documents bumps their version, so the old
+    entries are never read again and age out of the backend.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.enabled = False
+        self._stats = {}
+        self._lock = Lock()
+        self.reset_stats()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("RESPONSE_CACHE_ENABLED", True)
+        app.config.setdefault("RESPONSE_CACHE_URL", None)
+        app.config.setdefault("RESPONSE_CACHE_MAXSIZE", 1024)
+        app.config.setdefault("RESPONSE_CACHE_SECONDS", 60)
+
+        self.enabled = app.config["RESPONSE_CACHE_ENABLED"]
+        self.default_ttl = app.config["RESPONSE_CACHE_SECONDS"]
+
+        if app.config["RESPONSE_CACHE_URL"]:
+            self.backend = RedisBackend(app.config["RESPONSE_CACHE_URL"])
+        else:
+            self.backend = LocalBackend(app.config["RESPONSE_CACHE_MAXSIZE"])
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {"hits": 0,
+                           "misses": 0,
+                           "bytes_served": 0,
+                           "bytes_stored": 0}
+
+    def _count(self, **counts):
+        with self._lock:
+            for name, count in counts.items():
+                self._stats[name] += count
+
+    def stats(self) -> dict:
+        """The hit rate and sizes since the process started"""
+        with self._lock:
+            stats = dict(self._stats)
+
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["backend"] = self.backend.name if self.backend else None
+
+        return stats
+
+    @staticmethod
+    def _key(documents) -> str:
+        from src.models.collection_version import CollectionVersion
+
+        names = [d._class_name for d in documents]
+        versions = CollectionVersion.current(names)
+
+        raw = "|".join([
+            request.endpoint,
+            repr(sorted((request.view_args or {}).items())),
+            repr(sorted(request.args.items(multi=True))),
+            repr(list(zip(names, versions)))
+        ])
+
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    @staticmethod
+    def _anonymous() -> bool:
+        return not (request.cookies.get("sid") or request.headers.get("sid"))
+
+    def cached(self, *documents, ttl: float = None):
+        """
+        Caches a view's responses until `documents` change, or for `ttl`
+        seconds. Requests with credentials are never cached.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self.enabled or not self._anonymous():
+                    return view(*args, **kwargs)
+
+                key = self._key(documents)
+
+                entry = self.backend.get(key)
+                if entry is not None:
+                    mimetype, _, body = entry.partition(b"\n")
+                    self._count(hits=1, bytes_served=len(body))
+                    return Response(body, mimetype=mimetype.decode())
+
+                response = make_response(view(*args, **kwargs))
+                self._count(misses=1)
+
+                if (response.status_code == 200
+                        and not response.is_streamed):
+                    body = response.get_data()
+                    self.backend.set(
+                        key,
+                        response.mimetype.encode() + b"\n" + body,
+                        ttl or self.default_ttl
+                    )
+                    self._count(bytes_stored=len(body))
+
+                return response
+
+            return wrapper
+
+        return decorator
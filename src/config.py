@@ -24,6 +24,8 @@ class BaseConfig:
     LOGGING_LOCATION = "flask-base.log"
     LOGGING_LEVEL = logging.DEBUG
     MONGODB_HOST = os.getenv("MONGO_URI", "mongodb://localhost:27017/test")
+    MONGODB_AUTO_CREATE_INDEX = os.getenv(
+        "MONGODB_AUTO_CREATE_INDEX", "true").lower() == "true"
     SWAGGER = {
         "specs": [
             {
@@ -37,6 +39,12 @@ class BaseConfig:
     SECRET_KEY = os.getenv("SECRET_KEY")
     RABBITMQ_URL = os.getenv("RABBITMQ_URL")
     CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", RABBITMQ_URL)
+    WORKER_QUEUES = {
+        "mail-high": {"concurrency": 20, "prefetch_multiplier": 1},
+        "mail-bulk": {"concurrency": 10, "prefetch_multiplier": 2},
+        "sync": {"concurrency": 1, "prefetch_multiplier": 1},
+        "import": {"concurrency": 2, "prefetch_multiplier": 1}
+    }
     SOCKETIO_MESSAGE_QUEUE = os.getenv("SOCKETIO_MESSAGE_QUEUE", RABBITMQ_URL)
     RESULT_BACKEND = os.getenv("RESULT_BACKEND")
     MAIL_SERVER = os.getenv("MAIL_SERVER")
@@ -46,17 +54,46 @@ class BaseConfig:
     MAIL_USERNAME = os.getenv("MAIL_USERNAME")
     MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")
     MAIL_DEFAULT_SENDER = os.getenv("MAIL_DEFAULT_SENDER")
+    MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", 50))
+    MAIL_BATCH_LINGER_SECONDS = float(
+        os.getenv("MAIL_BATCH_LINGER_SECONDS", 1))
+    MAIL_MAX_RETRIES = 3
+    MAIL_RETRY_SECONDS = 60
+    MAIL_DEDUP_SECONDS = 300
     FRONTEND_URL = os.getenv("FRONTEND_URL", "https://knighthacks.org/")
     BACKEND_URL = os.getenv("BACKEND_URL", "https://api.knighthacks.org/")
     BCRYPT_LOG_ROUNDS = 13
+    HASHING_POOL_SIZE = int(os.getenv("HASHING_POOL_SIZE", 4))
+    HASHING_MAX_PENDING = int(os.getenv("HASHING_MAX_PENDING", 32))
     TOKEN_EXPIRATION_MINUTES = 15
     TOKEN_EXPIRATION_SECONDS = 0
+    SESSION_CACHE_SECONDS = 30
+    SPONSOR_CACHE_SECONDS = 60
+    COLLECTION_VERSION_SECONDS = 60
+    STATS_ROLLUP_SECONDS = 60
+    STATS_MIN_BUCKET_SIZE = 5
+    RESPONSE_CACHE_ENABLED = os.getenv(
+        "RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL")
+    RESPONSE_CACHE_MAXSIZE = 1024
+    RESPONSE_CACHE_SECONDS = 60
+    PAGINATION_DEFAULT_LIMIT = 50
+    PAGINATION_MAX_LIMIT = 200
+    EXPORT_BATCH_SIZE = 500
+    IMPORT_BATCH_SIZE = 500
+    LIVE_UPDATES_BUFFER_SIZE = 200
+    LIVE_UPDATES_BUFFER_SECONDS = 60
+    LIVE_UPDATES_BATCH_SECONDS = 0.25
+    LIVE_UPDATES_REPLAY_OVERLAP_SECONDS = 1
     NOTION_CRONJOB_USERNAME = os.getenv("NOTION_CRONJOB_USERNAME")
     NOTION_CRONJOB_PASSWORD = os.getenv("NOTION_CRONJOB_PASSWORD")
     NOTION_DB_ID = os.getenv("NOTION_DB_ID")
     NOTION_TOKEN = os.getenv("NOTION_TOKEN")
     NOTION_VERSION = os.getenv("NOTION_VERSION")
     NOTION_API_URI = os.getenv("NOTION_API_URI", "https://api.notion.com/v1")
+    NOTION_PAGE_SIZE = 100
+    NOTION_SYNC_BATCH_SIZE = 100
+    NOTION_TIMEOUT_SECONDS = 30
     SEND_MAIL = True
 
 
@@ -79,6 +116,9 @@ class TestingConfig(BaseConfig):
     MAIL_SUPPRESS_SEND = False
     SUPPRESS_EMAIL = True
     PRESERVE_CONTEXT_ON_EXCEPTION = False
+    LIVE_UPDATES_BATCH_SECONDS = 0
+    LIVE_UPDATES_REPLAY_OVERLAP_SECONDS = 0
+    STATS_ROLLUP_SECONDS = 0
     SEND_MAIL = False
 
 
@@ -9,13 +9,15 @@
         BaseDocument
 
 """
+from bson.dbref import DBRef
 from src import db
 
 
 class BaseDocument(db.Document):
     """A Base Class to be inherited by all other Document Classes"""
     meta = {
-        "abstract": True
+        "abstract": True,
+        "index_background": True
     }
 
     @classmethod
@@ -30,3 +32,19 @@ class BaseDocument(db.Document):
         doc = cls(*args, **kwargs)
         doc.save()
         return doc
+
+    def ref_id(self, field: str):
+        """The id of a reference, without dereferencing it"""
+        ref = self._data.get(field)
+        if ref is None:
+            return None
+        return ref.id if isinstance(ref, DBRef) else ref.pk
+
+    def ref_ids(self, field: str) -> list:
+        """The ids in a list of references, without dereferencing them"""
+        return [r.id if isinstance(r, DBRef) else r.pk
+                for r in self._data.get(field) or []]
+
+    def serialize(self) -> dict:
+        """Converts the document into its API representation"""
+        return self.to_mongo(use_db_field=False)
@@ -12,9 +12,15 @@
 from src import db
 from src.models import BaseDocument
 from src.models.sponsor import Sponsor
+from src.models.collection_version import versioned
 
 
+@versioned
 class Category(BaseDocument):
     name = db.StringField(unique=True, required=True)
     sponsor = db.ReferenceField(Sponsor)
     description = db.StringField()
+
+    meta = {
+        "indexes": ["sponsor"]
+    }
@@ -11,9 +11,17 @@
 """
 from src import db
 from src.models import BaseDocument
+from src.models.collection_version import versioned
 
 
+@versioned
 class ClubEvent(BaseDocument):
+    private_fields = [
+        "id",
+        "notion_id",
+        "content_hash"
+    ]
+
     name = db.StringField(required=True)
     tags = db.ListField(db.StringField())
     presenter = db.StringField()
@@ -21,7 +29,10 @@ class ClubEvent(BaseDocument):
     end = db.DateTimeField(requried=True)
     description = db.StringField()
     location = db.StringField()
+    notion_id = db.StringField(unique=True, sparse=True)
+    content_hash = db.StringField()
 
     meta = {
-        "ordering": ["date"]
+        "ordering": ["date"],
+        "indexes": ["start"]
     }
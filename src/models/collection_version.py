@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+    src.models.collection_version
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    Version counters of the documents served with conditional requests
+
+    Classes:
+
+        CollectionVersion
+        VersionedQuerySet
+
+    Functions:
+
+        versioned(document)
+
+    Variables:
+
+        version_cache
+
+"""
+from datetime import datetime
+from flask import current_app as app
+from mongoengine import signals
+from mongoengine.queryset import QuerySet
+from pymongo import UpdateOne
+from src import db, invalidator
+from src.models import BaseDocument
+from src.common.cache import TTLCache
+
+
+"""Per-process cache of the versions, keyed by document name"""
+version_cache = TTLCache()
+
+
+class CollectionVersion(BaseDocument):
+    name = db.StringField(unique=True, required=True)
+    version = db.IntField(default=0)
+    modified = db.DateTimeField(default=datetime.utcnow)
+
+    topic = "collection_versions"
+
+    @classmethod
+    def bump(cls, *names: str):
+        """Marks every response built from `names` as stale"""
+        now = datetime.utcnow()
+        cls._get_collection().bulk_write([
+            UpdateOne({"name": name},
+                      {"$inc": {"version": 1}, "$set": {"modified": now}},
+                      upsert=True)
+            for name in names
+        ], ordered=False)
+
+        for name in names:
+            version_cache.pop(name)
+        invalidator.publish(cls.topic)
+
+    @classmethod
+    def bump_document(cls, document):
+        """
+        Bumps a document class, its parents and its subclasses, since a
+        write through any of them may change the others' results.
+        """
+        parts = document._class_name.split(".")
+        parents = [".".join(parts[:i]) for i in range(1, len(parts))]
+        cls.bump(*parents, *document._subclasses)
+
+    @classmethod
+    def current(cls, names) -> list:
+        """
+        Gets the `(version, modified)` of each name, querying only the
+        ones that are not cached.
+        """
+        missing = [n for n in names if n not in version_cache]
+
+        if missing:
+            invalidator.subscribe(cls.topic, version_cache.clear)
+            ttl = app.config.get("COLLECTION_VERSION_SECONDS")
+
+            found = {v.name: v for v in cls.objects(name__in=missing)}
+            for name in missing:
+                version = found.get(name)
+                if version is None:
+                    """Never written to, start counting from now"""
+                    version = cls.objects(name=name).modify(
+                        upsert=True,
+                        new=True,
+                        set_on_insert__version=0,
+                        set_on_insert__modified=datetime.utcnow()
+                    )
+                version_cache.set(name,
+                                  (version.version, version.modified),
+                                  ttl)
+
+        return [version_cache.get(n) for n in names]
+
+
+class VersionedQuerySet(QuerySet):
+    """Bumps the version of its document after every write"""
+
+    def _bump(self):
+        CollectionVersion.bump_document(self._document)
+
+    def insert(self, *args, **kwargs):
+        result = super().insert(*args, **kwargs)
+        self._bump()
+        return result
+
+    def update(self, *args, **kwargs):
+        result = super().update(*args, **kwargs)
+        self._bump()
+        return result
+
+    def modify(self, *args, **kwargs):
+        result = super().modify(*args, **kwargs)
+        self._bump()
+        return result
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self._bump()
+        return result
+
+
+def versioned(document):
+    """
+    Tracks the writes to a document class, and its subclasses, in their
+    CollectionVersions.
+
+    Writes that bypass mongoengine, e.g. `bulk_write` on the collection,
+    must call `CollectionVersion.bump_document` themselves.
+    """
+    document._meta["queryset_class"] = VersionedQuerySet
+    document._qs = property(_versioned_qs)
+    return document
+
+
+def _versioned_qs(document):
+    """
+    The queryset of a document's own `update`, `modify` and `delete`,
+    which mongoengine builds as a plain QuerySet.
+    """
+    return VersionedQuerySet(document.__class__, document._get_collection())
+
+
+def _post_save(sender, document, **kwargs):
+    if sender._meta.get("queryset_class") is VersionedQuerySet:
+        CollectionVersion.bump_document(sender)
+
+
+signals.post_save.connect(_post_save)
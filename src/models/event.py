@@ -10,12 +10,16 @@
 
 """
 
+from pymongo import UpdateOne
 from src import db
+from src.models.collection_version import CollectionVersion
 from src.models.sponsor import Sponsor
 from src.models.user import User
 from src.models import BaseDocument
+from src.models.collection_version import versioned
 
 
+@versioned
 class Event(BaseDocument):
     name = db.StringField(unique=True, required=True)
     date_time = db.DateTimeField(required=True)
@@ -31,9 +35,77 @@ class Event(BaseDocument):
     loc = db.StringField()
     description = db.StringField()
 
-    def to_mongo(self, *args, **kwargs):
-        data = super().to_mongo(*args, **kwargs)
+    meta = {
+        "indexes": ["sponsors", "date_time"]
+    }
 
-        data["sponsors"] = [s.sponsor_name for s in self.sponsors]
+    @classmethod
+    def migrate_sponsor_names(cls) -> int:
+        """
+        Replaces the sponsor names stored in `sponsors` by older versions
+        with references. Names that match no sponsor are dropped.
+
+            Returns:
+                int: The number of events that were migrated
+        """
+        collection = cls._get_collection()
+        events = collection.find({"sponsors.0": {"$exists": True}},
+                                 {"sponsors": True})
+        legacy = [e for e in events
+                  if any(isinstance(s, str) for s in e["sponsors"])]
+
+        names = {s for e in legacy
+                 for s in e["sponsors"] if isinstance(s, str)}
+        ids = dict(Sponsor.objects(sponsor_name__in=list(names))
+                   .scalar("sponsor_name", "id")) if names else {}
+
+        requests = []
+        for event in legacy:
+            sponsors = [ids.get(s) if isinstance(s, str) else s
+                        for s in event["sponsors"]]
+            requests.append(UpdateOne(
+                {"_id": event["_id"]},
+                {"$set": {"sponsors": [s for s in sponsors if s is not None]}}
+            ))
+
+        if requests:
+            collection.bulk_write(requests, ordered=False)
+            CollectionVersion.bump_document(cls)
+
+        return len(requests)
+
+    @property
+    def sponsor_ids(self) -> list:
+        """The ids of this event's sponsors, without dereferencing them"""
+        return self.ref_ids("sponsors")
+
+    @classmethod
+    def prefetch_sponsor_names(cls, events):
+        """
+        Resolves the sponsor names of many events with a single query.
+
+        The same lookup table is shared by every event, so serializing them
+        afterwards costs no further round trips.
+        """
+        events = list(events)
+        ids = {i for e in events for i in e.sponsor_ids}
+
+        names = {}
+        if ids:
+            names = dict(
+                Sponsor.objects(id__in=list(ids)).scalar("id", "sponsor_name")
+            )
+
+        for event in events:
+            event._sponsor_names = [names[i] for i in event.sponsor_ids
+                                    if i in names]
+
+    def serialize(self) -> dict:
+        data = super().serialize()
+
+        if getattr(self, "_sponsor_names", None) is None:
+            Event.prefetch_sponsor_names([self])
+
+        data["sponsors"] = self._sponsor_names
 
         return data
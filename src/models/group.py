@@ -12,12 +12,18 @@
 from datetime import datetime
 from src import db
 from src.models import BaseDocument
+from src.models.collection_version import versioned
 from src.models.hacker import Hacker
 
 
+@versioned
 class Group(BaseDocument):
     name = db.StringField(unique=True, required=True)
     icon = db.StringField()
     members = db.ListField(db.ReferenceField(Hacker))
     categories = db.ListField(db.StringField())
     date = db.DateTimeField(default=datetime.utcnow)
+
+    meta = {
+        "indexes": ["members", "date"]
+    }
@@ -9,12 +9,19 @@
         HackerProfile
         Hacker
 
+    Variables:
+
+        MEMBER_FIELDS
+
 """
 from src import db
 from src.models.user import User
 from mongoengine import signals
 
 
+MEMBER_FIELDS = ("first_name", "last_name", "email", "username")
+
+
 class Education_Info(db.EmbeddedDocument):
     college = db.StringField()
     major = db.StringField()
@@ -41,6 +48,36 @@ class Hacker(User):  # Stored in the "user" collection
     socials = db.EmbeddedDocumentField(Socials)
     why_attend = db.StringField(max_length=200)
     what_learn = db.ListField()
+    acceptance_job = db.ObjectIdField()
+
+    private_fields = User.private_fields + ["acceptance_job"]
+
+    meta = {
+        "indexes": [
+            ("_cls", "isaccepted"),
+            {"fields": ["acceptance_job"], "sparse": True}
+        ]
+    }
+
+    @classmethod
+    def resolve_members(cls, values, field: str = "email"):
+        """
+        Finds many hackers by email, username or id with a single query.
+
+        Only the MEMBER_FIELDS are loaded.
+
+            Returns:
+                (list, list): The hackers in the order of `values` and the
+                              values that did not match any hacker
+        """
+        values = list(values)
+        hackers = cls.objects(**{f"{field}__in": values}).only(*MEMBER_FIELDS)
+        found = {h[field]: h for h in hackers}
+
+        members = [found[v] for v in values if v in found]
+        missing = [v for v in values if v not in found]
+
+        return members, missing
 
 
 signals.pre_delete.connect(User.pre_delete, sender=Hacker)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+    src.models.import_job
+    ~~~~~~~~~~~~~~~~~~~~~
+    Model definition for the progress of bulk hacker imports
+
+    Classes:
+
+        ImportJob
+        ImportBatch
+
+    Variables:
+
+        IMPORT_FIELDS
+        IMPORT_BOOLEANS
+
+"""
+from datetime import datetime
+import json
+from src import db
+from src.models import BaseDocument
+
+
+"""The fields of an imported hacker, those of the export plus a password"""
+IMPORT_FIELDS = ("password", "username", "email", "first_name", "last_name",
+                 "phone_number", "date", "isaccepted", "rsvp_status",
+                 "beginner", "can_share_info", "ethnicity", "pronouns",
+                 "edu_info", "socials", "why_attend", "what_learn")
+
+IMPORT_BOOLEANS = ("isaccepted", "rsvp_status", "beginner", "can_share_info")
+
+
+class ImportJob(BaseDocument):
+    total = db.IntField(default=0)
+    processed = db.IntField(default=0)
+    inserted = db.IntField(default=0)
+    duplicates = db.ListField(db.DictField())
+    invalid = db.ListField(db.DictField())
+    created = db.DateTimeField(default=datetime.utcnow)
+
+    meta = {
+        "indexes": [
+            {"fields": ["created"], "expireAfterSeconds": 7 * 24 * 60 * 60}
+        ]
+    }
+
+    @classmethod
+    def record(cls, job_id: str, rows: int, report: dict):
+        """Counts the rows of one chunk as processed, with their report"""
+        cls.objects(id=job_id).update(
+            inc__processed=rows,
+            inc__inserted=report["inserted"],
+            push_all__duplicates=report["duplicates"],
+            push_all__invalid=report["invalid"]
+        )
+
+    def progress(self) -> dict:
+        """The counts of the job, and the rows that were not inserted"""
+        return {
+            "job_id": str(self.id),
+            "total": self.total,
+            "processed": self.processed,
+            "inserted": self.inserted,
+            "duplicates": sorted(self.duplicates, key=lambda d: d["row"]),
+            "invalid": sorted(self.invalid, key=lambda i: i["row"]),
+            "done": self.processed >= self.total
+        }
+
+
+class ImportBatch(BaseDocument):
+    """
+    The uploaded rows of one chunk of an ImportJob, staged until a worker
+    inserts them. The rows hold plaintext passwords, so only the batch id
+    goes through the broker, and the batch is deleted once processed.
+    """
+    job = db.ObjectIdField(required=True)
+    rows = db.StringField(required=True)
+    created = db.DateTimeField(default=datetime.utcnow)
+
+    meta = {
+        "indexes": [
+            {"fields": ["created"], "expireAfterSeconds": 24 * 60 * 60}
+        ]
+    }
+
+    @classmethod
+    def stage(cls, job, rows: list, size: int) -> list:
+        """Stores `rows` in batches of `size`, with one write"""
+        batches = [cls(job=job.id, rows=json.dumps(rows[i:i + size]))
+                   for i in range(0, len(rows), size)]
+
+        return cls.objects.insert(batches) if batches else []
+
+    def load(self) -> list:
+        """The `(row, fields)` pairs of the batch"""
+        return json.loads(self.rows)
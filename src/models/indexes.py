@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+    src.models.indexes
+    ~~~~~~~~~~~~~~~~~~
+    Builds and checks the indexes declared in the models' meta
+
+    Functions:
+
+        documents()
+        auto_create_indexes(enabled)
+        ensure_indexes()
+        ensure_ttl_indexes()
+        missing_indexes()
+        check_indexes(logger)
+
+"""
+from flask import current_app as app
+
+
+def documents() -> list:
+    """Gets every concrete Document class"""
+    from src.models import BaseDocument
+    from src.models import (  # noqa: F401
+        category,
+        club_event,
+        event,
+        group,
+        hacker,
+        import_job,
+        live_update,
+        mail_claim,
+        mail_job,
+        sponsor,
+        stats_rollup,
+        tokenblacklist,
+        user
+    )
+
+    found = []
+
+    def walk(cls):
+        for subclass in cls.__subclasses__():
+            if not subclass._meta.get("abstract") and subclass not in found:
+                found.append(subclass)
+            walk(subclass)
+
+    walk(BaseDocument)
+
+    return found
+
+
+def auto_create_indexes(enabled: bool):
+    """
+    Sets whether each collection builds its indexes on first use.
+
+    When disabled, indexes are only built by `python -m src ensure-indexes`.
+    """
+    for document in documents():
+        document._meta["auto_create_index"] = enabled
+
+
+def ensure_ttl_indexes():
+    """Creates the indexes whose options depend on the app config"""
+    from src.models.tokenblacklist import TokenBlacklist
+
+    TokenBlacklist.create_index("created_at", expireAfterSeconds=(
+        60 * app.config.get("TOKEN_EXPIRATION_MINUTES")
+        + app.config.get("TOKEN_EXPIRATION_SECONDS")
+    ), background=True)
+
+
+def ensure_indexes():
+    """Builds every declared index in the background"""
+    for document in documents():
+        document.ensure_indexes()
+
+    ensure_ttl_indexes()
+
+
+def missing_indexes() -> list:
+    """
+    Lists the declared indexes that do not exist in the database.
+
+        Returns:
+            list: (collection name, index fields) pairs
+    """
+    missing = []
+    checked = set()
+
+    for document in documents():
+        collection = document._get_collection_name()
+        if collection in checked:
+            continue
+        checked.add(collection)
+
+        for fields in document.compare_indexes()["missing"]:
+            missing.append((collection, fields))
+
+    return missing
+
+
+def check_indexes(logger):
+    """Logs a warning for every declared index that was not built"""
+    missing = missing_indexes()
+
+    for collection, fields in missing:
+        logger.warning(f"Missing index on `{collection}`: {fields}")
+
+    if missing:
+        logger.warning("Run `python -m src ensure-indexes` to build them.")
+
+    return missing
@@ -7,18 +7,236 @@
     Classes:
 
         LiveUpdate
+        LiveUpdateBuffer
+
+    Variables:
+
+        live_update_ids
+        recent_updates
 
 """
+from collections import deque
 from datetime import datetime
-from src import db
+from threading import RLock
+import time
+from flask import current_app as app, json
+from mongoengine import signals
+from mongoengine.errors import NotUniqueError
+from pymongo import UpdateOne
+from src import db, invalidator
 from src.models import BaseDocument
+from src.common.ids import SortableId
+from src.common.json import PreEncoded
+
+
+"""Generates LiveUpdate IDs in-process, so inserts take one round trip"""
+live_update_ids = SortableId()
+
+"""IDs below this were handed out by the old `mongoengine.counters` sequence"""
+LEGACY_ID_LIMIT = 1 << 40
 
 
 class LiveUpdate(BaseDocument):
-    ID = db.SequenceField(unique=True)
+    ID = db.IntField(unique=True, default=live_update_ids)
     timestamp = db.DateTimeField(default=datetime.now)
     message = db.StringField(required=True)
+    topic = db.StringField(max_length=64)
 
     meta = {
-        "ordering": ["date"]
+        "ordering": ["date"],
+        "indexes": [("topic", "ID")]
     }
+
+    def to_payload(self) -> dict:
+        """The representation sent to Socket.IO clients"""
+        return {
+            "ID": self.ID,
+            "timestamp": self.timestamp,
+            "message": self.message,
+            "topic": self.topic
+        }
+
+    @classmethod
+    def createOne(cls, *args, **kwargs):
+        """Creates a new update, retrying if another process took its ID"""
+        for attempt in range(3):
+            try:
+                return super().createOne(*args, **kwargs)
+            except NotUniqueError:
+                if "ID" in kwargs or attempt == 2:
+                    raise
+
+    @classmethod
+    def migrate_ids(cls) -> int:
+        """
+        Moves the updates numbered by the old sequence to sortable IDs.
+
+        The new IDs are derived from each update's timestamp, keeping the
+        order of the old IDs, and the sequence's counter is deleted.
+
+            Returns:
+                int: The number of updates that were renumbered
+        """
+        legacy = (cls.objects(ID__lt=LEGACY_ID_LIMIT)
+                  .order_by("ID")
+                  .only("ID", "timestamp"))
+
+        requests = []
+        previous = 0
+        for update in legacy:
+            new_id = max(live_update_ids.at(update.timestamp), previous + 1)
+            requests.append(UpdateOne({"_id": update.pk},
+                                      {"$set": {"ID": new_id}}))
+            previous = new_id
+
+        if requests:
+            cls._get_collection().bulk_write(requests, ordered=True)
+
+        cls._get_db()["mongoengine.counters"].delete_one(
+            {"_id": f"{cls._get_collection_name()}.ID"}
+        )
+
+        recent_updates.invalidate()
+        recent_updates.notify()
+
+        return len(requests)
+
+    @classmethod
+    def delete_all(cls):
+        """Deletes every update, which sends no signals"""
+        cls.drop_collection()
+        recent_updates.invalidate()
+        recent_updates.notify()
+
+    @classmethod
+    def post_save(cls, sender, document, created=False, **kwargs):
+        if not created:
+            recent_updates.invalidate()
+        elif document.topic is None:
+            recent_updates.append(document)
+        else:
+            """Topic updates are not buffered"""
+            return
+
+        recent_updates.notify()
+
+    @classmethod
+    def post_delete(cls, sender, document, **kwargs):
+        recent_updates.invalidate()
+        recent_updates.notify()
+
+
+class LiveUpdateBuffer:
+    """
+    A capped, in-memory ring buffer of the most recent LiveUpdates that
+    are sent to every client, i.e. that have no topic.
+
+    It is loaded from the database with one bounded query and kept up to
+    date by this process' writes. Writes from other processes invalidate
+    it through the `invalidator`, and as a fallback it is reloaded once
+    older than `LIVE_UPDATES_BUFFER_SECONDS`.
+    """
+
+    topic = "live_updates"
+
+    def __init__(self):
+        self._updates = deque()
+        self._floor = None
+        self._snapshot = None
+        self._expires = 0
+        self._lock = RLock()
+
+    def invalidate(self):
+        """Forces a reload on the next read"""
+        with self._lock:
+            self._expires = 0
+            self._snapshot = None
+
+    def notify(self):
+        """Invalidates the buffers of the other processes"""
+        invalidator.publish(self.topic)
+
+    def _load(self):
+        invalidator.subscribe(self.topic, self.invalidate)
+
+        size = app.config.get("LIVE_UPDATES_BUFFER_SIZE")
+        newest = (LiveUpdate.objects(topic=None)
+                  .order_by("-ID")
+                  .limit(size + 1))
+        updates = [u.to_payload() for u in newest]
+
+        # The newest ID that is not buffered, None if all of them are
+        self._floor = updates[size]["ID"] if len(updates) > size else None
+        self._updates = deque(reversed(updates[:size]), maxlen=size)
+        self._snapshot = None
+        self._expires = (time.monotonic()
+                         + app.config.get("LIVE_UPDATES_BUFFER_SECONDS"))
+
+    def append(self, update: LiveUpdate):
+        """Adds a new update, evicting the oldest one once full"""
+        with self._lock:
+            if self._expires <= time.monotonic():
+                return
+
+            if len(self._updates) == self._updates.maxlen:
+                self._floor = self._updates[0]["ID"]
+            self._updates.append(update.to_payload())
+            self._snapshot = None
+
+    def since(self, last_id: int = None) -> list:
+        """
+        Gets the updates newer than `last_id`, or every update if None.
+
+        IDs from different processes are only ordered as far as their
+        clocks agree, so an update saved elsewhere just after `last_id`
+        may have a smaller ID. The updates generated up to
+        `LIVE_UPDATES_REPLAY_OVERLAP_SECONDS` before `last_id` are sent
+        again, and clients drop the IDs they have already seen.
+
+        Falls back to the database when the buffer no longer holds every
+        update the client missed.
+        """
+        with self._lock:
+            if self._expires <= time.monotonic():
+                self._load()
+
+            updates = list(self._updates)
+            floor = self._floor
+
+        overlap = app.config.get("LIVE_UPDATES_REPLAY_OVERLAP_SECONDS")
+        if last_id is not None and overlap:
+            last_id = live_update_ids.before(last_id, overlap) - 1
+
+        if floor is None and last_id is None:
+            return updates
+
+        if last_id is not None and (floor is None or last_id >= floor):
+            return [u for u in updates if u["ID"] > last_id]
+
+        query = {"topic": None}
+        if last_id is not None:
+            query["ID__gt"] = last_id
+        return [u.to_payload()
+                for u in LiveUpdate.objects(**query).order_by("ID")]
+
+    def snapshot(self) -> PreEncoded:
+        """
+        Gets every update, encoded as JSON.
+
+        The encoded list is kept until the updates change, so reconnecting
+        clients neither query the database nor encode it again.
+        """
+        with self._lock:
+            if self._expires <= time.monotonic():
+                self._load()
+
+            if self._snapshot is None:
+                self._snapshot = PreEncoded(json.dumps(self.since()))
+
+            return self._snapshot
+
+
+recent_updates = LiveUpdateBuffer()
+
+signals.post_save.connect(LiveUpdate.post_save, sender=LiveUpdate)
+signals.post_delete.connect(LiveUpdate.post_delete, sender=LiveUpdate)
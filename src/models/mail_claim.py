@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+    src.models.mail_claim
+    ~~~~~~~~~~~~~~~~~~~~~
+    Model definition for the emails reserved by a sender
+
+    Classes:
+
+        MailClaim
+
+"""
+from datetime import datetime, timedelta
+from mongoengine.errors import NotUniqueError
+from src import db
+from src.models import BaseDocument
+
+
+class MailClaim(BaseDocument):
+    key = db.StringField(unique=True, required=True)
+    expires = db.DateTimeField(required=True)
+
+    meta = {
+        "indexes": [
+            {"fields": ["expires"], "expireAfterSeconds": 0}
+        ]
+    }
+
+    @staticmethod
+    def key_for(recipient: str, template: str) -> str:
+        return f"{template}:{recipient.lower()}"
+
+    @classmethod
+    def claim(cls, recipient: str, template: str, seconds: float) -> bool:
+        """
+        Reserves an email for `seconds`, across every process. Returns
+        False if it is already reserved.
+        """
+        key = cls.key_for(recipient, template)
+        now = datetime.utcnow()
+        expires = now + timedelta(seconds=seconds)
+
+        try:
+            cls(key=key, expires=expires).save(force_insert=True)
+            return True
+        except NotUniqueError:
+            """Expired claims remain until the TTL monitor removes them"""
+            return cls.objects(key=key, expires__lte=now).modify(
+                set__expires=expires) is not None
+
+    @classmethod
+    def release(cls, recipient: str, template: str):
+        """Drops a reservation, so the email can be sent again"""
+        cls.objects(key=cls.key_for(recipient, template)).delete()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+    src.models.mail_job
+    ~~~~~~~~~~~~~~~~~~~
+    Model definition for the progress of bulk email fan-outs
+
+    Classes:
+
+        MailJob
+
+"""
+from datetime import datetime
+from src import db
+from src.models import BaseDocument
+
+
+class MailJob(BaseDocument):
+    kind = db.StringField(required=True)
+    total = db.IntField(default=0)
+    sent = db.IntField(default=0)
+    retried = db.IntField(default=0)
+    failed = db.IntField(default=0)
+    created = db.DateTimeField(default=datetime.utcnow)
+
+    meta = {
+        "indexes": [
+            {"fields": ["created"], "expireAfterSeconds": 7 * 24 * 60 * 60}
+        ]
+    }
+
+    @classmethod
+    def record(cls, job_id: str, sent: int, retried: int = 0,
+               skipped: int = 0, failed: int = 0):
+        """
+        Counts the emails of one chunk as processed. Skipped recipients,
+        e.g. deleted since the job started, are removed from the total.
+        A retry moves its emails from `retried` to `sent` or `failed`.
+        """
+        cls.objects(id=job_id).update(inc__sent=sent,
+                                      inc__retried=retried,
+                                      inc__failed=failed,
+                                      dec__total=skipped)
+
+    def progress(self) -> dict:
+        """
+        The counts of the job. Retried emails are still waiting to be
+        sent again, failed ones ran out of retries.
+        """
+        processed = self.sent + self.failed
+
+        return {
+            "job_id": str(self.id),
+            "kind": self.kind,
+            "total": self.total,
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            "done": processed >= self.total
+        }
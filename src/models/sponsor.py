@@ -7,9 +7,17 @@
     Classes:
 
         Sponsor
+        SponsorNames
+
+    Variables:
+
+        sponsor_names
 """
+from flask import current_app as app
 from mongoengine.errors import ValidationError
-from src import db
+from threading import RLock
+import time
+from src import db, invalidator
 from src.models.user import User
 from mongoengine import signals
 
@@ -20,17 +28,53 @@ class Sponsor(User):
     subscription_tier = db.StringField()
     isaccepted = db.BooleanField(default=False)
 
+    meta = {
+        "indexes": [
+            ("_cls", "sponsor_name")
+        ]
+    }
+
     @property
     def events(self):
         """Gets the Events for this sponsor"""
         from src.models.event import Event
 
-        events = Event.objects(sponsors=self)
+        events = getattr(self, "_prefetched_events", None)
+        if events is None:
+            events = Event.objects(sponsors=self)
 
         return events
 
-    def to_mongo(self, *args, **kwargs):
-        data = super().to_mongo(*args, **kwargs)
+    @classmethod
+    def prefetch_events(cls, sponsors):
+        """
+        Loads the Events of many sponsors with a single query.
+
+        The Events' sponsor names are resolved in one more query, so
+        serializing the sponsors afterwards costs no further round trips.
+        """
+        from src.models.event import Event
+
+        sponsors = [s for s in sponsors if s.pk is not None]
+        grouped = {s.pk: [] for s in sponsors}
+
+        if grouped:
+            events = list(Event.objects(sponsors__in=sponsors))
+            Event.prefetch_sponsor_names(events)
+            for event in events:
+                for sponsor_id in event.sponsor_ids:
+                    if sponsor_id in grouped:
+                        grouped[sponsor_id].append(event)
+
+        for sponsor in sponsors:
+            sponsor._prefetched_events = grouped[sponsor.pk]
+
+    @classmethod
+    def post_write(cls, sender, document, **kwargs):
+        sponsor_names.notify()
+
+    def serialize(self) -> dict:
+        data = super().serialize()
 
         try:
             data["events"] = [e for e in self.events]
@@ -40,4 +84,89 @@ class Sponsor(User):
         return data
 
 
+class SponsorNames:
+    """
+    A process-local, two-way mapping between sponsor names and ids.
+
+    The whole mapping is loaded with one query and reloaded after a sponsor
+    is written. Writes from other processes invalidate it through the
+    `invalidator`, and as a fallback it is reloaded once
+    `SPONSOR_CACHE_SECONDS` have passed. A lookup
+    missing from the mapping queries that one sponsor, and a sponsor that
+    does not exist is remembered as missing until the next reload.
+    """
+
+    topic = "sponsor_names"
+
+    def __init__(self):
+        self._by_name = {}
+        self._by_id = {}
+        self._missing = set()
+        self._expires = 0
+        self._lock = RLock()
+
+    def invalidate(self):
+        """Forces a reload on the next lookup"""
+        with self._lock:
+            self._expires = 0
+
+    def notify(self):
+        """Invalidates the mapping of this and the other processes"""
+        self.invalidate()
+        invalidator.publish(self.topic)
+
+    def _load(self):
+        with self._lock:
+            if self._expires > time.monotonic():
+                return
+
+            invalidator.subscribe(self.topic, self.invalidate)
+
+            pairs = list(Sponsor.objects.scalar("id", "sponsor_name"))
+            self._by_id = dict(pairs)
+            self._by_name = {name: pk for pk, name in pairs if name}
+            self._missing = set()
+            self._expires = (time.monotonic()
+                             + app.config.get("SPONSOR_CACHE_SECONDS"))
+
+    def _load_one(self, key, **query):
+        """Adds a single sponsor, it may have been created elsewhere"""
+        with self._lock:
+            if key in self._missing:
+                return
+
+            pair = Sponsor.objects(**query).scalar(
+                "id", "sponsor_name").first()
+            if pair is None:
+                self._missing.add(key)
+                return
+
+            pk, name = pair
+            self._by_id[pk] = name
+            if name:
+                self._by_name[name] = pk
+
+    def id_for(self, name: str):
+        """Gets the id of a sponsor by name, or None"""
+        self._load()
+
+        if name and name not in self._by_name:
+            self._load_one(("name", name), sponsor_name=name)
+
+        return self._by_name.get(name)
+
+    def name_for(self, pk):
+        """Gets the name of a sponsor by id, or None"""
+        self._load()
+
+        if pk is not None and pk not in self._by_id:
+            self._load_one(("id", pk), id=pk)
+
+        return self._by_id.get(pk)
+
+
+sponsor_names = SponsorNames()
+
 signals.pre_delete.connect(User.pre_delete, sender=Sponsor)
+signals.post_save.connect(Sponsor.post_write, sender=Sponsor)
+signals.post_delete.connect(Sponsor.post_write, sender=Sponsor)
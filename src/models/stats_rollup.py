@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+    src.models.stats_rollup
+    ~~~~~~~~~~~~~~~~~~~~~~~
+    Materialized statistics over the users
+
+    Classes:
+
+        StatsRollup
+
+    Variables:
+
+        USER_STATS_PIPELINE
+        rollup_cache
+
+"""
+from datetime import datetime, timedelta
+from flask import current_app as app
+from src import db
+from src.models import BaseDocument
+from src.models.collection_version import CollectionVersion
+from src.models.user import User, ROLES
+from src.common.cache import TTLCache
+
+
+"""Every user statistic, in a single round trip"""
+USER_STATS_PIPELINE = [
+    {"$facet": {
+        "classes": [
+            {"$group": {
+                "_id": {"cls": "$_cls", "roles": "$roles"},
+                "count": {"$sum": 1}
+            }}
+        ],
+        "hackers": [
+            {"$match": {"_cls": "User.Hacker"}},
+            {"$group": {
+                "_id": None,
+                "accepted": {"$sum": {"$cond": ["$isaccepted", 1, 0]}},
+                "rsvp": {"$sum": {"$cond": ["$rsvp_status", 1, 0]}},
+                "beginner": {"$sum": {"$cond": ["$beginner", 1, 0]}}
+            }}
+        ],
+        "colleges": [
+            {"$match": {"_cls": "User.Hacker",
+                        "edu_info.college": {"$type": "string"}}},
+            {"$group": {"_id": "$edu_info.college", "count": {"$sum": 1}}}
+        ],
+        "majors": [
+            {"$match": {"_cls": "User.Hacker",
+                        "edu_info.major": {"$type": "string"}}},
+            {"$group": {"_id": "$edu_info.major", "count": {"$sum": 1}}}
+        ]
+    }}
+]
+
+"""Per-process copy of the rollups, keyed by name"""
+rollup_cache = TTLCache()
+
+
+class StatsRollup(BaseDocument):
+    name = db.StringField(unique=True, required=True)
+    version = db.IntField(required=True)
+    version_modified = db.DateTimeField(required=True)
+    computed = db.DateTimeField(default=datetime.utcnow)
+    data = db.DictField()
+
+    @classmethod
+    def user_stats(cls) -> dict:
+        """
+        Gets the user statistics.
+
+        They are served from memory or from the stored rollup while no
+        user was written since they were computed. Otherwise they are
+        recomputed with one aggregation and stored again, at most once
+        every `STATS_ROLLUP_SECONDS` across the processes. The previous
+        rollup is served in between.
+        """
+        version = CollectionVersion.current([User._class_name])[0]
+
+        cached = rollup_cache.get("users")
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        now = datetime.utcnow()
+        rollup = cls.objects(name="users").first()
+
+        if rollup is None:
+            rollup = cls._store_user_stats(version, now)
+        elif (rollup.version, rollup.version_modified) != version:
+            wait = (rollup.computed - now + timedelta(
+                seconds=app.config["STATS_ROLLUP_SECONDS"])).total_seconds()
+            if wait > 0:
+                """Recomputed recently, keep it until the window passes"""
+                rollup_cache.set("users", (version, rollup.data), wait)
+                return rollup.data
+
+            """Only the process that claims the rollup recomputes it"""
+            claimed = cls.objects(name="users",
+                                  computed=rollup.computed).modify(
+                                      set__computed=now)
+            if claimed is None:
+                return rollup.data
+
+            rollup = cls._store_user_stats(version, now)
+
+        rollup_cache.set("users", (version, rollup.data))
+
+        return rollup.data
+
+    @classmethod
+    def _store_user_stats(cls, version, computed):
+        return cls.objects(name="users").modify(
+            upsert=True,
+            new=True,
+            set__version=version[0],
+            set__version_modified=version[1],
+            set__computed=computed,
+            set__data=cls.compute_user_stats()
+        )
+
+    @staticmethod
+    def compute_user_stats() -> dict:
+        """Aggregates the user statistics"""
+        result = next(User._get_collection().aggregate(USER_STATS_PIPELINE))
+
+        stats = {
+            "total": 0,
+            "hackers": 0,
+            "sponsors": 0,
+            "roles": {r.name: 0 for r in ROLES},
+            "accepted": 0,
+            "rsvp": 0,
+            "beginner": 0,
+            "colleges": [],
+            "majors": []
+        }
+
+        for group in result["classes"]:
+            count = group["count"]
+            stats["total"] += count
+
+            if group["_id"].get("cls") == "User.Hacker":
+                stats["hackers"] += count
+            elif group["_id"].get("cls") == "User.Sponsor":
+                stats["sponsors"] += count
+
+            roles = group["_id"].get("roles")
+            for role in ROLES:
+                if roles is not None and role.value & roles:
+                    stats["roles"][role.name] += count
+
+        for hackers in result["hackers"]:
+            for field in ("accepted", "rsvp", "beginner"):
+                stats[field] = hackers[field]
+
+        """
+        Lists, since college and major names may contain dots. Smaller
+        groups than STATS_MIN_BUCKET_SIZE could single out a hacker, so
+        they are left out.
+        """
+        minimum = app.config["STATS_MIN_BUCKET_SIZE"]
+        for breakdown in ("colleges", "majors"):
+            stats[breakdown] = [
+                {"name": group["_id"], "count": group["count"]}
+                for group in sorted(result[breakdown],
+                                    key=lambda g: (-g["count"], g["_id"]))
+                if group["count"] >= minimum
+            ]
+
+        return stats
@@ -3,12 +3,27 @@
     server.models.tokenblacklist
     ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+    Variables:
+
+        SESSION_CLAIMS
+        session_cache
+
 """
-from src import db
+from flask import current_app as app
+from src import db, invalidator
 from src.models import BaseDocument
+from src.common.cache import TTLCache
 from datetime import datetime
 
 
+"""The User fields cached per session, the ones requests authorize with"""
+SESSION_CLAIMS = ("_id", "_cls", "username", "email", "roles",
+                  "sponsor_name")
+
+"""Per-process cache of the sessions' claims, keyed by the token's jti"""
+session_cache = TTLCache()
+
+
 class TokenBlacklist(BaseDocument):
     jti = db.StringField(max_length=36, required=True, unique=True)
     created_at = db.DateTimeField(required=True, default=datetime.utcnow)
@@ -16,4 +31,70 @@ class TokenBlacklist(BaseDocument):
     from src.models.user import User
     user = db.ReferenceField(User, required=True)
 
-    meta = {"indexes": []}
+    meta = {"indexes": ["user"]}
+
+    topic = "sessions"
+
+    @classmethod
+    def resolve_session(cls, jti: str):
+        """
+        Gets the User for a non-revoked token in a single round trip.
+
+        Returns None if the token is revoked, unknown or if its user no
+        longer exists.
+        """
+        from src.models.user import User
+
+        claims = session_cache.get(jti)
+        if claims is not None:
+            """A copy, so the request can't change the cached claims"""
+            return User._from_son(dict(claims))
+
+        pipeline = [
+            {"$lookup": {
+                "from": User._get_collection_name(),
+                "localField": "user",
+                "foreignField": "_id",
+                "as": "session_user"
+            }},
+            {"$limit": 1}
+        ]
+
+        result = next(
+            cls.objects(jti=jti, revoked=False).aggregate(pipeline),
+            None
+        )
+
+        if not result or not result["session_user"]:
+            return None
+
+        claims = {k: v for k, v in result["session_user"][0].items()
+                  if k in SESSION_CLAIMS}
+
+        invalidator.subscribe(cls.topic, session_cache.clear)
+        session_cache.set(jti, claims, app.config.get("SESSION_CACHE_SECONDS"))
+
+        return User._from_son(dict(claims))
+
+    @classmethod
+    def revoke(cls, jti: str):
+        """Revokes a token and drops its cached session"""
+        cls.objects(jti=jti).modify(revoked=True)
+        session_cache.pop(jti)
+        invalidator.publish(cls.topic)
+
+    @classmethod
+    def revoke_user(cls, user):
+        """Deletes every token of a user and drops their cached sessions"""
+        tokens = cls.objects(user=user)
+        for jti in tokens.scalar("jti"):
+            session_cache.pop(jti)
+        tokens.delete()
+        invalidator.publish(cls.topic)
+
+    @classmethod
+    def evict_users(cls, *user_ids):
+        """Drops the cached sessions of users whose claims were updated"""
+        for jti in cls.objects(user__in=user_ids).scalar("jti"):
+            session_cache.pop(jti)
+        invalidator.publish(cls.topic)
@@ -13,11 +13,12 @@
         ROLES
 
 """
-from src.common.jwt import encode_jwt, decode_jwt
+from src.common.jwt import encode_jwt, decode_jwt, digest_token
 from flask import current_app as app
 from datetime import datetime, timedelta
-from src import db, bcrypt
+from src import db, hasher
 from src.models import BaseDocument
+from src.models.collection_version import versioned
 from enum import Flag, auto
 from mongoengine import signals
 
@@ -41,15 +42,21 @@ class ROLES(Flag):
         return super()._missing_(value)
 
 
+@versioned
 class User(BaseDocument):
     meta = {"allow_inheritance": True,
-            "ordering": ["date"]}
+            "ordering": ["date"],
+            "indexes": [
+                ("_cls", "username"),
+                {"fields": ["email_token_digest"], "sparse": True}
+            ]}
 
     private_fields = [
         "id",
         "password",
         "email_verification",
-        "email_token_hash"
+        "email_token_hash",
+        "email_token_digest"
     ]
 
     username = db.StringField(unique=True, required=True)
@@ -59,11 +66,12 @@ class User(BaseDocument):
     roles = db.EnumField(enum=ROLES, required=True)
     email_verification = db.BooleanField(default=False)
     email_token_hash = db.BinaryField()
+    email_token_digest = db.StringField()
 
     @classmethod
     def pre_delete(cls, sender, document, **kwargs):
         from src.models.tokenblacklist import TokenBlacklist
-        TokenBlacklist.objects(user=document).delete()
+        TokenBlacklist.revoke_user(document)
         app.logger.info("Deleted all tokens from tokenblacklist for "
                         f"the deleted user {document.username}.")
 
@@ -97,11 +105,8 @@ class User(BaseDocument):
             sub=self.username
         )
 
-        conf = app.config["BCRYPT_LOG_ROUNDS"]
-        email_token_hash = bcrypt.generate_password_hash(email_token, conf)
-
-        self.modify(set__email_token_hash=email_token_hash)
-        self.save()
+        self.modify(set__email_token_digest=digest_token(email_token),
+                    unset__email_token_hash=True)
 
         return email_token
 
@@ -110,11 +115,51 @@ class User(BaseDocument):
         """Decodes the email token"""
         return decode_jwt(email_token)["sub"]
 
+    @classmethod
+    def verify_email_token(cls, email_token: str):
+        """
+        Marks the owner of an email token as verified.
+
+        Tokens are single use. Returns the verified User, or None if the
+        token is unknown or was already used.
+        """
+        username = cls.decode_email_token(email_token)
+
+        user = cls.objects(
+            username=username,
+            email_token_digest=digest_token(email_token)
+        ).modify(
+            set__email_verification=True,
+            unset__email_token_digest=True,
+            unset__email_token_hash=True,
+            new=True
+        )
+
+        if user:
+            return user
+
+        """Accept bcrypt hashed tokens issued before digests were used"""
+        user = cls.objects(username=username,
+                           email_token_hash__exists=True).first()
+
+        if not user or not hasher.check_password_hash(user.email_token_hash,
+                                                      email_token):
+            return None
+
+        return cls.objects(
+            pk=user.pk,
+            email_token_hash=user.email_token_hash
+        ).modify(
+            set__email_verification=True,
+            unset__email_token_hash=True,
+            new=True
+        )
+
     def __init__(self, *args, **kwargs):
         conf = app.config["BCRYPT_LOG_ROUNDS"]
         if (kwargs.get("password") is not None
                 and isinstance(kwargs.get('password'), str)):
-            kwargs['password'] = bcrypt.generate_password_hash(
+            kwargs['password'] = hasher.generate_password_hash(
                 kwargs['password'],
                 conf)
 
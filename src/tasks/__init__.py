@@ -7,25 +7,53 @@
     Functions:
 
         make_celery(app)
+        worker_arguments(app, queue)
+
+    Variables:
+
+        TASK_ROUTES
 
 """
 from celery import Celery
 from celery.signals import worker_process_init
+from kombu import Exchange, Queue
 import sentry_sdk
 from sentry_sdk.integrations.flask import FlaskIntegration
 from sentry_sdk.integrations.celery import CeleryIntegration
 
 
+"""
+The queue of each task. Time sensitive emails go to `mail-high`, so they
+are never stuck behind bulk sends or a long sync. Hacker imports get their
+own queue, so a large upload does not hold up the Notion sync.
+"""
+TASK_ROUTES = {
+    "src.tasks.mail_tasks.send_email_batch": {"queue": "mail-high"},
+    "src.tasks.mail_tasks.send_async_email": {"queue": "mail-high"},
+    "src.tasks.mail_tasks.send_acceptance_emails": {"queue": "mail-bulk"},
+    "src.tasks.clubevent_tasks.refresh_notion_clubevents": {"queue": "sync"},
+    "src.tasks.import_tasks.import_hackers_batch": {"queue": "import"}
+}
+
+
 def make_celery(app) -> Celery:
     """Initialize the Celery Application"""
 
+    """Unrouted tasks stay on Celery's default queue"""
+    queues = [Queue(name, Exchange(name), routing_key=name)
+              for name in ["celery", *app.config["WORKER_QUEUES"]]]
+
     celery = Celery(
         app.import_name,
         backend=app.config["RESULT_BACKEND"],
         broker=app.config["CELERY_BROKER_URL"],
-        include=["src.tasks.mail_tasks", "src.tasks.clubevent_tasks"],
+        include=["src.tasks.mail_tasks",
+                 "src.tasks.clubevent_tasks",
+                 "src.tasks.import_tasks"],
         worker_send_task_events=True,
-        task_send_sent_event=True
+        task_send_sent_event=True,
+        task_routes=TASK_ROUTES,
+        task_queues=queues
     )
     celery.conf.update(app.config)
 
@@ -49,3 +77,23 @@ def make_celery(app) -> Celery:
             )
 
     return celery
+
+
+def worker_arguments(app, queue: str = None) -> list:
+    """
+    The `celery worker` arguments of a worker dedicated to `queue`, with
+    the concurrency and prefetch set in WORKER_QUEUES. Without a queue,
+    the worker consumes every queue with Celery's defaults.
+    """
+    if queue is None:
+        return ["worker"]
+
+    settings = app.config["WORKER_QUEUES"][queue]
+
+    return [
+        "worker",
+        "--queues", queue,
+        "--hostname", f"{queue}@%h",
+        "--concurrency", str(settings["concurrency"]),
+        "--prefetch-multiplier", str(settings["prefetch_multiplier"])
+    ]
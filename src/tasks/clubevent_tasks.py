@@ -1,105 +1,216 @@
 # -*- coding: utf-8 -*-
 """
-    src.tasks.mail_tasks
-    ~~~~~~~~~~~~~~~~~~~~
+    src.tasks.clubevent_tasks
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
 
     Functions:
 
         refresh_notion_clubevents()
+        notion_session()
+        notion_pages(session)
+        clean_notion(r)
+        content_hash(event)
+        batched(iterable, size)
 
 """
 from src import celery
 from src.models.club_event import ClubEvent
+from src.models.collection_version import CollectionVersion
+from flask import current_app as app
 from mongoengine.errors import ValidationError
+from pymongo import UpdateOne
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from itertools import islice
+import hashlib
+import json
 import requests
 import dateutil.parser
 from datetime import datetime, timedelta
 
 
-@celery.task
-def refresh_notion_clubevents():
-    from flask import current_app as app
-    with app.app_context():
+"""Only pages with every field filled in are synced"""
+NOTION_FILTER = {
+    "and": [
+        {
+            "property": "Name",
+            "text": {"is_not_empty": True}
+        },
+        {
+            "property": "Tags",
+            "multi_select": {"is_not_empty": True}
+        },
+        {
+            "property": "Presenter",
+            "text": {"is_not_empty": True}
+        },
+        {
+            "property": "Date",
+            "date": {"is_not_empty": True}
+        },
+        {
+            "property": "Location",
+            "text": {"is_not_empty": True}
+        },
+        {
+            "property": "Description",
+            "text": {"is_not_empty": True}
+        }
+    ]
+}
 
-        def clean_notion(r: dict) -> dict:
-            p = r["properties"]
-
-            def fix_date(d: str) -> datetime:
-                if not d:
-                    return None
-                return dateutil.parser.parse(d)
-
-            start_date = fix_date(p["Date"]["date"]["start"])
-            end_date = fix_date(p["Date"]["date"]["end"])
-            if end_date is None:
-                end_date = start_date + timedelta(hours=1)
-
-            return {
-                "name": p["Name"]["title"][0]["plain_text"],
-                "tags": tuple(
-                    map(lambda t: t["name"], p["Tags"]["multi_select"])
-                ),
-                "presenter": p["Presenter"]["rich_text"][0]["plain_text"],
-                "start": start_date,
-                "end": end_date,
-                "description": p["Description"]["rich_text"][0]["plain_text"],
-                "location": p["Location"]["rich_text"][0]["plain_text"]
-            }
-
-        ClubEvent.drop_collection()
-
-        res = requests.post(
-            app.config.get("NOTION_API_URI")
-            + f"/databases/{app.config.get('NOTION_DB_ID')}/query",
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {app.config.get('NOTION_TOKEN')}",
-                "Notion-Version": app.config.get("NOTION_VERSION")
-            },
-            json={
-                "filter": {
-                    "and": [
-                        {
-                            "property": "Name",
-                            "text": {"is_not_empty": True}
-                        },
-                        {
-                            "property": "Tags",
-                            "multi_select": {"is_not_empty": True}
-                        },
-                        {
-                            "property": "Presenter",
-                            "text": {"is_not_empty": True}
-                        },
-                        {
-                            "property": "Date",
-                            "date": {"is_not_empty": True}
-                        },
-                        {
-                            "property": "Location",
-                            "text": {"is_not_empty": True}
-                        },
-                        {
-                            "property": "Description",
-                            "text": {"is_not_empty": True}
-                        }
-                    ]
-                }
-            }
-        )
+_session = None
+
+
+def notion_session() -> requests.Session:
+    """Gets this process' pooled session for the Notion API"""
+    global _session
+
+    if _session is None:
+        retries = Retry(total=3,
+                        backoff_factor=0.5,
+                        status_forcelist=(429, 500, 502, 503, 504),
+                        allowed_methods=None)
+        session = requests.Session()
+        session.mount("http://", HTTPAdapter(max_retries=retries))
+        session.mount("https://", HTTPAdapter(max_retries=retries))
+        _session = session
+
+    return _session
+
+
+def notion_pages(session: requests.Session):
+    """
+    Yields the pages of the club events database query, one at a time.
+
+    Follows `next_cursor` until Notion reports no more pages, so only one
+    page is held in memory.
+    """
+    url = (app.config.get("NOTION_API_URI")
+           + f"/databases/{app.config.get('NOTION_DB_ID')}/query")
+    headers = {
+        "Authorization": f"Bearer {app.config.get('NOTION_TOKEN')}",
+        "Notion-Version": app.config.get("NOTION_VERSION")
+    }
+    body = {
+        "filter": NOTION_FILTER,
+        "page_size": app.config.get("NOTION_PAGE_SIZE")
+    }
+
+    while True:
+        res = session.post(url, headers=headers, json=body,
+                           timeout=app.config.get("NOTION_TIMEOUT_SECONDS"))
+        res.raise_for_status()
+        page = res.json()
+
+        yield page.get("results", [])
+
+        if not page.get("has_more") or not page.get("next_cursor"):
+            return
+
+        body["start_cursor"] = page["next_cursor"]
+
+
+def clean_notion(r: dict) -> dict:
+    """Converts a Notion page into the fields of a ClubEvent"""
+    p = r["properties"]
+
+    def fix_date(d: str) -> datetime:
+        if not d:
+            return None
+        return dateutil.parser.parse(d)
 
-        raw_data = res.json().get("results", [])
+    start_date = fix_date(p["Date"]["date"]["start"])
+    end_date = fix_date(p["Date"]["date"]["end"])
+    if end_date is None:
+        end_date = start_date + timedelta(hours=1)
 
-        data = map(clean_notion, raw_data)
+    return {
+        "name": p["Name"]["title"][0]["plain_text"],
+        "tags": tuple(
+            map(lambda t: t["name"], p["Tags"]["multi_select"])
+        ),
+        "presenter": p["Presenter"]["rich_text"][0]["plain_text"],
+        "start": start_date,
+        "end": end_date,
+        "description": p["Description"]["rich_text"][0]["plain_text"],
+        "location": p["Location"]["rich_text"][0]["plain_text"]
+    }
 
-        for event in data:
+
+def content_hash(event: dict) -> str:
+    """A digest of an event's fields, to skip the unchanged ones"""
+    raw = json.dumps(event, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def batched(iterable, size: int):
+    """Yields lists of up to `size` items"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _club_events(pages):
+    """Cleans and validates the events of each page as it arrives"""
+    for results in pages:
+        for result in results:
+            fields = clean_notion(result)
+            event = ClubEvent(notion_id=result["id"],
+                              content_hash=content_hash(fields),
+                              **fields)
             try:
-                ClubEvent.createOne(**event)
+                event.validate()
             except ValidationError:
                 app.logger.warning(
-                    "Invalid Club Event(s) from Notion, did not refresh!"
+                    f"Invalid Club Event `{event.name}` from Notion, skipped!"
                 )
             else:
-                app.logger.info(
-                    "Club Event(s) grabbed from Notion, refresh successfull!"
-                )
+                yield event
+
+
+@celery.task
+def refresh_notion_clubevents():
+    with app.app_context():
+        """
+        Events are upserted by their Notion page id, skipping the ones
+        whose content did not change, and the events that are no longer
+        in Notion are deleted at the end. Readers always see a full
+        calendar, and nothing changes if Notion fails.
+        """
+        collection = ClubEvent._get_collection()
+        known = dict(ClubEvent.objects.scalar("notion_id", "content_hash"))
+        events = _club_events(notion_pages(notion_session()))
+        batch_size = app.config.get("NOTION_SYNC_BATCH_SIZE")
+
+        seen = set()
+        written = 0
+        for batch in batched(events, batch_size):
+            writes = []
+            for event in batch:
+                seen.add(event.notion_id)
+                if known.get(event.notion_id) == event.content_hash:
+                    continue
+
+                writes.append(UpdateOne({"notion_id": event.notion_id},
+                                        {"$set": event.to_mongo().to_dict()},
+                                        upsert=True))
+
+            if writes:
+                collection.bulk_write(writes, ordered=False)
+                written += len(writes)
+
+        removed = collection.delete_many(
+            {"notion_id": {"$nin": list(seen)}}
+        ).deleted_count
+
+        if written or removed:
+            CollectionVersion.bump_document(ClubEvent)
+
+        app.logger.info(
+            f"{len(seen)} Club Event(s) grabbed from Notion, refresh "
+            f"successfull! ({written} written, {removed} removed)"
+        )
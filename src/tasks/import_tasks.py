@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+    src.tasks.import_tasks
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Functions:
+
+        import_hackers_batch(batch_id)
+
+"""
+from flask import current_app as app
+from mongoengine.errors import FieldDoesNotExist, ValidationError
+from mongoengine.queryset.visitor import Q
+from pymongo.errors import BulkWriteError
+import dateutil.parser
+from src import celery, hasher
+from src.models.collection_version import CollectionVersion
+from src.models.hacker import Hacker
+from src.models.import_job import (
+    IMPORT_BOOLEANS,
+    IMPORT_FIELDS,
+    ImportBatch,
+    ImportJob
+)
+from src.models.user import User, ROLES
+
+
+@celery.task
+def import_hackers_batch(batch_id):
+    """
+    Validates and inserts a staged ImportBatch of uploaded hackers, counts
+    them on its ImportJob and deletes the batch.
+    """
+    batch = ImportBatch.objects(id=batch_id).first()
+    if batch is None:
+        """Already processed, or expired"""
+        return
+
+    rows = batch.load()
+    report = {"inserted": 0, "duplicates": [], "invalid": []}
+    seen = (set(), set())
+    valid = []
+
+    for number, fields in rows:
+        hacker, password, errors = _import_hacker(fields)
+        if errors:
+            report["invalid"].append({"row": number, "errors": errors})
+        else:
+            valid.append((number, hacker, password))
+
+    if valid:
+        _import_batch(valid, seen, report)
+
+    if report["inserted"]:
+        CollectionVersion.bump_document(Hacker)
+
+    ImportJob.record(batch.job, len(rows), report)
+    batch.delete()
+
+
+def _import_hacker(fields):
+    """
+    Validates the fields of an uploaded hacker.
+
+        Returns:
+            (Hacker, str, dict): The unsaved hacker, its password and the
+                                 errors by field, if any
+    """
+    if not isinstance(fields, dict):
+        return None, None, {"row": "Must be an object."}
+
+    errors = {f: "Unknown field." for f in fields if f not in IMPORT_FIELDS}
+
+    password = fields.pop("password", None)
+    if not isinstance(password, str) or not password:
+        errors["password"] = "Field is required."
+
+    for field in IMPORT_BOOLEANS:
+        if field in fields and not isinstance(fields[field], bool):
+            errors[field] = "Must be true or false."
+
+    if errors:
+        return None, None, errors
+
+    try:
+        if fields.get("date"):
+            fields["date"] = dateutil.parser.parse(fields["date"])
+
+        hacker = Hacker(**fields, roles=ROLES.HACKER,
+                        email_verification=True)
+        hacker.validate()
+    except ValidationError as e:
+        """The password is only hashed once the row is inserted"""
+        errors = {f: str(error) for f, error in (e.errors or {}).items()
+                  if f != "password"}
+        if errors or not e.errors:
+            return None, None, errors or {"row": str(e)}
+    except (FieldDoesNotExist, ValueError, TypeError, OverflowError) as e:
+        return None, None, {"row": str(e)}
+
+    return hacker, password, {}
+
+
+def _import_batch(batch: list, seen: tuple, report: dict):
+    """
+    Inserts a batch of validated hackers with one unordered write,
+    reporting the ones whose username or email is taken.
+    """
+    usernames, emails = seen
+
+    taken = User.objects(
+        Q(username__in=[h.username for _, h, _ in batch])
+        | Q(email__in=[h.email for _, h, _ in batch])
+    ).only("username", "email")
+    for user in taken:
+        usernames.add(user.username)
+        emails.add(user.email)
+
+    fresh = []
+    for number, hacker, password in batch:
+        if hacker.username in usernames or hacker.email in emails:
+            report["duplicates"].append({"row": number,
+                                         "username": hacker.username,
+                                         "email": hacker.email})
+            continue
+
+        usernames.add(hacker.username)
+        emails.add(hacker.email)
+        fresh.append((number, hacker, password))
+
+    if not fresh:
+        return
+
+    hashes = hasher.generate_password_hashes(
+        [password for _, _, password in fresh],
+        app.config["BCRYPT_LOG_ROUNDS"])
+    for (_, hacker, _), pw_hash in zip(fresh, hashes):
+        hacker.password = pw_hash
+
+    try:
+        Hacker._get_collection().insert_many(
+            [hacker.to_mongo() for _, hacker, _ in fresh], ordered=False)
+        report["inserted"] += len(fresh)
+    except BulkWriteError as e:
+        """Taken by a concurrent write since the lookup"""
+        report["inserted"] += e.details["nInserted"]
+        for error in e.details["writeErrors"]:
+            number, hacker, _ = fresh[error["index"]]
+            report["duplicates"].append({"row": number,
+                                         "username": hacker.username,
+                                         "email": hacker.email})
@@ -3,24 +3,311 @@
     src.tasks.mail_tasks
     ~~~~~~~~~~~~~~~~~~~~
 
+    Classes:
+
+        EmailTemplates
+
     Functions:
 
+        deliver(messages)
+        drain_outbox(outbox)
+        publish_emails(messages)
+        run_outbox()
+        send_acceptance_emails(job_id, hacker_ids)
         send_async_email()
+        send_email_batch(messages, job_id=None)
+
+    Variables:
+
+        EMAIL_SUBJECTS
+        EMAIL_FRAGMENTS
+        MAIL_OUTBOX
+        email_templates
 
 """
+import smtplib
+from threading import Lock
+import time
+from celery.signals import worker_init
+from flask import current_app as app
 from flask_mail import Message
+from jinja2 import TemplateError
+from kombu import Exchange, Queue
+from markupsafe import Markup
 from src import celery, mail
 
 
+"""The subject of each email template under `templates/emails`"""
+EMAIL_SUBJECTS = {
+    "email_verification": "Knight Hacks - Verify your Email",
+    "hacker_acceptance": "",
+    "sponsor_acceptance": ""
+}
+
+"""The partials without variables, shared by the html templates"""
+EMAIL_FRAGMENTS = ("head", "top", "footer")
+
+"""The single emails, waiting to be sent in batches by `run_outbox`"""
+MAIL_OUTBOX = Queue("mail-outbox", Exchange("mail-outbox"),
+                    routing_key="mail-outbox")
+
+
+class EmailTemplates:
+    """
+    The email templates, compiled once per worker process.
+
+    Messages only carry a template name and the per-recipient context,
+    the bodies are rendered here. The static partials, EMAIL_FRAGMENTS,
+    are rendered once and passed to the templates as `fragments`.
+    """
+
+    def __init__(self):
+        self._compiled = {}
+        self._fragments = {}
+        self._lock = Lock()
+
+    def load(self):
+        """Compiles every template, in the app context"""
+        with self._lock:
+            self._fragments = {
+                name: Markup(app.jinja_env.get_template(
+                    f"emails/{name}.html").render())
+                for name in EMAIL_FRAGMENTS
+            }
+            self._compiled = {
+                (name, ext): app.jinja_env.get_template(
+                    f"emails/{name}.{ext}")
+                for name in EMAIL_SUBJECTS
+                for ext in ("txt", "html")
+            }
+
+    def render(self, message: dict) -> dict:
+        """Renders the subject and bodies of a message"""
+        if "template" not in message:
+            """Queued before the bodies were rendered by the workers"""
+            return message
+
+        if not self._compiled:
+            self.load()
+
+        name = message["template"]
+        context = dict(message.get("context") or {},
+                       fragments=self._fragments)
+
+        return dict(
+            subject=EMAIL_SUBJECTS[name],
+            recipient=message["recipient"],
+            text_body=self._compiled[(name, "txt")].render(**context),
+            html_body=self._compiled[(name, "html")].render(**context)
+        )
+
+
+email_templates = EmailTemplates()
+
+
+@worker_init.connect
+def load_email_templates(*args, **kwargs):
+    """
+    Compiles the templates as the worker starts. Unlike
+    `worker_process_init`, this also fires for the gevent and thread
+    pools, and prefork children inherit the compiled templates.
+    """
+    from src import app as flask_app
+    with flask_app.app_context():
+        email_templates.load()
+
+
+def _suppressed() -> bool:
+    return bool(app.config.get("DEBUG") or app.config.get("TESTING"))
+
+
+def deliver(messages: list) -> list:
+    """
+    Sends `messages` over a single SMTP session.
+
+    Each message is a dict of a `template`, from EMAIL_SUBJECTS, its
+    `recipient` and the `context` to render it with. Returns the messages
+    that could not be sent, so they can be retried on their own. When the
+    session itself fails, every message it did not send is returned.
+    """
+    failed = []
+    done = 0
+
+    try:
+        with mail.connect() as connection:
+            for message in messages:
+                try:
+                    rendered = email_templates.render(message)
+                except TemplateError as error:
+                    """Rendering again would fail the same way, drop it"""
+                    app.logger.error("Failed to render an email to "
+                                     f"{message['recipient']}: {error}")
+                    done += 1
+                    continue
+
+                msg = Message(subject=rendered["subject"],
+                              recipients=[rendered["recipient"]])
+                msg.body = rendered["text_body"]
+                msg.html = rendered["html_body"]
+
+                try:
+                    connection.send(msg)
+                except (smtplib.SMTPServerDisconnected, ConnectionError):
+                    raise
+                except (smtplib.SMTPException, OSError) as error:
+                    app.logger.warning("Failed to send an email to "
+                                       f"{message['recipient']}: {error}")
+                    failed.append(message)
+                done += 1
+    except (smtplib.SMTPException, OSError) as error:
+        app.logger.warning(f"Failed to send {len(messages) - done} emails, "
+                           f"the SMTP session failed: {error}")
+        failed.extend(messages[done:])
+
+    return failed
+
+
+def publish_emails(messages: list):
+    """
+    Adds emails to the outbox. They are persisted by the broker until a
+    consumer has sent them.
+    """
+    with celery.producer_pool.acquire(block=True) as producer:
+        for message in messages:
+            producer.publish(message,
+                             exchange=MAIL_OUTBOX.exchange,
+                             routing_key=MAIL_OUTBOX.routing_key,
+                             declare=[MAIL_OUTBOX],
+                             serializer="json",
+                             delivery_mode="persistent",
+                             retry=True)
+
+
+def drain_outbox(outbox, timeout: float = 1) -> int:
+    """
+    Sends a batch of the outbox, a kombu SimpleQueue, over one SMTP session.
+
+    Waits up to `timeout` for an email, then takes up to `MAIL_BATCH_SIZE`
+    of them, for at most `MAIL_BATCH_LINGER_SECONDS` after the first. The
+    emails are only acknowledged once sent, or handed to `send_email_batch`
+    to be retried, so the broker redelivers them if this process dies.
+    Returns how many emails were taken.
+    """
+    size = app.config["MAIL_BATCH_SIZE"]
+    taken = []
+
+    try:
+        taken.append(outbox.get(block=True, timeout=timeout))
+        deadline = time.monotonic() + app.config["MAIL_BATCH_LINGER_SECONDS"]
+
+        while len(taken) < size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            taken.append(outbox.get(block=True, timeout=remaining))
+    except outbox.Empty:
+        pass
+
+    if not taken:
+        return 0
+
+    messages = [m.payload for m in taken]
+    failed = [] if _suppressed() else deliver(messages)
+    if failed:
+        send_email_batch.apply_async(
+            (failed,), countdown=app.config["MAIL_RETRY_SECONDS"])
+
+    for m in taken:
+        m.ack()
+
+    return len(taken)
+
+
+def run_outbox():
+    """
+    Sends the outbox in batches until stopped, reconnecting to the broker
+    when the connection fails. Several consumers may run at once.
+    """
+    email_templates.load()
+
+    while True:
+        try:
+            with celery.connection_for_read() as connection:
+                with connection.SimpleQueue(MAIL_OUTBOX) as outbox:
+                    outbox.consumer.qos(
+                        prefetch_count=app.config["MAIL_BATCH_SIZE"])
+
+                    while True:
+                        drain_outbox(outbox)
+        except Exception:
+            app.logger.exception("Mail outbox consumer failed")
+            time.sleep(1)
+
+
+@celery.task(bind=True)
+def send_email_batch(self, messages, job_id=None):
+    """
+    Sends a batch of Emails, retrying the ones that failed.
+
+    With a `job_id`, the batch holds emails of that MailJob that failed
+    once already, and their outcome is counted on the job.
+    """
+    if _suppressed():
+        return
+
+    failed = deliver(messages)
+    max_retries = app.config["MAIL_MAX_RETRIES"]
+
+    if job_id is not None:
+        from src.models.mail_job import MailJob
+
+        sent = len(messages) - len(failed)
+        given_up = len(failed) if self.request.retries >= max_retries else 0
+        MailJob.record(job_id,
+                       sent=sent,
+                       retried=-(sent + given_up),
+                       failed=given_up)
+
+    if failed:
+        raise self.retry(args=(failed,),
+                         kwargs={"job_id": job_id},
+                         countdown=app.config["MAIL_RETRY_SECONDS"],
+                         max_retries=max_retries)
+
+
 @celery.task
 def send_async_email(subject, recipient, text_body, html_body):
-    """Sends an Email"""
-    from flask import current_app as app
-    with app.app_context():
-        msg = Message(subject=subject, recipients=[recipient])
-        msg.body = text_body
-        msg.html = html_body
-
-        if not app.config.get("DEBUG") and (
-                not app.config.get("TESTING")):
-            mail.send(msg)  # pragma: no cover
+    """Sends an Email, as a batch of one"""
+    send_email_batch.delay([dict(subject=subject,
+                                 recipient=recipient,
+                                 text_body=text_body,
+                                 html_body=html_body)])
+
+
+@celery.task
+def send_acceptance_emails(job_id, hacker_ids):
+    """
+    Sends the acceptance emails of a chunk of hackers over one session.
+    The ones that fail are handed to `send_email_batch` to be retried,
+    and counted as retried on the job until they are sent or given up.
+    """
+    from src.common.mail import hacker_acceptance_message
+    from src.models.hacker import Hacker
+    from src.models.mail_job import MailJob
+
+    hackers = Hacker.objects(id__in=hacker_ids).only(
+        "username", "email", "first_name", "last_name")
+    messages = [hacker_acceptance_message(h) for h in hackers]
+
+    failed = [] if _suppressed() else deliver(messages)
+    if failed:
+        send_email_batch.apply_async(
+            (failed,),
+            {"job_id": job_id},
+            countdown=app.config["MAIL_RETRY_SECONDS"],
+            queue="mail-bulk")
+
+    MailJob.record(job_id,
+                   sent=len(messages) - len(failed),
+                   retried=len(failed),
+                   skipped=len(hacker_ids) - len(messages))
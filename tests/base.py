@@ -1,16 +1,48 @@
 # flake8: noqa
 import os, json
+from contextlib import contextmanager
+from unittest import mock
 from flask_testing import TestCase
+from mongomock.collection import Collection
 from mongoengine import connect
 from mongoengine.connection import disconnect_all
 from src.models.user import User, ROLES
-from src.models.tokenblacklist import TokenBlacklist
+from src.models.sponsor import sponsor_names
+from src.models.live_update import recent_updates
+from src.models.collection_version import version_cache
+from src.models.stats_rollup import rollup_cache
+from src import response_cache
+from src.models.tokenblacklist import TokenBlacklist, session_cache
 from src.common.jwt import decode_jwt
 
 os.environ["APP_SETTINGS"] = "src.config.TestingConfig"
 from src import app
 
 
+@contextmanager
+def count_queries():
+    """Counts the database reads issued inside the block"""
+    queries = []
+    depth = [0]
+
+    def counted(name):
+        original = getattr(Collection, name)
+
+        def wrapper(collection, *args, **kwargs):
+            if not depth[0]:
+                queries.append((collection.name, name))
+            depth[0] += 1
+            try:
+                return original(collection, *args, **kwargs)
+            finally:
+                depth[0] -= 1
+
+        return mock.patch.object(Collection, name, wrapper)
+
+    with counted("find"), counted("aggregate"), counted("count_documents"):
+        yield queries
+
+
 class BaseTestCase(TestCase):
     def create_app(self):
         app.config.from_object("src.config.TestingConfig")
@@ -28,7 +60,18 @@ class BaseTestCase(TestCase):
         disconnect_all()
 
     def tearDown(self):
+        self.reset_state()
+
+    def reset_state(self):
+        """Empties the database and every process-local cache"""
         self._conn.drop_database("mongoenginetest")
+        session_cache.clear()
+        sponsor_names.invalidate()
+        recent_updates.invalidate()
+        version_cache.clear()
+        rollup_cache.clear()
+        response_cache.backend.clear()
+        response_cache.reset_stats()
 
     def login_as(self, user: User, password: str) -> str:
         login = self.client.post(
@@ -61,3 +104,28 @@ class BaseTestCase(TestCase):
         )
 
         return token
+
+    def assert_constant_queries(self, seed, fetch, few: int = 2,
+                                many: int = 6):
+        """
+        Asserts `fetch()` issues as many queries after `seed(many)` as
+        after `seed(few)`, on an otherwise empty database.
+
+            Returns:
+                The result of `fetch()` for the `many` items
+        """
+        counts = []
+        for count in (few, many):
+            self.reset_state()
+            seed(count)
+            with self.count_queries() as queries:
+                result = fetch()
+            counts.append(len(queries))
+
+        self.assertEqual(counts[0], counts[1])
+
+        return result
+
+    def count_queries(self):
+        """Counts the database reads issued inside the block"""
+        return count_queries()
@@ -1,6 +1,8 @@
 # flake8: noqa
 from mongoengine.errors import NotUniqueError
 from src.models.event import Event
+from src.models.sponsor import Sponsor
+from src.models.user import ROLES
 from tests.base import BaseTestCase
 from datetime import datetime
 
@@ -19,3 +21,27 @@ class TestEventModel(BaseTestCase):
         self.assertEqual(event.date_time, now)
         self.assertEqual(event.link, "https://foobar.com")
         self.assertEqual(event.end_date_time, now)
+
+    def test_migrate_sponsor_names(self):
+        sponsor = Sponsor.createOne(username="foobar",
+                                    email="foobar@email.com",
+                                    password="123456",
+                                    sponsor_name="Foobar Inc",
+                                    roles=ROLES.SPONSOR)
+        now = datetime.now()
+        Event._get_collection().insert_one({
+            "name": "legacy",
+            "date_time": now,
+            "end_date_time": now,
+            "link": "https://foobar.com",
+            "sponsors": ["Foobar Inc", "Gone Inc"]
+        })
+        Event.createOne(name="current", date_time=now, end_date_time=now,
+                        link="https://foobar.com", sponsors=[sponsor])
+
+        self.assertEqual(Event.migrate_sponsor_names(), 1)
+        self.assertEqual(Event.migrate_sponsor_names(), 0)
+
+        event = Event.objects(name="legacy").first()
+        self.assertEqual(event.sponsor_ids, [sponsor.id])
+        self.assertEqual(event.serialize()["sponsors"], ["Foobar Inc"])
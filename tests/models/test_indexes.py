@@ -0,0 +1,54 @@
+# flake8: noqa
+from mongoengine import connect
+from mongoengine.connection import disconnect_all
+from src.models.indexes import (
+    auto_create_indexes,
+    check_indexes,
+    documents,
+    ensure_indexes,
+    missing_indexes
+)
+from src.models.hacker import Hacker
+from src.models.tokenblacklist import TokenBlacklist
+from tests.base import BaseTestCase
+
+
+class TestIndexes(BaseTestCase):
+    """Tests for the Index Registry"""
+
+    def setUp(self):
+        disconnect_all()
+        auto_create_indexes(False)
+        self._conn = connect("mongoenginetest", host="mongomock://localhost")
+        self._conn.drop_database("mongoenginetest")
+
+    def tearDown(self):
+        super().tearDown()
+        auto_create_indexes(True)
+        disconnect_all()
+        self._conn = connect("mongoenginetest", host="mongomock://localhost")
+
+    def test_documents(self):
+        names = [d.__name__ for d in documents()]
+
+        self.assertIn("Hacker", names)
+        self.assertIn("TokenBlacklist", names)
+        self.assertNotIn("BaseDocument", names)
+
+    def test_missing_indexes(self):
+        missing = missing_indexes()
+
+        self.assertIn(("user", [("_cls", 1), ("isaccepted", 1)]), missing)
+        self.assertIn(("token_blacklist", [("user", 1)]), missing)
+
+        with self.assertLogs(self.app.logger, "WARNING"):
+            check_indexes(self.app.logger)
+
+    def test_ensure_indexes(self):
+        ensure_indexes()
+
+        self.assertEqual(missing_indexes(), [])
+        self.assertIn("created_at_1",
+                      TokenBlacklist._get_collection().index_information())
+        self.assertIn("_cls_1_sponsor_name_1",
+                      Hacker._get_collection().index_information())
@@ -1,6 +1,12 @@
 # flake8: noqa
+import threading
+import time
+from unittest import mock
 from mongoengine.errors import NotUniqueError
-from src.models.live_update import LiveUpdate
+from src import app
+from src.common.invalidation import Invalidator
+from src.common.ids import SortableId
+from src.models.live_update import LiveUpdate, recent_updates
 from tests.base import BaseTestCase
 from datetime import datetime
 
@@ -16,6 +22,125 @@ class TestLiveUpdateModel(BaseTestCase):
         )
 
         self.assertTrue(live_update.id)
-        self.assertEqual(live_update.ID, 1)
+        self.assertIsInstance(live_update.ID, int)
+        self.assertLess(live_update.ID, 2 ** 53)
         self.assertEqual(now, live_update.timestamp)
         self.assertEqual("Example Update message", live_update.message)
+
+    def test_snapshot_cached_until_changed(self):
+        LiveUpdate.createOne(message="Example Update message")
+
+        snapshot = recent_updates.snapshot()
+        self.assertIs(recent_updates.snapshot(), snapshot)
+
+        LiveUpdate.createOne(message="Example Update message 2")
+
+        self.assertIsNot(recent_updates.snapshot(), snapshot)
+        self.assertIn("Example Update message 2",
+                      recent_updates.snapshot().text)
+
+    def test_invalidate_from_other_process(self):
+        with mock.patch.dict(app.config,
+                             {"SOCKETIO_MESSAGE_QUEUE": "memory://"}):
+            this_process = Invalidator(app)
+            other_process = Invalidator(app)
+
+        invalidated = threading.Event()
+        this_process.subscribe("live_updates", invalidated.set)
+
+        """Wait for the listener to bind its queue"""
+        for _ in range(30):
+            other_process.publish("live_updates")
+            if invalidated.wait(0.1):
+                break
+
+        self.assertTrue(invalidated.is_set())
+
+    def test_invalidate_broker_down(self):
+        with mock.patch.dict(app.config, {
+                "SOCKETIO_MESSAGE_QUEUE": "amqp://guest@127.0.0.1:1//"}):
+            invalidator = Invalidator(app)
+
+        with mock.patch.object(invalidator, "_logger") as logger:
+            start = time.monotonic()
+            invalidator.publish("live_updates")
+            invalidator.publish("live_updates")
+
+        """Logged, without retrying or failing the write"""
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(logger.exception.call_count, 2)
+
+    def test_invalidate_ignores_own_messages(self):
+        invalidator = Invalidator()
+        invalidated = threading.Event()
+        invalidator.subscribe("live_updates", invalidated.set)
+
+        invalidator.handle({"topic": "live_updates",
+                            "host_id": invalidator.host_id})
+
+        self.assertFalse(invalidated.is_set())
+
+        invalidator.handle({"topic": "live_updates", "host_id": "other"})
+
+        self.assertTrue(invalidated.is_set())
+
+    def test_ids_increase(self):
+        ids = [LiveUpdate.createOne(message=f"Update {i}").ID
+               for i in range(100)]
+
+        self.assertEqual(ids, sorted(set(ids)))
+
+    def test_ids_need_no_counter(self):
+        LiveUpdate.createOne(message="Example Update message")
+
+        self.assertNotIn("mongoengine.counters",
+                         LiveUpdate._get_db().list_collection_names())
+
+    def test_sortable_id_exhausted_millisecond(self):
+        generate = SortableId(node=3)
+
+        with mock.patch("time.time", return_value=1700000000.0):
+            ids = [generate() for _ in range(40)]
+
+        self.assertEqual(ids, sorted(set(ids)))
+        self.assertEqual(ids[32] >> 10, (ids[0] >> 10) + 1)
+
+    def test_since_overlaps_other_processes(self):
+        seen = LiveUpdate.createOne(message="Seen")
+
+        """Saved by a process whose clock is a millisecond behind"""
+        late = LiveUpdate.createOne(message="Late", ID=seen.ID - (1 << 10))
+
+        self.assertEqual(recent_updates.since(seen.ID), [])
+
+        app.config["LIVE_UPDATES_REPLAY_OVERLAP_SECONDS"] = 1
+        try:
+            replayed = recent_updates.since(seen.ID)
+        finally:
+            app.config["LIVE_UPDATES_REPLAY_OVERLAP_SECONDS"] = 0
+
+        self.assertEqual([u["ID"] for u in replayed], [late.ID, seen.ID])
+
+    def test_migrate_ids(self):
+        collection = LiveUpdate._get_collection()
+        collection.insert_many([
+            {"ID": 2, "message": "Second", "timestamp": datetime(2021, 5, 1)},
+            {"ID": 1, "message": "First", "timestamp": datetime(2021, 5, 1)}
+        ])
+        LiveUpdate._get_db()["mongoengine.counters"].insert_one(
+            {"_id": "live_update.ID", "next": 2}
+        )
+        latest = LiveUpdate.createOne(message="Latest")
+
+        self.assertEqual(LiveUpdate.migrate_ids(), 2)
+
+        updates = list(LiveUpdate.objects.order_by("ID"))
+
+        self.assertEqual([u.message for u in updates],
+                         ["First", "Second", "Latest"])
+        self.assertEqual(updates[-1].ID, latest.ID)
+        self.assertEqual(
+            LiveUpdate._get_db()["mongoengine.counters"].count_documents({}),
+            0
+        )
+        self.assertEqual(LiveUpdate.migrate_ids(), 0)
@@ -0,0 +1,32 @@
+# flake8: noqa
+from datetime import datetime, timedelta
+from src.models.mail_claim import MailClaim
+from tests.base import BaseTestCase
+
+
+class TestMailClaimModel(BaseTestCase):
+    """Tests for the MailClaim Model"""
+
+    def test_claim(self):
+        self.assertTrue(MailClaim.claim("Foo@email.com", "hacker_acceptance",
+                                        300))
+        self.assertFalse(MailClaim.claim("foo@email.com", "hacker_acceptance",
+                                         300))
+        self.assertTrue(MailClaim.claim("foo@email.com", "email_verification",
+                                        300))
+
+        MailClaim.release("foo@email.com", "hacker_acceptance")
+
+        self.assertTrue(MailClaim.claim("foo@email.com", "hacker_acceptance",
+                                        300))
+
+    def test_claim_expired(self):
+        MailClaim.createOne(key=MailClaim.key_for("foo@email.com",
+                                                  "hacker_acceptance"),
+                            expires=datetime.utcnow() - timedelta(seconds=1))
+
+        self.assertTrue(MailClaim.claim("foo@email.com", "hacker_acceptance",
+                                        300))
+        self.assertFalse(MailClaim.claim("foo@email.com", "hacker_acceptance",
+                                         300))
+        self.assertEqual(MailClaim.objects.count(), 1)
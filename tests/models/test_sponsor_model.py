@@ -1,6 +1,9 @@
 # flake8: noqa
+from bson import ObjectId
+from unittest import mock
 from mongoengine.errors import NotUniqueError, ValidationError
-from src.models.sponsor import Sponsor
+from src import invalidator
+from src.models.sponsor import Sponsor, sponsor_names
 from src.models.user import ROLES
 from src.models.tokenblacklist import TokenBlacklist
 from tests.base import BaseTestCase
@@ -38,3 +41,54 @@ class TestSponsorModel(BaseTestCase):
 
         self.assertEqual(Sponsor.objects.count(), 0)
         self.assertEqual(TokenBlacklist.objects.count(), 0)
+
+    def test_sponsor_names_misses(self):
+        sponsor = Sponsor.createOne(username="foobar",
+                                    email="foobar@email.com",
+                                    password="123456",
+                                    roles=ROLES.SPONSOR,
+                                    sponsor_name="foobar")
+
+        self.assertEqual(sponsor_names.id_for("foobar"), sponsor.id)
+        self.assertEqual(sponsor_names.name_for(sponsor.id), "foobar")
+
+        """Unknown names are queried once, not reloading the mapping"""
+        with self.count_queries() as queries:
+            self.assertIsNone(sponsor_names.id_for("missing"))
+            self.assertIsNone(sponsor_names.id_for("missing"))
+            self.assertIsNone(sponsor_names.name_for(ObjectId()))
+
+        self.assertEqual(len(queries), 2)
+
+        """Written without the signals, as by another process"""
+        Sponsor._get_collection().insert_one({
+            "_cls": "User.Sponsor",
+            "username": "other",
+            "email": "other@email.com",
+            "sponsor_name": "other"
+        })
+        pk = sponsor_names.id_for("other")
+
+        self.assertIsNotNone(pk)
+        self.assertEqual(sponsor_names.name_for(pk), "other")
+
+    def test_sponsor_names_invalidated_by_other_processes(self):
+        with mock.patch.object(invalidator, "publish") as publish:
+            sponsor = Sponsor.createOne(username="foobar",
+                                        email="foobar@email.com",
+                                        password="123456",
+                                        roles=ROLES.SPONSOR,
+                                        sponsor_name="foobar")
+
+        publish.assert_called_with(sponsor_names.topic)
+        self.assertEqual(sponsor_names.name_for(sponsor.id), "foobar")
+
+        """Renamed by another process, which publishes the topic"""
+        Sponsor._get_collection().update_one(
+            {"_id": sponsor.id}, {"$set": {"sponsor_name": "renamed"}})
+        self.assertEqual(sponsor_names.name_for(sponsor.id), "foobar")
+
+        invalidator.handle({"topic": sponsor_names.topic, "host_id": "other"})
+
+        self.assertEqual(sponsor_names.name_for(sponsor.id), "renamed")
+        self.assertIsNone(sponsor_names.id_for("foobar"))
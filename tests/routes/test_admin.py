@@ -1,8 +1,14 @@
 # flake8: noqa
+import csv
+import io
 import json
+from unittest import mock
+from src import hasher
 from src.models.hacker import Hacker
+from src.models.import_job import ImportBatch
 from src.models.sponsor import Sponsor
 from src.models.user import ROLES
+from src.tasks.import_tasks import import_hackers_batch
 from tests.base import BaseTestCase
 from datetime import datetime
 
@@ -10,6 +16,30 @@ from datetime import datetime
 class TestAdminBlueprint(BaseTestCase):
     """Tests for the Admin Endpoints"""
 
+    def import_hackers(self, token, url, **kwargs):
+        """Imports hackers, running the chunks' tasks inline"""
+        with mock.patch.object(import_hackers_batch, "apply_async",
+                               side_effect=import_hackers_batch.apply) as run:
+            res = self.client.post(url, headers=[("sid", token)], **kwargs)
+        data = json.loads(res.data.decode())
+
+        self.assertEqual(res.status_code, 202)
+
+        """Only the staged batches' ids go through the broker"""
+        for call in run.call_args_list:
+            self.assertNotIn("123456", json.dumps(call.args))
+        self.assertEqual(ImportBatch.objects.count(), 0)
+
+        res = self.client.get(f"/api/admin/hackers/import/{data['job_id']}/",
+                              headers=[("sid", token)])
+        progress = json.loads(res.data.decode())
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(progress["total"], data["rows"])
+        self.assertTrue(progress["done"])
+
+        return progress, run.call_count
+
     """create_hacker"""
 
     def test_create_hacker(self):
@@ -182,3 +212,192 @@ class TestAdminBlueprint(BaseTestCase):
 
         self.assertEqual(res.status_code, 400)
         self.assertEqual(Sponsor.objects.count(), 0)
+
+    """export_hackers"""
+
+    def test_export_hackers_ndjson(self):
+        token = self.login_user(ROLES.ADMIN)
+        Hacker.createOne(username="foobar", email="foobar@email.com",
+                         password="123456", roles=ROLES.HACKER,
+                         isaccepted=True)
+        Hacker.createOne(username="foobar1", email="foobar1@email.com",
+                         password="123456", roles=ROLES.HACKER)
+
+        res = self.client.get("/api/admin/hackers/export/",
+                              headers=[("sid", token)])
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.mimetype, "application/x-ndjson")
+
+        rows = [json.loads(line) for line in res.data.decode().splitlines()]
+
+        self.assertEqual([r["username"] for r in rows],
+                         ["foobar", "foobar1"])
+        self.assertNotIn("password", rows[0])
+
+    def test_export_hackers_csv_filtered(self):
+        token = self.login_user(ROLES.ADMIN)
+        Hacker.createOne(username="foobar", email="foobar@email.com",
+                         password="123456", roles=ROLES.HACKER,
+                         isaccepted=True)
+        Hacker.createOne(username="foobar1", email="foobar1@email.com",
+                         password="123456", roles=ROLES.HACKER)
+
+        res = self.client.get(
+            "/api/admin/hackers/export/?format=csv&isaccepted=true",
+            headers=[("sid", token)]
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.mimetype, "text/csv")
+
+        lines = res.data.decode().splitlines()
+
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith("username,email"))
+        self.assertTrue(lines[1].startswith("foobar,foobar@email.com"))
+
+    def test_export_hackers_invalid_filter(self):
+        token = self.login_user(ROLES.ADMIN)
+
+        res = self.client.get(
+            "/api/admin/hackers/export/?beginner=maybe",
+            headers=[("sid", token)]
+        )
+
+        self.assertEqual(res.status_code, 400)
+
+    def test_export_hackers_csv_formulas(self):
+        Hacker.createOne(username="foobar",
+                         email="foobar@email.com",
+                         password="123456",
+                         first_name="=HYPERLINK(\"http://evil\")",
+                         last_name="-1+1",
+                         roles=ROLES.HACKER)
+        token = self.login_user(ROLES.ADMIN)
+
+        res = self.client.get("/api/admin/hackers/export/?format=csv",
+                              headers=[("sid", token)])
+        rows = list(csv.DictReader(io.StringIO(res.data.decode())))
+
+        self.assertEqual(rows[0]["first_name"], "'=HYPERLINK(\"http://evil\")")
+        self.assertEqual(rows[0]["last_name"], "'-1+1")
+        self.assertEqual(rows[0]["username"], "foobar")
+
+    def test_export_hackers_forbidden(self):
+        token = self.login_user(ROLES.HACKER)
+
+        res = self.client.get("/api/admin/hackers/export/",
+                              headers=[("sid", token)])
+
+        self.assertEqual(res.status_code, 403)
+
+    """import_hackers"""
+    def test_import_hackers_ndjson(self):
+        Hacker.createOne(username="taken",
+                         email="taken@email.com",
+                         password="123456",
+                         roles=ROLES.HACKER)
+        token = self.login_user(ROLES.ADMIN)
+
+        rows = [
+            {"username": "foobar", "email": "foobar@email.com",
+             "password": "123456", "edu_info": {"college": "UofA"}},
+            {"username": "taken", "email": "new@email.com",
+             "password": "123456"},
+            {"username": "foobar", "email": "other@email.com",
+             "password": "123456"},
+            {"username": "nopassword", "email": "nopassword@email.com"},
+            {"username": "admin", "email": "admin@email.com",
+             "password": "123456", "roles": "ADMIN"},
+            {"username": "bademail", "email": "not an email",
+             "password": "123456"}
+        ]
+        body = "\n".join(json.dumps(r) for r in rows) + "\n{broken\n"
+
+        data, _ = self.import_hackers(token, "/api/admin/hackers/import/",
+                                      data=body,
+                                      content_type="application/x-ndjson")
+
+        self.assertEqual(data["total"], 7)
+        self.assertEqual(data["inserted"], 1)
+        self.assertEqual([d["row"] for d in data["duplicates"]], [2, 3])
+        self.assertEqual([i["row"] for i in data["invalid"]], [4, 5, 6, 7])
+        self.assertIn("password", data["invalid"][0]["errors"])
+        self.assertIn("roles", data["invalid"][1]["errors"])
+        self.assertIn("email", data["invalid"][2]["errors"])
+
+        hacker = Hacker.objects(username="foobar").first()
+        self.assertEqual(hacker.edu_info.college, "UofA")
+        self.assertTrue(hacker.email_verification)
+        self.assertTrue(hasher.check_password_hash(hacker.password, "123456"))
+
+    def test_import_hackers_csv(self):
+        token = self.login_user(ROLES.ADMIN)
+
+        body = ("username,email,password,rsvp_status,edu_info.major,"
+                "what_learn\n"
+                "foobar,foobar@email.com,123456,true,CS,Python;Go\n"
+                "foobar1,foobar1@email.com,123456,maybe,,\n"
+                "foobar2,foobar2@email.com,123456,,,\n")
+
+        with mock.patch.dict(self.app.config, {"IMPORT_BATCH_SIZE": 1}):
+            data, chunks = self.import_hackers(
+                token,
+                "/api/admin/hackers/import/?format=csv",
+                data={"file": (io.BytesIO(body.encode()), "hackers.csv")},
+                content_type="multipart/form-data"
+            )
+
+        self.assertEqual(chunks, 3)
+        self.assertEqual(data["inserted"], 2)
+        self.assertEqual(data["invalid"][0]["row"], 2)
+        self.assertIn("rsvp_status", data["invalid"][0]["errors"])
+
+        hacker = Hacker.objects(username="foobar").first()
+        self.assertTrue(hacker.rsvp_status)
+        self.assertEqual(hacker.edu_info.major, "CS")
+        self.assertEqual(hacker.what_learn, ["Python", "Go"])
+
+    def test_import_job_not_found(self):
+        token = self.login_user(ROLES.ADMIN)
+
+        for job_id in ("foobar", "0" * 24):
+            res = self.client.get(f"/api/admin/hackers/import/{job_id}/",
+                                  headers=[("sid", token)])
+            self.assertEqual(res.status_code, 404)
+
+    def test_import_hackers_forbidden(self):
+        token = self.login_user(ROLES.HACKER)
+
+        res = self.client.post("/api/admin/hackers/import/",
+                               data="",
+                               headers=[("sid", token)])
+
+        self.assertEqual(res.status_code, 403)
+
+    """get_response_cache_stats"""
+    def test_get_response_cache_stats(self):
+        token = self.login_user(ROLES.ADMIN)
+
+        self.client.get("/api/stats/user_count/")
+        self.client.get("/api/stats/user_count/")
+
+        res = self.client.get("/api/admin/response_cache/",
+                              headers=[("sid", token)])
+        data = json.loads(res.data.decode())
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(data["backend"], "local")
+        self.assertEqual(data["hits"], 1)
+        self.assertEqual(data["misses"], 1)
+        self.assertEqual(data["hit_rate"], 0.5)
+        self.assertGreater(data["bytes_stored"], 0)
+
+    def test_get_response_cache_stats_not_admin(self):
+        token = self.login_user(ROLES.HACKER)
+
+        res = self.client.get("/api/admin/response_cache/",
+                              headers=[("sid", token)])
+
+        self.assertEqual(res.status_code, 403)
@@ -0,0 +1,174 @@
+# flake8: noqa
+import json
+from src.models.hacker import Hacker
+from src.models.sponsor import Sponsor
+from src.models.user import ROLES
+from src.models.tokenblacklist import TokenBlacklist, session_cache
+from src.common.jwt import decode_jwt
+from src import hasher
+from tests.base import BaseTestCase
+
+
+class TestAuthBlueprint(BaseTestCase):
+    """Tests for the Auth Endpoints"""
+
+    def setUp(self):
+        session_cache.clear()
+
+    """login"""
+    def test_login(self):
+        user = Hacker.createOne(
+            username="foobar",
+            email="foobar@email.com",
+            password="123456",
+            roles=ROLES.HACKER
+        )
+
+        token = self.login_as(user, "123456")
+
+        self.assertTrue(token)
+        self.assertEqual(TokenBlacklist.objects.count(), 1)
+
+    def test_login_wrong_password(self):
+        Hacker.createOne(
+            username="foobar",
+            email="foobar@email.com",
+            password="123456",
+            roles=ROLES.HACKER
+        )
+
+        res = self.client.post(
+            "/api/auth/login/",
+            data=json.dumps({
+                "username": "foobar",
+                "password": "654321"
+            }),
+            content_type="application/json"
+        )
+
+        self.assertEqual(res.status_code, 403)
+
+    def test_login_busy(self):
+        user = Hacker.createOne(
+            username="foobar",
+            email="foobar@email.com",
+            password="123456",
+            roles=ROLES.HACKER
+        )
+
+        hasher.shutdown()
+        hasher.max_pending = 0
+        try:
+            res = self.client.post(
+                "/api/auth/login/",
+                data=json.dumps({
+                    "username": user.username,
+                    "password": "123456"
+                }),
+                content_type="application/json"
+            )
+        finally:
+            hasher.init_app(self.app)
+
+        self.assertEqual(res.status_code, 503)
+        self.assertIn("Retry-After", res.headers)
+
+    """authenticate"""
+    def test_session_is_cached(self):
+        token = self.login_user(ROLES.HACKER)
+        jti = decode_jwt(token)["jti"]
+
+        res = self.client.get(
+            "/api/email/verify/tester@localhost.dev/",
+            headers=[("sid", token)]
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(session_cache.get(jti)["username"], "tester")
+        self.assertNotIn("password", session_cache.get(jti))
+
+    def test_session_is_copied(self):
+        token = self.login_user(ROLES.HACKER)
+        jti = decode_jwt(token)["jti"]
+
+        user = TokenBlacklist.resolve_session(jti)
+        user.roles = ROLES.ADMIN
+
+        self.assertEqual(TokenBlacklist.resolve_session(jti).roles,
+                         ROLES.HACKER)
+
+    def test_update_user_invalidates_session(self):
+        user = Sponsor.createOne(
+            username="foobar",
+            email="foobar@email.com",
+            password="123456",
+            sponsor_name="Foobar Inc",
+            roles=ROLES.SPONSOR
+        )
+        token = self.login_as(user, "123456")
+        jti = decode_jwt(token)["jti"]
+
+        TokenBlacklist.resolve_session(jti)
+
+        res = self.client.put(
+            "/api/sponsors/Foobar Inc/",
+            data=json.dumps({"sponsor_name": "Foobaz Inc"}),
+            content_type="application/json",
+            headers=[("sid", token)]
+        )
+        self.assertEqual(res.status_code, 201)
+        self.assertNotIn(jti, session_cache)
+        self.assertEqual(TokenBlacklist.resolve_session(jti).sponsor_name,
+                         "Foobaz Inc")
+
+    def test_resolve_session_unknown_token(self):
+        self.assertIsNone(TokenBlacklist.resolve_session("nonexistent"))
+
+    """logout"""
+    def test_logout_invalidates_session(self):
+        token = self.login_user(ROLES.HACKER)
+
+        res = self.client.get(
+            "/api/email/verify/tester@localhost.dev/",
+            headers=[("sid", token)]
+        )
+        self.assertEqual(res.status_code, 200)
+
+        res = self.client.get("/api/auth/signout/", headers=[("sid", token)])
+        self.assertEqual(res.status_code, 200)
+
+        res = self.client.get(
+            "/api/email/verify/tester@localhost.dev/",
+            headers=[("sid", token)]
+        )
+        self.assertEqual(res.status_code, 401)
+
+    def test_delete_user_invalidates_session(self):
+        user = Sponsor.createOne(
+            username="foobar",
+            email="foobar@email.com",
+            password="123456",
+            sponsor_name="Foobar Inc",
+            roles=ROLES.SPONSOR
+        )
+        token = self.login_as(user, "123456")
+
+        res = self.client.get(
+            "/api/email/verify/foobar@email.com/",
+            headers=[("sid", token)]
+        )
+        self.assertEqual(res.status_code, 200)
+
+        res = self.client.delete(
+            "/api/sponsors/delete_sponsor/Foobar Inc/",
+            headers=[("sid", token)]
+        )
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(TokenBlacklist.objects.count(), 0)
+        self.assertEqual(len(session_cache), 0)
+
+        res = self.client.get(
+            "/api/email/verify/foobar@email.com/",
+            headers=[("sid", token)]
+        )
+        self.assertEqual(res.status_code, 401)
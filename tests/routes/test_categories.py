@@ -128,6 +128,23 @@ class TestCategoriesBlueprint(BaseTestCase):
 
         self.assertEqual(updated.name, "another_category")
 
+    def test_edit_category_changes_etag(self):
+        Category.createOne(name="new_category", description="description")
+
+        res = self.client.get("/api/categories/get_all_categories/")
+        etag = res.headers["ETag"]
+
+        self.client.put(
+            "/api/categories/?name=new_category",
+            data=json.dumps({"description": "another_description"}),
+            content_type="application/json")
+
+        res = self.client.get("/api/categories/get_all_categories/",
+                              headers=[("If-None-Match", etag)])
+
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res.headers["ETag"], etag)
+
     def test_edit_category_sponsor_not_found_query(self):
         sponsor = Sponsor.createOne(username="new_sponsor",
                                     email="new@email.com",
@@ -357,3 +374,44 @@ class TestCategoriesBlueprint(BaseTestCase):
 
         self.assertEqual(res.status_code, 404)
         self.assertEqual(data["name"], "Not Found")
+
+    def test_get_category_cached_sponsor_names(self):
+        sponsor = Sponsor.createOne(username="new_sponsor",
+                                    email="new@email.com",
+                                    password="new_password",
+                                    roles=ROLES.SPONSOR,
+                                    sponsor_name="new_sponsor")
+        for i in range(3):
+            Category.createOne(name=f"category{i}", sponsor=sponsor)
+
+        self.client.get("/api/categories/?sponsor=new_sponsor")
+
+        with self.count_queries() as queries:
+            res = self.client.get("/api/categories/?sponsor=new_sponsor")
+
+        data = json.loads(res.data.decode())
+
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(data["count"], 3)
+        self.assertEqual(data["categories"][2]["sponsor"], "new_sponsor")
+
+    def test_get_category_renamed_sponsor(self):
+        sponsor = Sponsor.createOne(username="new_sponsor",
+                                    email="new@email.com",
+                                    password="new_password",
+                                    roles=ROLES.SPONSOR,
+                                    sponsor_name="new_sponsor")
+        Category.createOne(name="new_category", sponsor=sponsor)
+
+        self.client.get("/api/categories/?sponsor=new_sponsor")
+
+        self.client.put("/api/sponsors/new_sponsor/",
+                        data=json.dumps({"sponsor_name": "renamed"}),
+                        content_type="application/json")
+
+        res = self.client.get("/api/categories/?sponsor=renamed")
+        data = json.loads(res.data.decode())
+
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(data["categories"][0]["sponsor"], "renamed")
@@ -28,6 +28,44 @@ class TestClubEventsBlueprint(BaseTestCase):
         """Checks that we returns a successful status"""
         self.assertEqual(res.status_code, 200)
 
+    def test_get_events_conditional(self):
+        ClubEvent.createOne(name="string", start=datetime.now())
+
+        res = self.client.get("/api/club/get_events/?confirmed=false")
+        etag = res.headers["ETag"]
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("Last-Modified", res.headers)
+
+        with self.count_queries() as queries:
+            res = self.client.get("/api/club/get_events/?confirmed=false",
+                                  headers=[("If-None-Match", etag)])
+
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.data, b"")
+        self.assertEqual(res.headers["ETag"], etag)
+        self.assertEqual(queries, [])
+
+        ClubEvent.objects(name="string").update(set__name="other")
+
+        res = self.client.get("/api/club/get_events/?confirmed=false",
+                              headers=[("If-None-Match", etag)])
+
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res.headers["ETag"], etag)
+        self.assertEqual(json.loads(res.data)["events"][0]["name"], "other")
+
+    def test_get_events_if_modified_since(self):
+        ClubEvent.createOne(name="string", start=datetime.now())
+
+        res = self.client.get("/api/club/get_events/")
+        last_modified = res.headers["Last-Modified"]
+
+        res = self.client.get("/api/club/get_events/",
+                              headers=[("If-Modified-Since", last_modified)])
+
+        self.assertEqual(res.status_code, 304)
+
     def test_get_events_mix_rdate_startend_dates(self):
         res = self.client.get("/api/club/get_events/?rdate=Today&start_date=testdate")
 
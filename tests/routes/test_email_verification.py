@@ -0,0 +1,104 @@
+# flake8: noqa
+from src import bcrypt
+from src.models.mail_claim import MailClaim
+from src.models.user import User, ROLES
+from tests.base import BaseTestCase
+
+
+class TestEmailVerificationBlueprint(BaseTestCase):
+    """Tests for the Email Verification Endpoints"""
+
+    def create_user(self):
+        return User.createOne(
+            username="foobar",
+            email="foobar@email.com",
+            password="123456",
+            roles=ROLES.HACKER
+        )
+
+    """update_registration_status"""
+    def test_update_registration_status(self):
+        user = self.create_user()
+        token = user.encode_email_token()
+
+        self.assertTrue(user.email_token_digest)
+        self.assertIsNone(user.email_token_hash)
+
+        res = self.client.put(f"/api/email/verify/{token}/")
+
+        self.assertEqual(res.status_code, 200)
+
+        user.reload()
+        self.assertTrue(user.email_verification)
+        self.assertIsNone(user.email_token_digest)
+
+    def test_update_registration_status_single_use(self):
+        user = self.create_user()
+        token = user.encode_email_token()
+
+        res = self.client.put(f"/api/email/verify/{token}/")
+        self.assertEqual(res.status_code, 200)
+
+        res = self.client.put(f"/api/email/verify/{token}/")
+        self.assertEqual(res.status_code, 404)
+
+    def test_update_registration_status_superseded_token(self):
+        user = self.create_user()
+        old_token = user.encode_email_token()
+        user.encode_email_token()
+
+        res = self.client.put(f"/api/email/verify/{old_token}/")
+
+        self.assertEqual(res.status_code, 404)
+        self.assertFalse(User.objects.first().email_verification)
+
+    def test_update_registration_status_legacy_hash(self):
+        user = self.create_user()
+        token = user.encode_email_token()
+        user.modify(
+            set__email_token_hash=bcrypt.generate_password_hash(token, 4),
+            unset__email_token_digest=True
+        )
+
+        res = self.client.put(f"/api/email/verify/{token}/")
+
+        self.assertEqual(res.status_code, 200)
+
+        user.reload()
+        self.assertTrue(user.email_verification)
+        self.assertIsNone(user.email_token_hash)
+
+    def test_update_registration_status_invalid_token(self):
+        self.create_user()
+
+        res = self.client.put("/api/email/verify/notatoken/")
+
+        self.assertEqual(res.status_code, 401)
+
+    """send_registration_email"""
+    def test_send_registration_email_deduplicated(self):
+        user = self.create_user()
+        token = self.login_as(user, "123456")
+
+        res = self.client.post("/api/email/verify/foobar/",
+                               headers=[("sid", token)])
+        self.assertEqual(res.status_code, 201)
+
+        user.reload()
+        digest = user.email_token_digest
+        self.assertTrue(digest)
+
+        """A resend within the window keeps the link already sent"""
+        res = self.client.post("/api/email/verify/foobar/",
+                               headers=[("sid", token)])
+        self.assertEqual(res.status_code, 201)
+
+        user.reload()
+        self.assertEqual(user.email_token_digest, digest)
+
+        MailClaim.objects.delete()
+        self.client.post("/api/email/verify/foobar/",
+                         headers=[("sid", token)])
+
+        user.reload()
+        self.assertNotEqual(user.email_token_digest, digest)
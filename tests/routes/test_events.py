@@ -262,7 +262,7 @@ class TestEventsBlueprint(BaseTestCase):
 
         data = json.loads(res.data.decode())
 
-        self.assertEqual(res.status_code, 201)
+        self.assertEqual(res.status_code, 200)
         self.assertEqual(data["events"][0]["name"], "new_event")
         self.assertEqual(data["events"][1]["name"], "another_new_event")
 
@@ -272,3 +272,110 @@ class TestEventsBlueprint(BaseTestCase):
 
         self.assertEqual(res.status_code, 404)
         self.assertEqual(data["name"], "Not Found")
+
+    def test_get_all_events_paginated(self):
+        now = datetime.now()
+        for i in range(3):
+            Event.createOne(name=f"event{i}",
+                            date_time=now.isoformat(),
+                            link="https://blob.knighthacks.org/somelogo.png",
+                            end_date_time=now.isoformat())
+
+        res = self.client.get("api/events/get_all_events/?limit=2")
+        data = json.loads(res.data.decode())
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([e["name"] for e in data["events"]],
+                         ["event0", "event1"])
+
+        res = self.client.get(data["next"])
+        data = json.loads(res.data.decode())
+
+        self.assertEqual([e["name"] for e in data["events"]], ["event2"])
+        self.assertIsNone(data["next"])
+
+    def test_get_all_events_conditional(self):
+        Event.createOne(name="event",
+                        date_time=datetime.now(),
+                        link="https://knighthacks.org",
+                        end_date_time=datetime.now())
+
+        res = self.client.get("api/events/get_all_events/")
+        etag = res.headers["ETag"]
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("Last-Modified", res.headers)
+
+        res = self.client.get("api/events/get_all_events/",
+                              headers=[("If-None-Match", etag)])
+
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.headers["ETag"], etag)
+
+    def test_get_all_events_after_update(self):
+        sponsor = Sponsor.createOne(sponsor_name="Sponsor",
+                                    email="sponsor@gmail.com",
+                                    username="sponsor",
+                                    password="pass1234",
+                                    roles=ROLES.SPONSOR)
+        Event.createOne(name="event",
+                        date_time=datetime.now(),
+                        link="https://knighthacks.org",
+                        end_date_time=datetime.now(),
+                        sponsors=[sponsor])
+
+        events = self.client.get("api/events/get_all_events/")
+        sponsors = self.client.get("api/sponsors/get_all_sponsors/")
+
+        res = self.client.put("api/events/update_event/event/",
+                              data=json.dumps({"event_status": "ongoing"}),
+                              content_type="application/json")
+        self.assertEqual(res.status_code, 201)
+
+        res = self.client.get("api/events/get_all_events/",
+                              headers=[("If-None-Match", events.headers["ETag"])])
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(json.loads(res.data)["events"][0]["event_status"],
+                         "ongoing")
+
+        res = self.client.get("api/sponsors/get_all_sponsors/",
+                              headers=[("If-None-Match",
+                                        sponsors.headers["ETag"])])
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            json.loads(res.data)["sponsors"][0]["events"][0]["event_status"],
+            "ongoing")
+
+        """Deleting the document itself is a write too"""
+        etag = res.headers["ETag"]
+        Event.objects.first().delete()
+
+        res = self.client.get("api/sponsors/get_all_sponsors/",
+                              headers=[("If-None-Match", etag)])
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(json.loads(res.data)["sponsors"][0]["events"], [])
+
+    def test_get_all_events_constant_queries(self):
+        def create_events(count):
+            sponsors = [Sponsor.createOne(sponsor_name=f"Sponsor {i}",
+                                          email=f"sponsor{i}@gmail.com",
+                                          username=f"sponsor{i}",
+                                          password="pass1234",
+                                          roles=ROLES.SPONSOR)
+                        for i in range(count)]
+            for i in range(count):
+                Event.createOne(name=f"event{i}",
+                                date_time=datetime.now(),
+                                link="https://knighthacks.org",
+                                end_date_time=datetime.now(),
+                                sponsors=sponsors)
+
+        res = self.assert_constant_queries(
+            create_events,
+            lambda: self.client.get("api/events/get_all_events/"))
+        data = json.loads(res.data.decode())
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(data["events"]), 6)
+        self.assertEqual(data["events"][0]["sponsors"],
+                         [f"Sponsor {i}" for i in range(6)])
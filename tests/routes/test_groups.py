@@ -689,6 +689,25 @@ class TestGroupsBlueprint(BaseTestCase):
         self.assertEqual(res.status_code, 200)
         self.assertEqual(Group.objects[1]["members"][0]["username"], "doe")
 
+    def test_add_member_to_group_read_back(self):
+        Hacker.createOne(username="doe",
+                         email="doe@gmail.com",
+                         password="sdfghjk",
+                         roles=ROLES.HACKER)
+        Group.createOne(name="My Group", categories=["category 1"])
+
+        res = self.client.get("/api/groups/My Group/")
+        self.assertEqual(json.loads(res.data)["group"]["members"], [])
+
+        res = self.client.put("/api/groups/My Group/doe/")
+        self.assertEqual(res.status_code, 200)
+
+        """Not the cached group from before the edit"""
+        res = self.client.get("/api/groups/My Group/")
+        self.assertEqual(
+            [m["username"] for m in json.loads(res.data)["group"]["members"]],
+            ["doe"])
+
     def test_add_member_to_group_group_not_found(self):
         res = self.client.put("/api/groups/group/hacker/")
 
@@ -868,3 +887,50 @@ class TestGroupsBlueprint(BaseTestCase):
 
         self.assertEqual(res.status_code, 404)
         self.assertEqual(data["name"], "Not Found")
+
+    def test_create_group_reports_missing_members(self):
+        Hacker.createOne(
+            username="conroy",
+            email="conroy@gmail.com",
+            password="dsafadsgdasg",
+            roles=ROLES.HACKER
+        )
+
+        res = self.client.post(
+            "/api/groups/",
+            data=json.dumps({
+                "name": "My Group",
+                "members": ["conroy@gmail.com", "john@gmail.com",
+                            "doe@gmail.com"]
+            }),
+            content_type="application/json",
+        )
+        data = json.loads(res.data.decode())
+
+        self.assertEqual(res.status_code, 404)
+        self.assertIn("john@gmail.com, doe@gmail.com", data["description"])
+        self.assertEqual(Group.objects.count(), 0)
+
+    def test_get_group_constant_queries(self):
+        def create_group(size):
+            members = [Hacker.createOne(first_name=f"Hacker{i}",
+                                        username=f"hacker{i}",
+                                        email=f"hacker{i}@gmail.com",
+                                        password="sdfghjk",
+                                        roles=ROLES.HACKER)
+                       for i in range(size)]
+            Group.createOne(name="My Group", members=members)
+
+        res = self.assert_constant_queries(
+            create_group,
+            lambda: self.client.get("/api/groups/My Group/"),
+            many=5)
+        data = json.loads(res.data.decode())
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(data["group"]["members"][4], {
+            "first_name": "Hacker4",
+            "last_name": None,
+            "email": "hacker4@gmail.com",
+            "username": "hacker4"
+        })
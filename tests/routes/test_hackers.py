@@ -1,5 +1,6 @@
 # flake8: noqa
 import json
+from unittest import mock
 from src.models.hacker import Hacker
 from src.models.user import ROLES
 from tests.base import BaseTestCase
@@ -194,6 +195,29 @@ class TestHackersBlueprint(BaseTestCase):
 
         self.assertEqual(updated.email, "schmuckbar@mensch.com")
 
+    def test_update_user_profile_settings_read_back(self):
+        Hacker.createOne(
+            username="foobar",
+            email="foobar@email.com",
+            password="123456",
+            roles=ROLES.HACKER,
+            first_name="Foo"
+        )
+
+        res = self.client.get("/api/hackers/foobar/")
+        self.assertEqual(json.loads(res.data)["Hacker Profile"]["first_name"], "Foo")
+
+        res = self.client.put(
+            "/api/hackers/foobar/",
+            data=json.dumps({"first_name": "Bar"}),
+            content_type="application/json",
+        )
+        self.assertEqual(res.status_code, 201)
+
+        """Not the cached profile from before the edit"""
+        res = self.client.get("/api/hackers/foobar/")
+        self.assertEqual(json.loads(res.data)["Hacker Profile"]["first_name"], "Bar")
+
     def test_update_user_profile_settings_same_email(self):
         Hacker.createOne(
             username="foobar",
@@ -286,6 +310,27 @@ class TestHackersBlueprint(BaseTestCase):
 
         self.assertEqual(res.status_code, 201)
 
+    def test_accept_hacker_twice(self):
+        Hacker.createOne(
+            username="foobar",
+            email="foobar@email.com",
+            password="123456",
+            roles=ROLES.HACKER
+        )
+
+        token = self.login_user(ROLES.ADMIN)
+
+        with mock.patch("src.common.mail.send_hacker_acceptance_email") \
+                as send:
+            for _ in range(2):
+                res = self.client.put(
+                    "/api/hackers/foobar/accept/",
+                    headers=[("sid", token)]
+                )
+                self.assertEqual(res.status_code, 201)
+
+        send.assert_called_once()
+
     def test_accept_hacker_not_found(self):
 
         token = self.login_user(ROLES.ADMIN)
@@ -297,6 +342,72 @@ class TestHackersBlueprint(BaseTestCase):
 
         self.assertEqual(res.status_code, 404)
 
+    """accept_hackers"""
+    def test_accept_hackers(self):
+        for i in range(3):
+            Hacker.createOne(username=f"foobar{i}",
+                             email=f"foobar{i}@email.com",
+                             password="123456",
+                             roles=ROLES.HACKER,
+                             rsvp_status=i < 2)
+
+        token = self.login_user(ROLES.ADMIN)
+
+        res = self.client.post(
+            "/api/hackers/accept/",
+            data=json.dumps({"usernames": ["foobar0", "foobar1", "nobody"]}),
+            content_type="application/json",
+            headers=[("sid", token)]
+        )
+        data = json.loads(res.data.decode())
+
+        self.assertEqual(res.status_code, 202)
+        self.assertEqual(data["accepted"], 2)
+        self.assertEqual(Hacker.objects(isaccepted=True).count(), 2)
+        self.assertEqual(
+            Hacker.objects(acceptance_job=data["job_id"]).count(), 2)
+
+        res = self.client.get(f"/api/hackers/accept/{data['job_id']}/",
+                              headers=[("sid", token)])
+        progress = json.loads(res.data.decode())
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(progress["total"], 2)
+        self.assertFalse(progress["done"])
+
+        """Already accepted hackers are not accepted, nor mailed, again"""
+        res = self.client.post(
+            "/api/hackers/accept/",
+            data=json.dumps({"filter": {"rsvp_status": True}}),
+            content_type="application/json",
+            headers=[("sid", token)]
+        )
+
+        self.assertEqual(json.loads(res.data.decode())["accepted"], 0)
+
+    def test_accept_hackers_invalid(self):
+        token = self.login_user(ROLES.ADMIN)
+
+        for body in ({}, {"usernames": "foobar"},
+                     {"usernames": [], "filter": {}},
+                     {"filter": {"password": "123456"}},
+                     {"filter": {"beginner": "yes"}}):
+            res = self.client.post(
+                "/api/hackers/accept/",
+                data=json.dumps(body),
+                content_type="application/json",
+                headers=[("sid", token)]
+            )
+            self.assertEqual(res.status_code, 400)
+
+    def test_acceptance_job_not_found(self):
+        token = self.login_user(ROLES.ADMIN)
+
+        for job_id in ("foobar", "0" * 24):
+            res = self.client.get(f"/api/hackers/accept/{job_id}/",
+                                  headers=[("sid", token)])
+            self.assertEqual(res.status_code, 404)
+
     """get_all_hackers"""
     def test_get_all_hackers(self):
         Hacker.createOne(
@@ -329,3 +440,85 @@ class TestHackersBlueprint(BaseTestCase):
 
         self.assertEqual(res.status_code, 404)
         self.assertEqual(data["name"], "Not Found")
+
+    def test_get_all_hackers_paginated(self):
+        for i in range(3):
+            Hacker.createOne(
+                username=f"foobar{i}",
+                email=f"foobar{i}@email.com",
+                password="123456",
+                roles=ROLES.HACKER
+            )
+
+        res = self.client.get("/api/hackers/get_all_hackers/?limit=2")
+        data = json.loads(res.data.decode())
+
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual([h["username"] for h in data["hackers"]],
+                         ["foobar0", "foobar1"])
+        self.assertTrue(data["next"])
+
+        res = self.client.get(data["next"])
+        data = json.loads(res.data.decode())
+
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual([h["username"] for h in data["hackers"]],
+                         ["foobar2"])
+        self.assertIsNone(data["next"])
+
+    def test_get_all_hackers_fields(self):
+        Hacker.createOne(
+            username="foobar",
+            email="foobar@email.com",
+            password="123456",
+            first_name="Foo",
+            roles=ROLES.HACKER
+        )
+
+        res = self.client.get(
+            "/api/hackers/get_all_hackers/?fields=username,first_name")
+        data = json.loads(res.data.decode())
+
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(data["hackers"][0]["first_name"], "Foo")
+        self.assertNotIn("email", data["hackers"][0])
+        self.assertNotIn("_id", data["hackers"][0])
+
+    def test_get_all_hackers_fields_not_defaults(self):
+        Hacker.createOne(
+            username="foobar",
+            email="foobar@email.com",
+            password="123456",
+            isaccepted=True,
+            roles=ROLES.HACKER
+        )
+
+        res = self.client.get("/api/hackers/get_all_hackers/?fields=username")
+        data = json.loads(res.data.decode())
+
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(set(data["hackers"][0]), {"username", "date"})
+
+        res = self.client.get(
+            "/api/hackers/get_all_hackers/?fields=username,isaccepted")
+        data = json.loads(res.data.decode())
+
+        self.assertTrue(data["hackers"][0]["isaccepted"])
+
+    def test_get_all_hackers_private_fields(self):
+        Hacker.createOne(
+            username="foobar",
+            email="foobar@email.com",
+            password="123456",
+            roles=ROLES.HACKER
+        )
+
+        res = self.client.get(
+            "/api/hackers/get_all_hackers/?fields=username,password")
+
+        self.assertEqual(res.status_code, 400)
+
+    def test_get_all_hackers_invalid_cursor(self):
+        res = self.client.get("/api/hackers/get_all_hackers/?cursor=foobar")
+
+        self.assertEqual(res.status_code, 400)
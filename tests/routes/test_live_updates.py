@@ -1,7 +1,9 @@
 # flake8: noqa
 import json
+from unittest import mock
 from tests.base import BaseTestCase
 from src import app, socketio
+from src.api.live_updates import batcher
 from src.models.live_update import LiveUpdate
 from src.models.user import ROLES
 
@@ -164,7 +166,7 @@ class TestLiveUpdatesBlueprint(BaseTestCase):
 
     """delete_update"""
     def test_delete_update(self):
-        LiveUpdate.createOne(message="Testing my dude")
+        first = LiveUpdate.createOne(message="Testing my dude")
         second = LiveUpdate.createOne(message="Testing my dude 2")
 
         self.wsclient.connect(namespace="/liveupdates")
@@ -173,17 +175,17 @@ class TestLiveUpdatesBlueprint(BaseTestCase):
         token = self.login_user(ROLES.ADMIN)
 
         self.client.delete(
-            "/api/live_updates/1/",
+            f"/api/live_updates/{first.ID}/",
             headers=[("sid", token)]
         )
         self.assertEqual(LiveUpdate.objects.count(), 1)
-        self.assertIsNone(LiveUpdate.objects(ID=1).first())
+        self.assertIsNone(LiveUpdate.objects(ID=first.ID).first())
         self.assertEqual(LiveUpdate.objects.first(), second)
 
         ws_resc = self.wsclient.get_received(namespace="/liveupdates")
 
         self.assertEqual(ws_resc[0].get("name"), "DeleteLiveUpdate")
-        self.assertEqual(ws_resc[0]["args"][0]["data"], "1")
+        self.assertEqual(ws_resc[0]["args"][0]["data"], str(first.ID))
 
     def test_delete_update_not_found(self):
         LiveUpdate.createOne(message="Testing my dude")
@@ -204,3 +206,184 @@ class TestLiveUpdatesBlueprint(BaseTestCase):
         ws_resc = self.wsclient.get_received(namespace="/liveupdates")
 
         self.assertEqual(ws_resc, [])
+
+    """wss replay from last_id"""
+    def test_on_connect_last_id(self):
+        ids = [LiveUpdate.createOne(message=f"Testing my dude {i}").ID
+               for i in range(3)]
+
+        self.wsclient.connect(
+            namespace="/liveupdates",
+            auth={"last_id": ids[0]}
+        )
+
+        ws_resc = self.wsclient.get_received(namespace="/liveupdates")
+        ws_data = ws_resc[0].get("args")[0]
+
+        self.assertEqual([u["ID"] for u in ws_data], ids[1:])
+
+    def test_on_reload_last_id(self):
+        self.wsclient.connect(namespace="/liveupdates")
+        self.wsclient.get_received(namespace="/liveupdates")
+
+        first = LiveUpdate.createOne(message="Testing my dude")
+        LiveUpdate.createOne(message="Testing my dude 2")
+
+        self.wsclient.emit("reload", {"last_id": first.ID},
+                           namespace="/liveupdates")
+
+        ws_resc = self.wsclient.get_received(namespace="/liveupdates")
+        ws_data = ws_resc[0].get("args")[0]
+
+        self.assertEqual(len(ws_data), 1)
+        self.assertIn(("message", "Testing my dude 2"), ws_data[0].items())
+
+    def test_on_connect_buffered(self):
+        ids = [LiveUpdate.createOne(message=f"Testing my dude {i}").ID
+               for i in range(5)]
+
+        self.wsclient.connect(namespace="/liveupdates")
+        self.wsclient.get_received(namespace="/liveupdates")
+
+        ids.append(LiveUpdate.createOne(message="Testing my dude 5").ID)
+
+        with self.count_queries() as queries:
+            self.wsclient.emit("reload", {"last_id": ids[2]},
+                               namespace="/liveupdates")
+
+        ws_resc = self.wsclient.get_received(namespace="/liveupdates")
+        ws_data = ws_resc[0].get("args")[0]
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual([u["ID"] for u in ws_data], ids[3:])
+
+    def test_on_connect_evicted(self):
+        app.config["LIVE_UPDATES_BUFFER_SIZE"] = 2
+
+        try:
+            ids = [LiveUpdate.createOne(message=f"Testing my dude {i}").ID
+                   for i in range(5)]
+
+            self.wsclient.connect(
+                namespace="/liveupdates",
+                auth={"last_id": ids[0]}
+            )
+        finally:
+            app.config["LIVE_UPDATES_BUFFER_SIZE"] = 200
+
+        ws_resc = self.wsclient.get_received(namespace="/liveupdates")
+        ws_data = ws_resc[0].get("args")[0]
+
+        self.assertEqual([u["ID"] for u in ws_data], ids[1:])
+
+    def test_on_connect_snapshot(self):
+        LiveUpdate.createOne(message="Testing my dude")
+
+        self.wsclient.connect(namespace="/liveupdates")
+        self.wsclient.get_received(namespace="/liveupdates")
+
+        with self.count_queries() as queries:
+            for _ in range(100):
+                self.wsclient.disconnect(namespace="/liveupdates")
+                self.wsclient.connect(namespace="/liveupdates")
+
+        ws_resc = self.wsclient.get_received(namespace="/liveupdates")
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(len(ws_resc), 100)
+        self.assertEqual(ws_resc[-1]["args"][0][0]["message"],
+                         "Testing my dude")
+
+    """topic rooms"""
+    def test_new_update_topic(self):
+        self.wsclient.connect(namespace="/liveupdates")
+        self.wsclient.emit("subscribe", {"topic": "hardware"},
+                           namespace="/liveupdates")
+        self.wsclient.get_received(namespace="/liveupdates")
+
+        token = self.login_user(ROLES.ADMIN)
+
+        def put_update(message):
+            return self.client.put(
+                "/api/live_updates/",
+                data=json.dumps({"message": message, "topic": "hardware"}),
+                headers=[("sid", token)],
+                content_type="application/json"
+            )
+
+        res = put_update("Soldering irons are out")
+        self.assertEqual(res.status_code, 201)
+
+        ws_resc = self.wsclient.get_received(namespace="/liveupdates")
+
+        self.assertEqual(len(ws_resc), 1)
+        self.assertEqual(ws_resc[0]["args"][0]["data"]["topic"], "hardware")
+
+        self.wsclient.emit("unsubscribe", {"topic": "hardware"},
+                           namespace="/liveupdates")
+        put_update("Soldering irons are back")
+
+        self.assertEqual(self.wsclient.get_received("/liveupdates"), [])
+
+        """Topic updates are not part of the global snapshot"""
+        self.wsclient.emit("reload", namespace="/liveupdates")
+        ws_resc = self.wsclient.get_received(namespace="/liveupdates")
+        self.assertEqual(ws_resc[0]["args"][0], [])
+
+    def test_subscribe_replays_topic(self):
+        LiveUpdate.createOne(message="Testing my dude", topic="hardware")
+        LiveUpdate.createOne(message="Testing my dude 2")
+
+        self.wsclient.connect(namespace="/liveupdates")
+        self.wsclient.get_received(namespace="/liveupdates")
+
+        self.wsclient.emit("subscribe", {"topic": "hardware"},
+                           namespace="/liveupdates")
+
+        ws_resc = self.wsclient.get_received(namespace="/liveupdates")
+
+        self.assertEqual(ws_resc[0]["name"], "subscribed")
+        self.assertEqual(ws_resc[0]["args"][0]["topic"], "hardware")
+        self.assertEqual(len(ws_resc[0]["args"][0]["updates"]), 1)
+
+    def test_new_update_invalid_topic(self):
+        token = self.login_user(ROLES.ADMIN)
+
+        res = self.client.put(
+            "/api/live_updates/",
+            data=json.dumps({"message": "Foobar", "topic": 5}),
+            headers=[("sid", token)],
+            content_type="application/json"
+        )
+
+        self.assertEqual(res.status_code, 400)
+
+    """emit batching"""
+    def test_new_update_batched(self):
+        self.wsclient.connect(namespace="/liveupdates")
+        self.wsclient.get_received(namespace="/liveupdates")
+
+        token = self.login_user(ROLES.ADMIN)
+
+        with mock.patch.dict(app.config, {"LIVE_UPDATES_BATCH_SECONDS": 60}):
+            for i in range(3):
+                self.client.put(
+                    "/api/live_updates/",
+                    data=json.dumps({"message": f"Foobar {i}"}),
+                    headers=[("sid", token)],
+                    content_type="application/json"
+                )
+
+        self.assertEqual(self.wsclient.get_received("/liveupdates"), [])
+
+        batcher.flush()
+
+        ws_resc = self.wsclient.get_received(namespace="/liveupdates")
+
+        self.assertEqual(len(ws_resc), 1)
+        self.assertEqual(ws_resc[0]["name"], "LiveUpdateBatch")
+
+        events = ws_resc[0]["args"][0]
+        self.assertEqual([e["name"] for e in events], ["NewLiveUpdate"] * 3)
+        self.assertEqual([e["data"]["data"]["message"] for e in events],
+                         ["Foobar 0", "Foobar 1", "Foobar 2"])
@@ -2,6 +2,7 @@
 import json
 from src.models.sponsor import Sponsor
 from tests.base import BaseTestCase
+from datetime import datetime
 from src.models.user import ROLES
 
 
@@ -443,3 +444,35 @@ class TestSponsorsBlueprint(BaseTestCase):
 
         self.assertEqual(res.status_code, 404)
         self.assertEqual(data["name"], "Not Found")
+
+    def test_get_all_sponsors_constant_queries(self):
+        from src.models.event import Event
+
+        def create_sponsors(count):
+            for i in range(count):
+                sponsor = Sponsor.createOne(
+                    sponsor_name=f"Sponsor {i}",
+                    email=f"sponsor{i}@gmail.com",
+                    username=f"sponsor{i}",
+                    password="pass1234",
+                    roles=ROLES.SPONSOR
+                )
+                Event.createOne(
+                    name=f"event{i}",
+                    date_time=datetime.now(),
+                    end_date_time=datetime.now(),
+                    link="https://knighthacks.org",
+                    sponsors=[sponsor]
+                )
+
+        res = self.assert_constant_queries(
+            create_sponsors,
+            lambda: self.client.get("api/sponsors/get_all_sponsors/"),
+            many=8)
+        data = json.loads(res.data.decode())
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(data["sponsors"]), 8)
+        self.assertEqual(data["sponsors"][3]["events"][0]["name"], "event3")
+        self.assertEqual(data["sponsors"][3]["events"][0]["sponsors"],
+                         ["Sponsor 3"])
@@ -1,7 +1,11 @@
 # flake8: noqa
 import json
+from unittest import mock
+from src import app, response_cache
 from src.models.hacker import Hacker
 from src.models.sponsor import Sponsor
+from src.models.user import ROLES
+from src.models.stats_rollup import StatsRollup, rollup_cache
 from tests.base import BaseTestCase
 
 
@@ -20,3 +24,122 @@ class TestStatsBlueprint(BaseTestCase):
         self.assertEqual(data["hackers"], 0)
         self.assertEqual(data["sponsors"], 0)
         self.assertEqual(data["total"], 0)
+
+    def test_user_count_cached(self):
+        Hacker.createOne(username="foobar",
+                         email="foobar@email.com",
+                         password="123456",
+                         roles=ROLES.HACKER)
+
+        res = self.client.get("/api/stats/user_count/")
+        self.assertEqual(json.loads(res.data.decode())["hackers"], 1)
+
+        with self.count_queries() as queries:
+            res = self.client.get("/api/stats/user_count/")
+
+        self.assertEqual(queries, [])
+        self.assertEqual(json.loads(res.data.decode())["hackers"], 1)
+        self.assertEqual(response_cache.stats()["hits"], 1)
+
+        Sponsor.createOne(username="sponsor",
+                          email="sponsor@email.com",
+                          password="123456",
+                         roles=ROLES.HACKER)
+
+        res = self.client.get("/api/stats/user_count/")
+        data = json.loads(res.data.decode())
+
+        self.assertEqual(data["sponsors"], 1)
+        self.assertEqual(data["total"], 2)
+
+    def test_user_count_breakdowns(self):
+        Hacker.createOne(username="foobar",
+                         email="foobar@email.com",
+                         password="123456",
+                         roles=ROLES.HACKER,
+                         isaccepted=True,
+                         rsvp_status=True,
+                         edu_info={"college": "UofA", "major": "CS"})
+        Hacker.createOne(username="foobar2",
+                         email="foobar2@email.com",
+                         password="123456",
+                         roles=ROLES.MOD,
+                         beginner=True,
+                         edu_info={"college": "UofA", "major": "Math"})
+        Sponsor.createOne(username="sponsor",
+                          email="sponsor@email.com",
+                          password="123456",
+                          roles=ROLES.SPONSOR)
+
+        with mock.patch.dict(app.config, {"STATS_MIN_BUCKET_SIZE": 2}):
+            res = self.client.get("/api/stats/user_count/")
+        data = json.loads(res.data.decode())
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(data["total"], 3)
+        self.assertEqual(data["hackers"], 2)
+        self.assertEqual(data["sponsors"], 1)
+        self.assertEqual(data["roles"]["HACKER"], 1)
+        self.assertEqual(data["roles"]["MOD"], 1)
+        self.assertEqual(data["roles"]["SPONSOR"], 1)
+        self.assertEqual(data["roles"]["ADMIN"], 0)
+        self.assertEqual(data["accepted"], 1)
+        self.assertEqual(data["rsvp"], 1)
+        self.assertEqual(data["beginner"], 1)
+        self.assertEqual(data["colleges"], [{"name": "UofA", "count": 2}])
+        self.assertEqual(data["majors"], [])
+
+    def test_user_stats_rollup(self):
+        Hacker.createOne(username="foobar",
+                         email="foobar@email.com",
+                         password="123456",
+                         roles=ROLES.HACKER)
+
+        with self.count_queries() as queries:
+            stats = StatsRollup.user_stats()
+
+        self.assertEqual([q for q in queries if q[1] == "aggregate"],
+                         [("user", "aggregate")])
+        self.assertEqual(stats["hackers"], 1)
+
+        with self.count_queries() as queries:
+            StatsRollup.user_stats()
+
+        self.assertEqual(queries, [])
+
+        """Another process reads the stored rollup"""
+        rollup_cache.clear()
+        with self.count_queries() as queries:
+            stats = StatsRollup.user_stats()
+
+        self.assertNotIn(("user", "aggregate"), queries)
+        self.assertEqual(stats["hackers"], 1)
+
+        Hacker.objects(username="foobar").update(set__isaccepted=True)
+
+        stats = StatsRollup.user_stats()
+        self.assertEqual(stats["accepted"], 1)
+
+    def test_user_stats_debounced(self):
+        Hacker.createOne(username="foobar",
+                         email="foobar@email.com",
+                         password="123456",
+                         roles=ROLES.HACKER)
+
+        with mock.patch.dict(app.config, {"STATS_ROLLUP_SECONDS": 60}):
+            self.assertEqual(StatsRollup.user_stats()["hackers"], 1)
+
+            Hacker.createOne(username="foobar2",
+                             email="foobar2@email.com",
+                             password="123456",
+                             roles=ROLES.HACKER)
+
+            """Computed less than a minute ago"""
+            with self.count_queries() as queries:
+                stats = StatsRollup.user_stats()
+
+            self.assertNotIn(("user", "aggregate"), queries)
+            self.assertEqual(stats["hackers"], 1)
+
+        rollup_cache.clear()
+        self.assertEqual(StatsRollup.user_stats()["hackers"], 2)
@@ -0,0 +1,167 @@
+# flake8: noqa
+import json
+import requests
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import mock
+from mongomock.collection import Collection
+from src import app
+from src.models.club_event import ClubEvent
+from src.tasks.clubevent_tasks import refresh_notion_clubevents
+from tests.base import BaseTestCase
+
+
+def notion_page(name: str, start: str = "2021-10-01T18:00:00.000-04:00"):
+    def text(value):
+        return {"rich_text": [{"plain_text": value}]}
+
+    return {
+        "id": f"page-{name}",
+        "properties": {
+            "Name": {"title": [{"plain_text": name}]},
+            "Tags": {"multi_select": [{"name": "Workshop"}]},
+            "Presenter": text("Foo Bar"),
+            "Date": {"date": {"start": start, "end": None}},
+            "Description": text("A workshop"),
+            "Location": text("Online")
+        }
+    }
+
+
+class StubNotion(BaseHTTPRequestHandler):
+    """Serves `pages` one at a time, using their index as the cursor"""
+    pages = []
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append((self.path, body))
+
+        if self.path != "/databases/clubevents/query":
+            self.send_error(404)
+            return
+
+        index = int(body.get("start_cursor", 0))
+        more = index + 1 < len(self.pages)
+        payload = json.dumps({
+            "object": "list",
+            "results": self.pages[index],
+            "has_more": more,
+            "next_cursor": str(index + 1) if more else None
+        }).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestClubEventTasks(BaseTestCase):
+    """Tests for the Club Event Tasks"""
+
+    def setUp(self):
+        StubNotion.pages = []
+        StubNotion.requests = []
+        self.server = HTTPServer(("127.0.0.1", 0), StubNotion)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.config = mock.patch.dict(app.config, {
+            "NOTION_API_URI": f"http://127.0.0.1:{self.server.server_port}",
+            "NOTION_DB_ID": "clubevents",
+            "NOTION_SYNC_BATCH_SIZE": 2
+        })
+        self.config.start()
+
+    def tearDown(self):
+        super().tearDown()
+        self.config.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    """refresh_notion_clubevents"""
+    def test_refresh_notion_clubevents_paginated(self):
+        StubNotion.pages = [
+            [notion_page("Intro to Git"), notion_page("Intro to React")],
+            [notion_page("Intro to Flask")],
+            [notion_page("Intro to Rust")]
+        ]
+
+        with mock.patch.object(Collection, "bulk_write", autospec=True,
+                               side_effect=Collection.bulk_write) as write:
+            refresh_notion_clubevents()
+
+        self.assertEqual([len(c.args[1]) for c in write.call_args_list
+                          if c.args[0].name == "club_event"],
+                         [2, 2])
+
+        self.assertEqual(
+            sorted(ClubEvent.objects.scalar("name")),
+            ["Intro to Flask", "Intro to Git", "Intro to React",
+             "Intro to Rust"]
+        )
+
+        paths = [path for path, _ in StubNotion.requests]
+        cursors = [body.get("start_cursor") for _, body in StubNotion.requests]
+        self.assertEqual(paths, ["/databases/clubevents/query"] * 3)
+        self.assertEqual(cursors, [None, "1", "2"])
+
+    def test_refresh_notion_clubevents_replaces_events(self):
+        ClubEvent.createOne(name="Old Event")
+        StubNotion.pages = [[notion_page("Intro to Git")]]
+
+        refresh_notion_clubevents()
+
+        self.assertEqual(list(ClubEvent.objects.scalar("name")),
+                         ["Intro to Git"])
+
+    def test_refresh_notion_clubevents_error_keeps_events(self):
+        ClubEvent.createOne(name="Old Event")
+        app.config["NOTION_DB_ID"] = "missing"
+
+        with self.assertRaises(requests.HTTPError):
+            refresh_notion_clubevents()
+
+        self.assertEqual(ClubEvent.objects.count(), 1)
+
+    def test_refresh_notion_clubevents_only_writes_changes(self):
+        StubNotion.pages = [
+            [notion_page("Intro to Git"), notion_page("Intro to React")],
+            [notion_page("Intro to Flask")]
+        ]
+        refresh_notion_clubevents()
+        unchanged = ClubEvent.objects(name="Intro to Git").first()
+
+        StubNotion.pages = [
+            [notion_page("Intro to Git"),
+             notion_page("Intro to React", "2021-10-08T18:00:00.000-04:00")]
+        ]
+        with mock.patch.object(Collection, "bulk_write", autospec=True,
+                               side_effect=Collection.bulk_write) as write:
+            refresh_notion_clubevents()
+
+        self.assertEqual([len(c.args[1]) for c in write.call_args_list
+                          if c.args[0].name == "club_event"],
+                         [1])
+        self.assertEqual(
+            sorted(ClubEvent.objects.scalar("name")),
+            ["Intro to Git", "Intro to React"]
+        )
+        self.assertEqual(ClubEvent.objects(name="Intro to Git").first().pk,
+                         unchanged.pk)
+        self.assertEqual(
+            ClubEvent.objects(name="Intro to React").first().start.day, 8
+        )
+
+    def test_refresh_notion_clubevents_hides_sync_fields(self):
+        StubNotion.pages = [[notion_page("Intro to Git")]]
+        refresh_notion_clubevents()
+
+        res = self.client.get("/api/club/get_events/?confirmed=false")
+        event = json.loads(res.data)["events"][0]
+
+        self.assertNotIn("notion_id", event)
+        self.assertNotIn("content_hash", event)
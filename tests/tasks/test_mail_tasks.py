@@ -0,0 +1,279 @@
+# flake8: noqa
+import threading
+from socketserver import StreamRequestHandler, ThreadingTCPServer
+from unittest import mock
+from celery.signals import worker_init
+from kombu import Connection
+from src import app
+from src.common.mail import mail_queue
+from src.models.hacker import Hacker
+from src.models.mail_job import MailJob
+from src.models.user import ROLES
+from src.tasks.mail_tasks import (
+    MAIL_OUTBOX,
+    deliver,
+    drain_outbox,
+    email_templates,
+    send_acceptance_emails,
+    send_email_batch
+)
+from tests.base import BaseTestCase
+
+
+class SMTPSink(StreamRequestHandler):
+    """Accepts every email, except once for each address in `refuse`"""
+    sessions = 0
+    delivered = []
+    refuse = set()
+
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        SMTPSink.sessions += 1
+        self.reply("220 sink")
+
+        recipients = []
+        while True:
+            line = self.rfile.readline().decode().strip()
+            command = line[:4].upper()
+
+            if not line or command == "QUIT":
+                self.reply("221 bye")
+                return
+            elif command == "EHLO":
+                self.reply("250 sink")
+            elif command == "RCPT":
+                address = line.split("<", 1)[1].rstrip(">")
+                if address in self.refuse:
+                    self.refuse.discard(address)
+                    self.reply("550 mailbox unavailable")
+                else:
+                    recipients.append(address)
+                    self.reply("250 ok")
+            elif command == "DATA":
+                self.reply("354 go ahead")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                self.delivered.extend(recipients)
+                self.reply("250 ok")
+            elif command in ("MAIL", "RSET"):
+                recipients = []
+                self.reply("250 ok")
+            else:
+                self.reply("250 ok")
+
+
+def message(recipient: str):
+    return dict(template="email_verification",
+                recipient=recipient,
+                context={"user": {"username": recipient.split("@")[0]},
+                         "href": "https://knighthacks.org/verifyemail"})
+
+
+class TestMailTasks(BaseTestCase):
+    """Tests for the batched email delivery"""
+
+    def setUp(self):
+        super().setUp()
+        SMTPSink.sessions = 0
+        SMTPSink.delivered = []
+        SMTPSink.refuse = set()
+
+        self.server = ThreadingTCPServer(("127.0.0.1", 0), SMTPSink)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever,
+                         daemon=True).start()
+
+        self.patches = [
+            mock.patch.multiple(app.extensions["mail"],
+                                server="127.0.0.1",
+                                port=self.server.server_address[1],
+                                use_tls=False,
+                                use_ssl=False,
+                                username=None,
+                                suppress=False,
+                                default_sender="noreply@knighthacks.org"),
+            mock.patch.dict(app.config, {"DEBUG": False, "TESTING": False})
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in reversed(self.patches):
+            patch.stop()
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def test_one_session_per_batch(self):
+        recipients = [f"hacker{i}@email.com" for i in range(5)]
+
+        send_email_batch.apply(args=([message(r) for r in recipients],))
+
+        self.assertEqual(SMTPSink.sessions, 1)
+        self.assertEqual(SMTPSink.delivered, recipients)
+
+    def test_retries_failures_only(self):
+        SMTPSink.refuse = {"hacker1@email.com"}
+
+        send_email_batch.apply(args=([message("hacker0@email.com"),
+                                      message("hacker1@email.com")],))
+
+        self.assertEqual(SMTPSink.sessions, 2)
+        self.assertEqual(SMTPSink.delivered, ["hacker0@email.com",
+                                              "hacker1@email.com"])
+
+    def test_acceptance_chunk(self):
+        hackers = [Hacker.createOne(username=f"hacker{i}",
+                                    email=f"hacker{i}@email.com",
+                                    password="123456",
+                                    roles=ROLES.HACKER) for i in range(3)]
+        hacker_ids = [str(h.id) for h in hackers] + ["0" * 24]
+        job = MailJob.createOne(kind="hacker_acceptance", total=4)
+        SMTPSink.refuse = {"hacker2@email.com"}
+
+        with mock.patch.object(send_email_batch, "apply_async") as retry:
+            send_acceptance_emails.apply(args=(str(job.id), hacker_ids))
+
+        self.assertEqual(SMTPSink.sessions, 1)
+        self.assertEqual(SMTPSink.delivered, ["hacker0@email.com",
+                                              "hacker1@email.com"])
+        self.assertEqual(retry.call_args.args[0][0][0]["recipient"],
+                         "hacker2@email.com")
+
+        job.reload()
+        self.assertEqual(job.progress()["total"], 3)
+        self.assertEqual(job.progress()["sent"], 2)
+        self.assertEqual(job.progress()["retried"], 1)
+        self.assertFalse(job.progress()["done"])
+
+        send_email_batch.apply(*retry.call_args.args)
+
+        job.reload()
+        self.assertEqual(job.progress()["sent"], 3)
+        self.assertEqual(job.progress()["retried"], 0)
+        self.assertTrue(job.progress()["done"])
+
+    def test_acceptance_retries_exhausted(self):
+        job = MailJob.createOne(kind="hacker_acceptance", total=2,
+                                sent=1, retried=1)
+        SMTPSink.refuse = {"hacker1@email.com"}
+
+        with mock.patch.dict(app.config, {"MAIL_MAX_RETRIES": 0}):
+            send_email_batch.apply(args=([message("hacker1@email.com")],),
+                                   kwargs={"job_id": str(job.id)})
+
+        job.reload()
+        self.assertEqual(job.progress()["sent"], 1)
+        self.assertEqual(job.progress()["retried"], 0)
+        self.assertEqual(job.progress()["failed"], 1)
+        self.assertTrue(job.progress()["done"])
+
+    def test_session_failure_retries_batch(self):
+        self.server.shutdown()
+        self.server.server_close()
+        messages = [message(f"hacker{i}@email.com") for i in range(3)]
+
+        self.assertEqual(deliver(messages), messages)
+
+    def test_render_in_worker(self):
+        email_templates.load()
+
+        """Compiled once, when the worker started"""
+        with mock.patch.object(app.jinja_env, "get_template") as compile:
+            rendered = email_templates.render(message("foobar@email.com"))
+            email_templates.render(message("foobar1@email.com"))
+
+        compile.assert_not_called()
+        self.assertIn("</footer>", rendered["html_body"])
+        self.assertEqual(rendered["subject"],
+                         "Knight Hacks - Verify your Email")
+        self.assertIn("Hello foobar,", rendered["html_body"])
+        self.assertIn('href="https://knighthacks.org/verifyemail"',
+                      rendered["html_body"])
+
+        rendered = email_templates.render({
+            "template": "hacker_acceptance",
+            "recipient": "foobar@email.com",
+            "context": {"hacker": {"username": "foobar",
+                                   "first_name": "<b>foo</b>",
+                                   "last_name": "bar"}}
+        })
+        self.assertIn("&lt;b&gt;foo&lt;/b&gt;Bar", rendered["html_body"])
+
+    def test_templates_loaded_on_worker_init(self):
+        email_templates._compiled = {}
+
+        worker_init.send(sender=None)
+
+        self.assertIn(("hacker_acceptance", "html"), email_templates._compiled)
+
+    def test_suppressed(self):
+        with mock.patch.dict(app.config, {"TESTING": True}):
+            send_email_batch.apply(args=([message("hacker@email.com")],))
+
+        self.assertEqual(SMTPSink.sessions, 0)
+
+    def test_queue(self):
+        with mock.patch("src.common.mail.publish_emails") as publish:
+            for i in range(2):
+                mail_queue.add(**message(f"hacker{i}@email.com"))
+
+        """Nothing is held back in the web process"""
+        self.assertEqual(publish.call_count, 2)
+        self.assertEqual(publish.call_args_list[1].args[0],
+                         [message("hacker1@email.com")])
+
+    def test_drain_outbox(self):
+        recipients = [f"hacker{i}@email.com" for i in range(5)]
+
+        with Connection("memory://") as connection:
+            with connection.SimpleQueue(MAIL_OUTBOX) as outbox:
+                for r in recipients:
+                    outbox.put(message(r), serializer="json")
+
+                with mock.patch.dict(app.config, {"MAIL_BATCH_SIZE": 3,
+                                                  "MAIL_BATCH_LINGER_SECONDS": 1}):
+                    self.assertEqual(drain_outbox(outbox, timeout=0.1), 3)
+                    self.assertEqual(SMTPSink.sessions, 1)
+
+                    self.assertEqual(drain_outbox(outbox, timeout=0.1), 2)
+                    self.assertEqual(drain_outbox(outbox, timeout=0.1), 0)
+
+                """Every email was sent and acknowledged"""
+                self.assertEqual(outbox.qsize(), 0)
+
+        self.assertEqual(SMTPSink.sessions, 2)
+        self.assertEqual(SMTPSink.delivered, recipients)
+
+    def test_drain_outbox_retries_failed(self):
+        SMTPSink.refuse = {"hacker1@email.com"}
+
+        with Connection("memory://") as connection:
+            with connection.SimpleQueue(MAIL_OUTBOX) as outbox:
+                for i in range(2):
+                    outbox.put(message(f"hacker{i}@email.com"),
+                               serializer="json")
+
+                with mock.patch.object(send_email_batch,
+                                       "apply_async") as retry:
+                    self.assertEqual(drain_outbox(outbox, timeout=0.1), 2)
+
+                self.assertEqual(outbox.qsize(), 0)
+
+        self.assertEqual(SMTPSink.delivered, ["hacker0@email.com"])
+        self.assertEqual(retry.call_args.args[0],
+                         ([message("hacker1@email.com")],))
+
+    def test_queue_failure_releases_claim(self):
+        self.assertTrue(mail_queue.claim("hacker@email.com",
+                                         "email_verification"))
+
+        with mock.patch("src.common.mail.publish_emails",
+                        side_effect=OSError("broker is down")):
+            with self.assertRaises(OSError):
+                mail_queue.add(**message("hacker@email.com"))
+
+        self.assertTrue(mail_queue.claim("hacker@email.com",
+                                         "email_verification"))
@@ -0,0 +1,62 @@
+# flake8: noqa
+from unittest import mock
+from click.testing import CliRunner
+from src import app, celery
+from src.tasks import worker_arguments
+import src.tasks.clubevent_tasks
+import src.tasks.import_tasks
+import src.tasks.mail_tasks
+from tests.base import BaseTestCase
+
+
+class TestTaskRouting(BaseTestCase):
+    """Tests for the Celery queues"""
+
+    def queue_of(self, task: str) -> str:
+        return celery.amqp.router.route({}, task)["queue"].name
+
+    def test_routes(self):
+        self.assertEqual(self.queue_of("src.tasks.mail_tasks.send_email_batch"),
+                         "mail-high")
+        self.assertEqual(
+            self.queue_of("src.tasks.mail_tasks.send_acceptance_emails"),
+            "mail-bulk")
+        self.assertEqual(
+            self.queue_of("src.tasks.clubevent_tasks.refresh_notion_clubevents"),
+            "sync")
+        self.assertEqual(
+            self.queue_of("src.tasks.import_tasks.import_hackers_batch"),
+            "import")
+
+    def test_queues_are_declared(self):
+        names = [q.name for q in celery.conf.task_queues]
+
+        self.assertEqual(names, ["celery", "mail-high", "mail-bulk", "sync",
+                                 "import"])
+        for queue in celery.conf.task_queues:
+            self.assertEqual(queue.routing_key, queue.name)
+
+    def test_worker_arguments(self):
+        self.assertEqual(worker_arguments(app), ["worker"])
+
+        args = worker_arguments(app, "mail-high")
+
+        self.assertEqual(args[args.index("--queues") + 1], "mail-high")
+        self.assertEqual(args[args.index("--prefetch-multiplier") + 1], "1")
+        self.assertEqual(args[args.index("--hostname") + 1], "mail-high@%h")
+
+    def test_worker_command(self):
+        from src.__main__ import worker
+
+        with mock.patch("os.execvp") as execvp:
+            result = CliRunner().invoke(worker, ["--queue", "mail-high",
+                                                 "-l", "info", "-P", "gevent"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+
+        """The celery entrypoint patches gevent before importing the app"""
+        program, args = execvp.call_args.args
+        self.assertEqual(program, "celery")
+        self.assertEqual(args[:4], ["celery", "-A", "src.celery", "worker"])
+        self.assertEqual(args[-4:], ["-l", "info", "-P", "gevent"])
+        self.assertEqual(args[args.index("--concurrency") + 1], "20")